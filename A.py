@@ -1,41 +1,43 @@
 import tkinter as tk
-from tkinter import messagebox, colorchooser, filedialog, simpledialog
+from tkinter import messagebox, colorchooser, filedialog, simpledialog, ttk
 import datetime
-import pandas as pd
 import os
+import sys
 import json
-from docx import Document
-from fpdf import FPDF
+import time
 import shutil
-import arabic_reshaper
-from bidi.algorithm import get_display
-from PIL import Image, ImageTk
+import argparse
 import random
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-def reshape_arabic_text(text):
-    reshaped_text = arabic_reshaper.reshape(text)
-    bidi_text = get_display(reshaped_text)
-    return bidi_text
-
-# إعداد المسارات والملفات الأساسية
-LISTS_FILE = "lists.json"
-MAIN_FOLDER = "Lists"
+import sqlite3
+from progress_store import DEFAULT_STORAGE_BACKEND, DEFAULT_RETENTION_YEARS, DONE_MARK, COMMENT_SUFFIX, new_task_id
+from lists_store import LISTS_FILE, MAIN_FOLDER, load_lists, save_lists
+from progress_repository import get_repository, discard_repository
+from report_jobs import ReportJobManager
+from report_cache import ReportCache, report_digest
+from search_index import ListSearchIndex
+from comment_index import CommentIndex, COMMENT_INDEX_FILE, DEFAULT_SEARCH_LIMIT
+from listbox_model import ListboxModel
+from virtual_rows import VirtualRows
+from ui_theme import Theme, DEFAULT_FONT_SIZE
+
+# إعداد المسارات والملفات الأساسية (LISTS_FILE و MAIN_FOLDER في lists_store)
+CONFIG_FILE = "config.json"
+# المكتبات الثقيلة (pandas, python-docx, fpdf, matplotlib) تستورد عند أول استخدام فقط
+# حتى تظهر النافذة الرئيسية بسرعة؛ انظر benchmarks/bench_startup.py
+# أنواع التقارير التي يولدها التشغيل الدفعي من سطر الأوامر
+BATCH_REPORT_TYPES = ("weekly", "monthly", "pdf", "chart")
+# صيغ تصدير الرسم البياني (PNG فقط يمكن تضمينه في تقارير PDF و Word)
+CHART_FORMATS = ("png", "svg")
+# التقرير المجمع لكل القوائم يحفظ خارج مجلدات القوائم
+COMBINED_REPORTS_FOLDER = "Reports"
+# مهلة انتظار توقف الكتابة في خانة البحث قبل تحديث القوائم
+SEARCH_DEBOUNCE_MS = 150
+# نافذة التقارير الجارية تفتح تلقائياً فقط للتقارير التي تستغرق أكثر من هذه المدة
+REPORT_JOBS_WINDOW_DELAY_MS = 1500
 
 # ---------------------------
 # دوال المساعدة لتحميل وحفظ البيانات
 # ---------------------------
-def load_lists():
-    if os.path.exists(LISTS_FILE):
-        with open(LISTS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
-
-def save_lists(lists_data):
-    with open(LISTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(lists_data, f, ensure_ascii=False, indent=4)
-
 def backup_data():
     backup_folder = "Backup"
     if not os.path.exists(backup_folder):
@@ -46,6 +48,230 @@ def backup_data():
     else:
         messagebox.showerror("Backup", "لم يتم العثور على ملف البيانات للنسخ الاحتياطي.")
 
+# ---------------------------
+# كتابة تقرير واحد (يستخدم من الواجهة ومن التشغيل الدفعي دون Tk)
+# ---------------------------
+def report_checkpoint(check_cancelled):
+    # فحص الإلغاء بين مراحل التقرير (قبل تحميل السجل، بعده، بعد الرسم) وليس فقط أثناء الكتابة
+    if check_cancelled is not None:
+        check_cancelled()
+
+def build_report(repository, list_name, tasks, period, today=None, start=None, end=None, progress=None,
+                 check_cancelled=None):
+    # period: weekly / monthly / custom لتقرير Word، أو pdf (آخر 7 أيام أو الفترة المحددة)
+    # يعيد (مسار الملف، هل الملف الموجود ما زال صالحاً) أو None إذا لم توجد بيانات للفترة
+    import pandas as pd
+    from report_engine import period_start
+    from report_writers import word_report_path, pdf_report_path, write_word_report
+    today = today if today is not None else pd.Timestamp.today().normalize()
+    custom_range = start is not None
+    chart_period = "last7" if period == "pdf" else period
+    if start is None:
+        start = period_start(chart_period, today)
+    if period == "pdf":
+        path = pdf_report_path(repository.list_folder, today, start if custom_range else None, end)
+        title = f"تقرير PDF للمهام - {list_name}"
+    else:
+        path = word_report_path(repository.list_folder, period, today, start, end)
+        title = f"تقرير {period} - {list_name}"
+    # لا يعاد توليد التقرير إذا لم تتغير صفوف الفترة ولا تعريف المهام منذ آخر توليد
+    report_checkpoint(check_cancelled)
+    cache = ReportCache(repository.list_folder)
+    digest = report_digest(period, start, end, title, tasks, repository.digest(tasks, start, end))
+    if cache.lookup(path, digest):
+        return path, True
+    report_checkpoint(check_cancelled)
+    # الرسم البياني للفترة نفسها يضمَّن في التقرير (ويعاد استخدامه إن لم يتغير)
+    chart = build_chart(repository, list_name, tasks, chart_period, today, start if custom_range else None, end)
+    if chart is None:
+        return None
+    report_checkpoint(check_cancelled)
+    if period == "pdf":
+        # جدول مقسم على صفحات، والتعليقات تقرأ من السجل أثناء الكتابة
+        from report_pdf import write_pdf_report
+        days, rows = repository.report_rows(tasks, start, end)
+        heading = f"{start.strftime('%Y-%m-%d')} - {(end or today).strftime('%Y-%m-%d')} ({days} يوماً)"
+        write_pdf_report(path, title, [(heading, len(tasks), rows)], progress, chart=chart[0])
+    else:
+        # عدد مرات الإنجاز يؤخذ من الفهرس التراكمي (عمليتا بحث لأي فترة)
+        report = repository.summarize(tasks, start, end)
+        write_word_report(path, title, tasks, report, progress, chart=chart[0])
+    cache.store(path, digest)
+    return path, False
+
+def build_chart(repository, list_name, tasks, period="last7", today=None, start=None, end=None, fmt="png"):
+    # رسم عدد مرات الإنجاز (كما في التقرير التفاعلي) إلى ملف PNG أو SVG دون شاشة
+    # يعيد (مسار الملف، هل الملف الموجود ما زال صالحاً) أو None إذا لم توجد بيانات للفترة
+    import pandas as pd
+    from report_engine import period_start
+    from report_writers import chart_path
+    today = today if today is not None else pd.Timestamp.today().normalize()
+    custom_range = start is not None
+    if start is None:
+        start = period_start(period, today)
+    path = chart_path(repository.list_folder, period, today, start if custom_range else None, end, fmt)
+    cache = ReportCache(repository.list_folder)
+    digest = report_digest(f"chart-{period}", start, end, list_name, tasks, repository.digest(tasks, start, end))
+    if cache.lookup(path, digest):
+        return path, True
+    days, counts = repository.completion_counts(tasks, start, end)
+    if days == 0:
+        return None
+    from completion_chart import write_chart
+    write_chart(path, [task_obj["task"] for task_obj in tasks], counts)
+    cache.store(path, digest)
+    return path, False
+
+def build_combined_pdf_report(lists_data, list_names, storage_backend, start, end, progress=None):
+    # تقرير PDF واحد لعدة قوائم (حتى سنة كاملة)؛ كل قائمة تحمَّل ثم تحرر قبل التالية
+    from progress_repository import ProgressRepository
+    from report_pdf import write_pdf_report
+    def sections():
+        for name in list_names:
+            repository = ProgressRepository(os.path.join(MAIN_FOLDER, name), storage_backend)
+            if not repository.exists():
+                continue
+            days, rows = repository.report_rows(lists_data[name], start, end)
+            if days:
+                yield f"{name} ({days} يوماً)", len(lists_data[name]), rows
+    date_range = f"{start.strftime('%Y-%m-%d')}_{end.strftime('%Y-%m-%d')}"
+    path = os.path.join(COMBINED_REPORTS_FOLDER, f"combined_report_{date_range}.pdf")
+    title = f"تقرير كل القوائم {start.strftime('%Y-%m-%d')} - {end.strftime('%Y-%m-%d')}"
+    return write_pdf_report(path, title, sections(), progress)
+
+# ---------------------------
+# توليد التقارير في الخلفية حتى لا تتوقف الواجهة أثناء كتابة الملفات
+# ---------------------------
+def show_report_error(error):
+    messagebox.showerror("خطأ", f"حدث خطأ أثناء توليد التقرير:\n{error}")
+
+def submit_word_report(app, repository, list_name, tasks, period="weekly", start=None, end=None):
+    tasks = list(tasks)
+    def job(report_job):
+        return build_report(repository, list_name, tasks, period, start=start, end=end,
+                            progress=report_job.report_progress, check_cancelled=report_job.check_cancelled)
+    def on_done(result):
+        if result is None:
+            messagebox.showinfo("تقرير", f"لا توجد بيانات للفترة المحددة ({period}).")
+        elif result[1]:
+            messagebox.showinfo("تقرير", f"لا توجد تغييرات منذ آخر توليد، تقرير {period} محفوظ في:\n{result[0]}")
+        else:
+            messagebox.showinfo("تقرير", f"تم حفظ تقرير {period} في:\n{result[0]}")
+    return app.watch_report_job(app.report_jobs.submit(f"تقرير {period} - {list_name}", job, on_done, show_report_error))
+
+def submit_pdf_report(app, repository, list_name, tasks, start=None, end=None):
+    tasks = list(tasks)
+    def job(report_job):
+        return build_report(repository, list_name, tasks, "pdf", start=start, end=end,
+                            progress=report_job.report_progress, check_cancelled=report_job.check_cancelled)
+    def on_done(result):
+        if result is None:
+            messagebox.showinfo("تقرير", "لا توجد بيانات للفترة المحددة.")
+        elif result[1]:
+            messagebox.showinfo("تقرير", f"لا توجد تغييرات منذ آخر توليد، تقرير PDF محفوظ في:\n{result[0]}")
+        else:
+            messagebox.showinfo("تقرير", f"تم حفظ تقرير PDF في:\n{result[0]}")
+    return app.watch_report_job(app.report_jobs.submit(f"تقرير PDF - {list_name}", job, on_done, show_report_error))
+
+# ---------------------------
+# نافذة التقارير الجارية (التقدم والإلغاء)
+# ---------------------------
+class ReportJobsWindow(tk.Toplevel):
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("التقارير الجارية")
+        self.geometry("450x250")
+        self.rows = {}
+        self.jobs_frame = tk.Frame(self)
+        self.jobs_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.empty_label = tk.Label(self.jobs_frame, text="لا توجد تقارير قيد التوليد.", font=("Arial", 11))
+        master.report_jobs.add_listener(self.refresh)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.refresh()
+
+    def refresh(self):
+        jobs = self.master.report_jobs.jobs
+        for job_id in [job_id for job_id in self.rows if job_id not in jobs]:
+            self.rows.pop(job_id)[0].destroy()
+        for job in jobs.values():
+            if job.job_id not in self.rows:
+                row = tk.Frame(self.jobs_frame)
+                row.pack(fill="x", pady=3)
+                tk.Label(row, text=job.title, font=("Arial", 11)).pack(side="left", padx=5)
+                tk.Button(row, text="إلغاء", command=lambda j=job.job_id: self.master.report_jobs.cancel(j)).pack(side="right", padx=5)
+                bar = ttk.Progressbar(row, length=150)
+                bar.pack(side="right", padx=5)
+                self.rows[job.job_id] = (row, bar)
+            done, total = job.progress
+            self.rows[job.job_id][1].configure(maximum=max(total, 1), value=done)
+        if jobs:
+            self.empty_label.pack_forget()
+        else:
+            self.empty_label.pack(pady=20)
+
+    def close(self):
+        self.master.report_jobs.remove_listener(self.refresh)
+        self.master.report_jobs_window = None
+        self.destroy()
+
+# ---------------------------
+# نافذة البحث في تعليقات السجل لكل القوائم
+# ---------------------------
+class CommentSearchWindow(tk.Toplevel):
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("بحث في التعليقات")
+        self.geometry("800x450")
+        self.search_after_id = None
+        top_frame = tk.Frame(self)
+        top_frame.pack(fill="x", padx=10, pady=10)
+        tk.Label(top_frame, text="بحث:", font=("Arial", 12)).pack(side="left", padx=5)
+        self.query_entry = tk.Entry(top_frame, font=("Arial", 12))
+        self.query_entry.pack(side="left", fill="x", expand=True, padx=5)
+        self.query_entry.bind("<KeyRelease>", self.schedule_search)
+        self.status_label = tk.Label(self, text="", font=("Arial", 10))
+        self.status_label.pack(anchor="w", padx=10)
+        columns = (("date", "التاريخ", 90), ("list", "القائمة", 130), ("task", "المهمة", 130), ("comment", "التعليق", 420))
+        self.results = ttk.Treeview(self, columns=[column for column, _, _ in columns], show="headings")
+        for column, label, width in columns:
+            self.results.heading(column, text=label)
+            self.results.column(column, width=width, anchor="e")
+        self.results.pack(fill="both", expand=True, padx=10, pady=10)
+        self.query_entry.focus_set()
+        self.sync_index()
+
+    def sync_index(self):
+        # إعادة فهرسة القوائم التي تغيّر سجلها من خارج التطبيق (في الخلفية)
+        master = self.master
+        lists_data = {list_name: list(tasks) for list_name, tasks in master.lists_data.items()}
+        self.status_label.config(text="جاري تحديث فهرس التعليقات...")
+        master.report_jobs.submit(
+            "فهرسة التعليقات",
+            lambda job: master.comment_index.sync(lists_data, MAIN_FOLDER, master.storage_backend, job.report_progress),
+            lambda reindexed: self.run_search() if self.winfo_exists() else None,
+            show_report_error,
+        )
+
+    def schedule_search(self, event=None):
+        if self.search_after_id is not None:
+            self.after_cancel(self.search_after_id)
+        self.search_after_id = self.after(SEARCH_DEBOUNCE_MS, self.run_search)
+
+    def run_search(self):
+        self.search_after_id = None
+        self.results.delete(*self.results.get_children())
+        query = self.query_entry.get().strip()
+        if not query:
+            self.status_label.config(text="")
+            return
+        started = time.perf_counter()
+        rows = self.master.comment_index.search(query)
+        elapsed = (time.perf_counter() - started) * 1000
+        for list_name, task, date, comment in rows:
+            self.results.insert("", tk.END, values=(date, list_name, task, comment))
+        limit_note = f" (أحدث {DEFAULT_SEARCH_LIMIT})" if len(rows) == DEFAULT_SEARCH_LIMIT else ""
+        self.status_label.config(text=f"{len(rows)} نتيجة{limit_note} - {elapsed:.0f} ms")
+
 # ---------------------------
 # فئة ToolTip لإظهار التلميحات عند مرور الماوس
 # ---------------------------
@@ -82,7 +308,7 @@ class ProgressWindow(tk.Toplevel):
         self.list_name = list_name
         self.tasks = tasks
         self.list_folder = os.path.join(MAIN_FOLDER, list_name)
-        self.excel_file = os.path.join(self.list_folder, "daily_progress.xlsx")
+        self.repository = get_repository(self.list_folder, master.storage_backend)
         self.title(f"عرض التقدم - {list_name}")
         self.geometry("700x600")
         self.create_widgets()
@@ -96,21 +322,22 @@ class ProgressWindow(tk.Toplevel):
         tk.Button(rep_frame, text="توليد التقرير الأسبوعي", command=lambda: self.generate_report(period="weekly")).pack(side="left", padx=5)
         tk.Button(rep_frame, text="توليد التقرير الشهري", command=lambda: self.generate_report(period="monthly")).pack(side="left", padx=5)
         tk.Button(rep_frame, text="توليد تقرير PDF", command=self.generate_pdf_report).pack(side="left", padx=5)
+        tk.Button(self, text="تقرير لفترة مخصصة", command=self.custom_range_dialog).pack(pady=5)
         tk.Button(self, text="عرض التقرير التفاعلي", command=self.interactive_report).pack(pady=5)
+        tk.Button(self, text="تصدير إلى Excel", command=self.export_excel).pack(pady=5)
     
     def show_daily_progress(self):
-        if not os.path.exists(self.excel_file):
+        if not self.repository.exists():
             messagebox.showerror("خطأ", "لا توجد بيانات يومية متوفرة.")
             return
         try:
-            df = pd.read_excel(self.excel_file)
             today_str = datetime.date.today().strftime("%Y-%m-%d")
-            df_today = df[df['التاريخ'] == today_str]
-            if df_today.empty:
+            history = self.repository.history(self.tasks, today_str)
+            record = history.day_record(today_str, self.tasks)
+            if record is None:
                 messagebox.showinfo("التقدم اليومي", "لا توجد بيانات ليومنا هذا.")
                 return
-            record = df_today.iloc[-1]
-            progress_text = f"التاريخ: {record['التاريخ']}\n\n"
+            progress_text = f"التاريخ: {today_str}\n\n"
             for task_obj in self.tasks:
                 task = task_obj["task"]
                 status = record.get(task, "✖️")
@@ -124,141 +351,109 @@ class ProgressWindow(tk.Toplevel):
         except Exception as e:
             messagebox.showerror("خطأ", f"حدث خطأ أثناء قراءة البيانات:\n{e}")
     
-    def generate_report(self, period="weekly"):
-        if not os.path.exists(self.excel_file):
+    def export_excel(self):
+        if not self.repository.exists():
             messagebox.showerror("خطأ", "لا توجد بيانات.")
             return
-        df = pd.read_excel(self.excel_file)
-        df['التاريخ'] = pd.to_datetime(df['التاريخ'])
+        try:
+            excel_file = self.repository.export_excel(self.tasks)
+            messagebox.showinfo("تصدير", f"تم تصدير البيانات إلى:\n{excel_file}")
+        except Exception as e:
+            messagebox.showerror("خطأ", f"حدث خطأ أثناء التصدير:\n{e}")
+
+    def custom_range_dialog(self):
+        # نافذة اختيار فترة مخصصة (من/إلى) مع فترات جاهزة
+        import pandas as pd
+        from report_engine import period_start
+        win = tk.Toplevel(self)
+        win.title("تقرير لفترة مخصصة")
+        win.geometry("350x300")
         today = pd.Timestamp.today().normalize()
-        if period == "weekly":
-            start_period = today - pd.Timedelta(days=today.weekday())
-            folder_name = "Weekly_Reports"
-        else:
-            start_period = today.replace(day=1)
-            folder_name = "Monthly_Reports"
-        period_data = df[df['التاريخ'] >= start_period]
-        if period_data.empty:
-            messagebox.showinfo("تقرير", f"لا توجد بيانات للفترة المحددة ({period}).")
+        tk.Label(win, text="من (YYYY-MM-DD):", font=("Arial", 12)).pack(pady=5)
+        from_entry = tk.Entry(win, font=("Arial", 12))
+        from_entry.insert(0, period_start("rolling30", today).strftime("%Y-%m-%d"))
+        from_entry.pack(pady=5)
+        tk.Label(win, text="إلى (YYYY-MM-DD):", font=("Arial", 12)).pack(pady=5)
+        to_entry = tk.Entry(win, font=("Arial", 12))
+        to_entry.insert(0, today.strftime("%Y-%m-%d"))
+        to_entry.pack(pady=5)
+        def use_preset(period):
+            from_entry.delete(0, tk.END)
+            from_entry.insert(0, period_start(period, today).strftime("%Y-%m-%d"))
+            to_entry.delete(0, tk.END)
+            to_entry.insert(0, today.strftime("%Y-%m-%d"))
+        presets_frame = tk.Frame(win)
+        presets_frame.pack(pady=5)
+        for label, period in (("30 يوماً", "rolling30"), ("90 يوماً", "rolling90"), ("365 يوماً", "rolling365"), ("منذ بداية السنة", "ytd")):
+            tk.Button(presets_frame, text=label, command=lambda p=period: use_preset(p)).pack(side="left", padx=2)
+        def on_generate(pdf=False):
+            try:
+                start = pd.Timestamp(from_entry.get().strip()).normalize()
+                end = pd.Timestamp(to_entry.get().strip()).normalize()
+            except ValueError:
+                start = end = pd.NaT
+            if pd.isna(start) or pd.isna(end):
+                messagebox.showerror("خطأ", "يرجى إدخال التاريخ بالصيغة YYYY-MM-DD.")
+                return
+            if start > end:
+                messagebox.showerror("خطأ", "تاريخ البداية بعد تاريخ النهاية.")
+                return
+            win.destroy()
+            if pdf:
+                self.generate_pdf_report(start=start, end=end)
+            else:
+                self.generate_report(period="custom", start=start, end=end)
+        buttons_frame = tk.Frame(win)
+        buttons_frame.pack(pady=10)
+        tk.Button(buttons_frame, text="توليد التقرير", command=on_generate).pack(side="left", padx=5)
+        tk.Button(buttons_frame, text="توليد تقرير PDF", command=lambda: on_generate(pdf=True)).pack(side="left", padx=5)
+
+    def generate_report(self, period="weekly", start=None, end=None):
+        if not self.repository.exists():
+            messagebox.showerror("خطأ", "لا توجد بيانات.")
             return
-        summary = {}
-        for task_obj in self.tasks:
-            task = task_obj["task"]
-            count = period_data[task].apply(lambda x: 1 if x == "✔" else 0).sum()
-            comments_series = period_data[f"{task}_تعليق"].dropna().astype(str)
-            comments = "; ".join([c for c in comments_series if c.strip() != ""])
-            summary[task] = {"count": count, "comments": comments}
-        document = Document()
-        document.add_heading(f"تقرير {period} - {self.list_name}", 0)
-        table = document.add_table(rows=1, cols=3)
-        hdr_cells = table.rows[0].cells
-        hdr_cells[0].text = "المهمة"
-        hdr_cells[1].text = "عدد مرات القيام"
-        hdr_cells[2].text = "التعليقات"
-        for task_obj in self.tasks:
-            task = task_obj["task"]
-            row_cells = table.add_row().cells
-            row_cells[0].text = task
-            row_cells[1].text = str(summary[task]["count"])
-            row_cells[2].text = summary[task]["comments"]
-        report_date = today.strftime("%Y-%m-%d")
-        report_folder = os.path.join(self.list_folder, folder_name)
-        if not os.path.exists(report_folder):
-            os.makedirs(report_folder)
-        word_report_file = os.path.join(report_folder, f"{period}_report_{report_date}.docx")
-        document.save(word_report_file)
-        messagebox.showinfo("تقرير", f"تم حفظ تقرير {period} في:\n{word_report_file}")
+        submit_word_report(self.master, self.repository, self.list_name, self.tasks, period, start, end)
 
-    def generate_pdf_report(self):
-        if not os.path.exists(self.excel_file):
+    def generate_pdf_report(self, start=None, end=None):
+        if not self.repository.exists():
             messagebox.showerror("خطأ", "لا توجد بيانات.")
             return
-        df = pd.read_excel(self.excel_file)
-        df['التاريخ'] = pd.to_datetime(df['التاريخ'])
-        today = pd.Timestamp.today().normalize()
-        start_date = today - pd.Timedelta(days=7)
-        period_data = df[df['التاريخ'] >= start_date]
-        if period_data.empty:
-            messagebox.showinfo("تقرير", "لا توجد بيانات للفترة المحددة.")
-            return
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.add_font('DejaVu', '', 'DejaVuSans.ttf', uni=True)
-        pdf.set_font('DejaVu', '', 14)
-         
-        title = reshape_arabic_text(f"تقرير PDF للمهام - {self.list_name}")
-        pdf.cell(200, 10, txt=title, ln=True, align="C")
-        pdf.ln(10)
-         
-        for task_obj in self.tasks:
-            task_original = task_obj["task"]
-            count = period_data[task_original].apply(lambda x: 1 if x == "✔" else 0).sum()
-            comments_series = period_data[f"{task_original}_تعليق"].dropna().astype(str)
-            comments = "; ".join([c for c in comments_series if c.strip() != ""])
-    
-            pdf.set_font('DejaVu', '', 12)
-            pdf.cell(0, 10, txt=reshape_arabic_text(f"المهمة: {task_original}"), ln=True)
-            pdf.cell(0, 10, txt=reshape_arabic_text(f"عدد المرات: {count}"), ln=True)
-            pdf.cell(0, 10, txt=reshape_arabic_text(f"التعليقات: {comments}"), ln=True)
-    
-            pdf.ln(10)
- 
-        pdf_folder = os.path.join(self.list_folder, "PDF_Reports")
-        if not os.path.exists(pdf_folder):
-            os.makedirs(pdf_folder)
-        pdf_file = os.path.join(pdf_folder, f"pdf_report_{today.strftime('%Y-%m-%d')}.pdf")
-        pdf.output(pdf_file)
-        messagebox.showinfo("تقرير", f"تم حفظ تقرير PDF في:\n{pdf_file}")
+        submit_pdf_report(self.master, self.repository, self.list_name, self.tasks, start, end)
 
     def interactive_report(self):
-        import matplotlib.font_manager as fm
-        import matplotlib as mpl
-        import matplotlib.pyplot as plt
-        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-        # إذا لم تكن قد استدعيت الخط خارج الدالة، يمكنك استدعاؤه هنا أيضاً
-        font_path = "DejaVuSans.ttf"
-        font_prop = fm.FontProperties(fname=font_path)
-        mpl.rcParams['font.family'] = font_prop.get_name()
-        mpl.rcParams['axes.unicode_minus'] = False
-
-        if not os.path.exists(self.excel_file):
+        if not self.repository.exists():
             messagebox.showerror("خطأ", "لا توجد بيانات.")
             return
-    
-        df = pd.read_excel(self.excel_file)
-        df['التاريخ'] = pd.to_datetime(df['التاريخ'])
-        today = pd.Timestamp.today().normalize()
-        start_date = today - pd.Timedelta(days=7)
-        period_data = df[df['التاريخ'] >= start_date]
-        if period_data.empty:
+
+        import pandas as pd
+        from report_engine import period_start
+        period = "last7"
+        start = period_start(period, pd.Timestamp.today().normalize())
+        tasks = list(self.tasks)
+        # الملخص يحسب في الخلفية، أما الرسم فيتم في خيط Tk عند وصول النتيجة
+        def job(report_job):
+            report_job.check_cancelled()
+            report = self.repository.summarize(tasks, start)
+            # الإلغاء أثناء الحساب يمنع فتح نافذة الرسم
+            report_job.check_cancelled()
+            return report
+        self.master.watch_report_job(self.master.report_jobs.submit(
+            f"التقرير التفاعلي - {self.list_name}",
+            job,
+            lambda report: self.show_interactive_report(report, period),
+            show_report_error,
+        ))
+
+    def show_interactive_report(self, report, period):
+        if not self.winfo_exists():
+            return
+        if report["days"] == 0:
             messagebox.showinfo("تقرير", "لا توجد بيانات للفترة المحددة.")
             return
-
-        summary = {}
-        for task_obj in self.tasks:
-            task = task_obj["task"]
-            count = period_data[task].apply(lambda x: 1 if x == "✔" else 0).sum()
-            summary[task] = count
-
-        report_win = tk.Toplevel(self)
-        report_win.title("التقرير التفاعلي")
-
-        fig, ax = plt.subplots(figsize=(6,4))
-
-        # إعادة تشكيل أسماء المهام قبل عرضها
-        tasks = [reshape_arabic_text(t) for t in summary.keys()]
-        counts = list(summary.values())
-
-        ax.bar(tasks, counts, color="skyblue")
-        ax.set_title(reshape_arabic_text("عدد مرات إنجاز المهام"))
-        ax.set_ylabel(reshape_arabic_text("العدد"))
-        ax.tick_params(axis='x', rotation=45)
-
-        fig.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, master=report_win)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        # matplotlib ومكتبات الرسم تحمَّل عند أول تقرير تفاعلي فقط
+        from report_charts import show_completion_chart
+        # نافذة واحدة لكل (قائمة، فترة): الضغط مرة أخرى يحدّث الرسم الموجود
+        show_completion_chart(self, report, key=(self.list_name, period))
 
 
 # ---------------------------
@@ -307,17 +502,53 @@ class TaskManagerApp(tk.Tk):
         self.geometry("1200x550")
         self.dark_mode = False
         self.lists_data = load_lists()
+        # فهرس البحث يحدَّث عند إنشاء/تعديل/إعادة تسمية/حذف القوائم بدل المرور عليها مع كل حرف
+        self.search_index = ListSearchIndex(self.lists_data)
+        self.search_after_id = None
+        # آخر بحث معروض (النص بأحرف صغيرة، عدد القوائم المطابقة) لتضييق النتائج المعروضة فقط
+        self.shown_search = None
+        # فهرس نصي لتعليقات السجل في كل القوائم (comments_index.sqlite3)
+        self.comment_index = CommentIndex(os.path.join(MAIN_FOLDER, COMMENT_INDEX_FILE))
         self.bg_type = None  
         self.bg_value = None
-        self.font_size = 12  # إعداد افتراضي لحجم الخط
+        self.font_size = DEFAULT_FONT_SIZE  # إعداد افتراضي لحجم الخط
+        self.storage_backend = DEFAULT_STORAGE_BACKEND
+        self.history_retention_years = DEFAULT_RETENTION_YEARS
+        # التقارير تولَّد في خيوط خلفية وتعاد نتائجها إلى الواجهة عبر after()
+        self.report_jobs = ReportJobManager(self)
+        self.report_jobs_window = None
         self.background_label = None
         # متغيرات جديدة لتخزين ألوان وترتيب القوائم
         self.lists_colors = {}
         self.lists_order = list(self.lists_data.keys())
         self.load_config()
+        # خطوط وألوان مشتركة: التخصيص يعدّلها في مكانها بدل إعادة بناء النافذة
+        self.theme = Theme(self, self.font_size)
         self.create_context_menu()
         self.create_widgets()
         self.bind("<Configure>", self.on_resize)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        self.report_jobs.shutdown()
+        self.destroy()
+
+    def show_comment_search(self):
+        CommentSearchWindow(self)
+
+    def show_report_jobs(self):
+        if self.report_jobs_window is None:
+            self.report_jobs_window = ReportJobsWindow(self)
+        else:
+            self.report_jobs_window.lift()
+
+    def watch_report_job(self, job):
+        # التقارير السريعة (ومنها الموجودة في الذاكرة المؤقتة) تنتهي دون فتح نافذة التقارير الجارية
+        def show_if_running():
+            if job.job_id in self.report_jobs.jobs and self.report_jobs_window is None:
+                self.show_report_jobs()
+        self.after(REPORT_JOBS_WINDOW_DELAY_MS, show_if_running)
+        return job
        
     def create_context_menu(self):
         self.context_menu = tk.Menu(self, tearoff=0)
@@ -337,32 +568,32 @@ class TaskManagerApp(tk.Tk):
 
 
 
-    def clear_widgets(self):
-        for widget in self.winfo_children():
-            widget.destroy()     
-
     def load_config(self):
-        config_file = "config.json"
+        config_file = CONFIG_FILE
         if os.path.exists(config_file):
             with open(config_file, "r", encoding="utf-8") as f:
                 config = json.load(f)
             self.bg_type = config.get("bg_type")
             self.bg_value = config.get("bg_value")
-            self.font_size = config.get("font_size", 12)
+            self.font_size = config.get("font_size", DEFAULT_FONT_SIZE)
             self.lists_colors = config.get("lists_colors", {})
             self.lists_order = config.get("lists_order", list(self.lists_data.keys()))
+            self.storage_backend = config.get("storage_backend", DEFAULT_STORAGE_BACKEND)
+            self.history_retention_years = config.get("history_retention_years", DEFAULT_RETENTION_YEARS)
         else:
             self.lists_colors = {}
             self.lists_order = list(self.lists_data.keys())
 
     def save_config(self):
-        config_file = "config.json"
+        config_file = CONFIG_FILE
         config = {
             "bg_type": self.bg_type,
             "bg_value": self.bg_value,
             "font_size": self.font_size,
             "lists_colors": self.lists_colors,
-            "lists_order": self.lists_order
+            "lists_order": self.lists_order,
+            "storage_backend": self.storage_backend,
+            "history_retention_years": self.history_retention_years
         }
         with open(config_file, "w", encoding="utf-8") as f:
             json.dump(config, f, ensure_ascii=False, indent=4)
@@ -379,11 +610,14 @@ class TaskManagerApp(tk.Tk):
                 messagebox.showerror("خطأ", "هذه القائمة موجودة بالفعل.")
                 return
             self.lists_data[new_name] = self.lists_data.pop(old_name)
+            self.search_index.rename_list(old_name, new_name, self.lists_data[new_name])
+            self.comment_index.rename_list(old_name, new_name)
             save_lists(self.lists_data)
             old_folder = os.path.join(MAIN_FOLDER, old_name)
             new_folder = os.path.join(MAIN_FOLDER, new_name)
             if os.path.exists(old_folder):
                 os.rename(old_folder, new_folder)
+            discard_repository(old_folder)
             if old_name in self.lists_order:
                 index = self.lists_order.index(old_name)
                 self.lists_order[index] = new_name
@@ -394,17 +628,17 @@ class TaskManagerApp(tk.Tk):
             self.refresh_lists()
 
     def create_widgets(self):
-        top_bar = tk.Frame(self)
+        top_bar = self.theme.add_surface(tk.Frame(self))
         top_bar.pack(side="top", fill="x")    
-        self.toggle_settings_btn = tk.Button(top_bar, text="≡", font=("Arial", self.font_size+4), command=self.toggle_settings)
+        self.toggle_settings_btn = tk.Button(top_bar, text="≡", font=self.theme.title_font, command=self.toggle_settings)
         self.toggle_settings_btn.pack(side="left", padx=5, pady=5)
     
-        self.side_menu = tk.Frame(self, bd=2, relief="raised")
+        self.side_menu = self.theme.add_surface(tk.Frame(self, bd=2, relief="raised"))
         self.side_menu.pack(side="left", fill="y")
-        self.main_frame = tk.Frame(self)
+        self.main_frame = self.theme.add_surface(tk.Frame(self))
         self.main_frame.pack(side="left", fill="both", expand=True, padx=10, pady=10)
     
-        tk.Label(self.side_menu, text="القوائم", font=("Arial", self.font_size, "bold")).pack(pady=5)
+        tk.Label(self.side_menu, text="القوائم", font=self.theme.bold_font).pack(pady=5)
     
         btn_new = tk.Button(self.side_menu, text="إنشاء قائمة جديدة", command=self.create_new_list, width=20)
         btn_new.pack(pady=2)
@@ -445,7 +679,13 @@ class TaskManagerApp(tk.Tk):
         btn_progress = tk.Button(self.side_menu, text="عرض التقدم", command=lambda: self.select_list_and_execute(self.open_progress_by_name), width=20)
         btn_progress.pack(pady=2)
         ToolTip(btn_progress, "اختر قائمة لعرض التقدم")    
-        tk.Label(self.side_menu, text="الخلفية", font=("Arial", self.font_size, "bold")).pack(pady=10)
+        btn_comments = tk.Button(self.side_menu, text="بحث في التعليقات", command=self.show_comment_search, width=20)
+        btn_comments.pack(pady=2)
+        ToolTip(btn_comments, "ابحث في تعليقات كل القوائم لكل الأيام")
+        btn_jobs = tk.Button(self.side_menu, text="التقارير الجارية", command=self.show_report_jobs, width=20)
+        btn_jobs.pack(pady=2)
+        ToolTip(btn_jobs, "متابعة التقارير التي يتم توليدها وإلغاؤها")
+        tk.Label(self.side_menu, text="الخلفية", font=self.theme.bold_font).pack(pady=10)
     
         btn_toggle = tk.Button(self.side_menu, text="تبديل الوضع الليلي", command=self.toggle_dark_mode, width=20)
         btn_toggle.pack(pady=2)
@@ -463,42 +703,41 @@ class TaskManagerApp(tk.Tk):
         btn_customize.pack(pady=2)
         ToolTip(btn_customize, "تغيير حجم الخط والثيمات")
     
-        main_frame = tk.Frame(self)
+        main_frame = self.theme.add_surface(tk.Frame(self))
         main_frame.pack(side="left", fill="both", expand=True, padx=10, pady=10)
     
         top_frame = tk.Frame(main_frame)
         top_frame.pack(pady=10, fill="x")
-        tk.Label(top_frame, text="بحث:", font=("Arial", self.font_size)).pack(side="left", padx=5)
+        tk.Label(top_frame, text="بحث:", font=self.theme.font).pack(side="left", padx=5)
     
-        self.search_entry = tk.Entry(top_frame, font=("Arial", self.font_size))
+        self.search_entry = self.theme.add_field(tk.Entry(top_frame, font=self.theme.font))
         self.search_entry.pack(side="left", padx=5)
-        self.search_entry.bind("<KeyRelease>", lambda event: self.refresh_lists())
+        self.search_entry.bind("<KeyRelease>", self.schedule_search)
     
-        btn_help = tk.Button(top_frame, text="?", font=("Arial", self.font_size, "bold"), command=self.show_help)
+        btn_help = tk.Button(top_frame, text="?", font=self.theme.bold_font, command=self.show_help)
         btn_help.pack(side="right", padx=5)
         ToolTip(btn_help, "دليل الاستخدام")
     
-        tk.Label(top_frame, text="صلِّ على النبي", font=("Arial", self.font_size), fg="blue").pack(side="right", padx=5)
+        tk.Label(top_frame, text="صلِّ على النبي", font=self.theme.font, fg="blue").pack(side="right", padx=5)
     
-        tk.Label(main_frame, text="القوائم المتاحة", font=("Arial", self.font_size+4)).pack(pady=5)
-        default_bg = self.bg_value if self.bg_type=="color" and self.bg_value else ("black" if self.dark_mode else "white")
-        default_fg = "white" if self.dark_mode else "black"
+        tk.Label(main_frame, text="القوائم المتاحة", font=self.theme.title_font).pack(pady=5)
         self.lists_listbox = tk.Listbox(
             main_frame,
             height=8,
-            font=("Arial", self.font_size),
+            font=self.theme.font,
             activestyle="none",
             exportselection=False,
-            selectbackground=default_bg,
-            selectforeground=default_fg,
             highlightthickness=0,
             bd=0
         )
+        # لون التحديد يطابق الخلفية ويتبعها مع الثيم
+        self.theme.add_field(self.lists_listbox, selection=True)
         self.lists_listbox.bind("<<ListboxSelect>>", lambda e: self.lists_listbox.selection_clear(0, tk.END))
         self.lists_listbox.pack(fill="both", expand=True, padx=20, pady=10)
         self.lists_listbox.bind("<Button-3>", self.show_context_menu)
         self.lists_listbox.bind("<Button-2>", self.show_context_menu)
-        
+        # ما يعرضه Listbox حالياً، حتى يطبق التحديث الفرق فقط
+        self.lists_model = ListboxModel(self.lists_listbox)
         
         self.refresh_lists()
     
@@ -536,21 +775,12 @@ class TaskManagerApp(tk.Tk):
 
 
     def apply_theme(self):
+        # الألوان تطبق على العناصر المسجلة في الثيم فقط بدل المرور على كل عناصر النافذة
         if self.bg_type == "color" and self.bg_value:
-            self.configure(bg=self.bg_value)
-            self.lists_listbox.configure(bg=self.bg_value, fg="white" if self.dark_mode else "black")
-            self.search_entry.configure(bg=self.bg_value, fg="white" if self.dark_mode else "black")
-            for widget in self.winfo_children():
-                if isinstance(widget, tk.Frame):
-                    widget.configure(bg=self.bg_value)
+            bg_color = self.bg_value
         else:
             bg_color = "black" if self.dark_mode else "white"
-            self.configure(bg=bg_color)
-            self.lists_listbox.configure(bg=bg_color, fg="white" if self.dark_mode else "black")
-            self.search_entry.configure(bg=bg_color, fg="white" if self.dark_mode else "black")
-            for widget in self.winfo_children():
-                if isinstance(widget, tk.Frame):
-                    widget.configure(bg=bg_color)
+        self.theme.set_colors(bg_color, "white" if self.dark_mode else "black")
 
     def change_background(self):
         color = colorchooser.askcolor(title="اختر لون الخلفية")
@@ -586,12 +816,24 @@ class TaskManagerApp(tk.Tk):
         font_entry.insert(0, str(self.font_size))
         font_entry.pack(pady=5)
 
+        def apply_customization():
+            try:
+                new_size = int(font_entry.get())
+            except ValueError:
+                messagebox.showerror("خطأ", "يرجى إدخال رقم صحيح.", parent=cust_win)
+                return
+            # فرض الحدود بين 10 و50؛ كل العناصر التي تستخدم خطوط الثيم تتحدث في مكانها
+            self.font_size = self.theme.set_font_size(new_size)
+            self.save_config()
+            cust_win.destroy()
+        tk.Button(cust_win, text="تطبيق", command=apply_customization).pack(pady=10)
+
     def reorder_lists_window(self):
         win = tk.Toplevel(self)
         win.title("ترتيب القوائم")
         win.geometry("300x400")
         # إنشاء Listbox يعرض الترتيب الحالي للقوائم
-        lb = tk.Listbox(win, font=("Arial", self.font_size))
+        lb = tk.Listbox(win, font=self.theme.font)
         lb.pack(fill="both", expand=True, padx=10, pady=10)
         for item in self.lists_order:
             lb.insert(tk.END, item)
@@ -633,22 +875,6 @@ class TaskManagerApp(tk.Tk):
             win.destroy()
         btn_save = tk.Button(win, text="حفظ", command=save_and_close)
         btn_save.pack(pady=5)
-
-
-        def apply_customization():
-            try:
-                new_size = int(font_entry.get())
-                # فرض الحدود بين 10 و50
-                new_size = max(10, min(new_size, 50))
-                self.font_size = new_size
-                self.save_config()
-                # تحديث الواجهة: حذف جميع الواجهات وإعادة إنشائها
-                self.clear_widgets()
-                self.create_widgets()
-                cust_win.destroy()
-            except:
-                messagebox.showerror("خطأ", "يرجى إدخال رقم صحيح.")
-        tk.Button(win, text="تطبيق", command=apply_customization).pack(pady=10)
     
     def move_list_up(self):
         # التأكد من اختيار عنصر من القائمة
@@ -686,7 +912,7 @@ class TaskManagerApp(tk.Tk):
         win = tk.Toplevel(self)
         win.title("اختر القائمة")
         win.geometry("350x350")
-        lb = tk.Listbox(win, font=("Arial", self.font_size), selectmode=tk.SINGLE)
+        lb = tk.Listbox(win, font=self.theme.font, selectmode=tk.SINGLE)
         lb.pack(fill="both", expand=True, padx=10, pady=10)
         for name in self.lists_data.keys():
             lb.insert(tk.END, name)
@@ -714,10 +940,13 @@ class TaskManagerApp(tk.Tk):
     def delete_list_by_name(self, list_name):
         if messagebox.askyesno("تأكيد", f"هل أنت متأكد من حذف القائمة '{list_name}'؟"):
             del self.lists_data[list_name]
+            self.search_index.remove_list(list_name)
+            self.comment_index.remove_list(list_name)
             save_lists(self.lists_data)
             list_folder = os.path.join(MAIN_FOLDER, list_name)
             if os.path.exists(list_folder):
                 shutil.rmtree(list_folder)
+            discard_repository(list_folder)
             if list_name in self.lists_order:
                 self.lists_order.remove(list_name)
             if list_name in self.lists_colors:
@@ -751,18 +980,35 @@ class TaskManagerApp(tk.Tk):
         ProgressWindow(self, list_name, tasks)
 
 
-    def refresh_lists(self):
+    def schedule_search(self, event=None):
+        # البحث ينفَّذ مرة واحدة بعد توقف الكتابة، لا مع كل حرف
+        if self.search_after_id is not None:
+            self.after_cancel(self.search_after_id)
+        self.search_after_id = self.after(SEARCH_DEBOUNCE_MS, self.run_search)
+
+    def run_search(self):
+        self.search_after_id = None
+        self.refresh_lists(narrow=True)
+
+    def refresh_lists(self, narrow=False):
+        # narrow: استدعاء من خانة البحث فقط؛ أي تعديل على القوائم أو ترتيبها أو ألوانها يعيد البناء كاملاً
         query = self.search_entry.get().lower()
-        self.lists_listbox.delete(0, tk.END)
-        for list_name in self.lists_order:
-            if list_name in self.lists_data and (query in list_name.lower() or any(query in task_obj["task"].lower() for task_obj in self.lists_data[list_name])):
-                self.lists_listbox.insert(tk.END, list_name)
-                index = self.lists_listbox.size() - 1
-                if list_name in self.lists_colors:
-                    self.lists_listbox.itemconfig(index, bg=self.lists_colors[list_name])
-                else:
-                    default_bg = self.bg_value if self.bg_type=="color" and self.bg_value else ("black" if self.dark_mode else "white")
-                    self.lists_listbox.itemconfig(index, bg=default_bg)
+        matches = self.search_index.search(query)
+        shown = self.shown_search
+        self.shown_search = None if matches is None else (query, len(matches))
+        if narrow and matches is not None and shown is not None and query.startswith(shown[0]):
+            # إضافة حرف للبحث تعطي جزءاً من النتائج السابقة: نفس العدد يعني نفس القوائم،
+            # وإلا تصفى القوائم المعروضة حالياً بدل المرور على كل القوائم
+            if len(matches) == shown[1]:
+                return
+            self.lists_model.update([item for item in self.lists_model.items if item[0] in matches])
+            return
+        # القوائم بدون لون خاص تأخذ خلفية Listbox نفسه (تتغير مع الثيم في apply_theme)
+        self.lists_model.update([
+            (list_name, {"bg": self.lists_colors[list_name]} if list_name in self.lists_colors else {})
+            for list_name in self.lists_order
+            if list_name in self.lists_data and (matches is None or list_name in matches)
+        ])
 
     def open_list(self):
         selection = self.lists_listbox.curselection()
@@ -793,10 +1039,13 @@ class TaskManagerApp(tk.Tk):
         list_name = self.lists_listbox.get(selection[0])
         if messagebox.askyesno("تأكيد", f"هل أنت متأكد من حذف القائمة '{list_name}'؟"):
             del self.lists_data[list_name]
+            self.search_index.remove_list(list_name)
+            self.comment_index.remove_list(list_name)
             save_lists(self.lists_data)
             list_folder = os.path.join(MAIN_FOLDER, list_name)
             if os.path.exists(list_folder):
                 shutil.rmtree(list_folder)
+            discard_repository(list_folder)
             if list_name in self.lists_order:
                 self.lists_order.remove(list_name)
             if list_name in self.lists_colors:
@@ -829,6 +1078,22 @@ class TaskManagerApp(tk.Tk):
 # ---------------------------
 # نافذة إنشاء/تعديل القائمة مع دعم إعادة ترتيب المهام
 # ---------------------------
+TASK_PRIORITIES = ("عالية", "متوسطة", "منخفضة")
+DEFAULT_PRIORITY = "متوسطة"
+
+
+def parse_task_lines(text):
+    # مهمة في كل سطر؛ يمكن إتباعها بـ Tab ثم الأولوية (كما تنسخ من جدول)
+    tasks = []
+    for line in text.splitlines():
+        task_text, _, priority = line.partition("\t")
+        task_text = task_text.strip()
+        priority = priority.strip()
+        if task_text:
+            tasks.append({"task": task_text, "priority": priority if priority in TASK_PRIORITIES else DEFAULT_PRIORITY})
+    return tasks
+
+
 class CreateListWindow(tk.Toplevel):
     def __init__(self, master, list_name=None, tasks=None):
         super().__init__(master)
@@ -837,8 +1102,15 @@ class CreateListWindow(tk.Toplevel):
         self.master = master
         self.original_list_name = list_name
         self.tasks = tasks if tasks else []
-        self.task_entries = []
-        self.drag_data = {"widget": None, "y": 0}
+        # المهام المعدلة في قائمة عادية بترتيب العرض؛ عناصر Tk تنشأ للصفوف الظاهرة فقط
+        # المعرّف يبقى ثابتاً حتى لو تغيّر نص المهمة
+        self.task_items = [
+            {"id": task_obj.get("id") or new_task_id(), "task": task_obj.get("task", ""),
+             "priority": task_obj.get("priority", DEFAULT_PRIORITY)}
+            for task_obj in self.tasks
+        ]
+        self.row_widgets = {}
+        self.drag_data = {"index": None, "y": 0}
         self.create_widgets()
 
     def create_widgets(self):
@@ -864,59 +1136,125 @@ class CreateListWindow(tk.Toplevel):
             self.list_name_entry.insert(0, self.original_list_name)
 
         tk.Label(self, text="المهام:", font=("Arial", 12)).pack(pady=5)
-        self.tasks_frame = tk.Frame(self)
-        self.tasks_frame.pack(pady=5, fill="both", expand=True)
-        tk.Button(self, text="إضافة مهمة", command=self.add_task_entry).pack(pady=10)
-        for task_obj in self.tasks:
-            self.add_task_entry(task_obj.get("task", ""), task_obj.get("priority", "متوسطة"))
+        self.tasks_view = VirtualRows(self, self.create_task_row, self.bind_task_row, row_count=len(self.task_items))
+        self.tasks_view.pack(pady=5, fill="both", expand=True)
+        buttons_frame = tk.Frame(self)
+        buttons_frame.pack(pady=10)
+        tk.Button(buttons_frame, text="إضافة مهمة", command=self.add_task_entry).pack(side="left", padx=5)
+        tk.Button(buttons_frame, text="لصق مهام", command=self.paste_tasks).pack(side="left", padx=5)
+        tk.Button(buttons_frame, text="استيراد من ملف", command=self.import_tasks).pack(side="left", padx=5)
         tk.Button(self, text="حفظ", command=self.save_list).pack(pady=10)
     
         tk.Label(self, text="created by: meedoasadel@gmail.com", font=("Arial", 20, "bold"), fg="blue").pack(side="bottom", pady=5)
 
-    def add_task_entry(self, task_text="", priority="متوسطة"):
-        frame = tk.Frame(self.tasks_frame, bd=1, relief="groove")
-        frame.pack(fill="x", padx=10, pady=5)
-        entry = tk.Entry(frame, font=("Arial", 12))
+    def create_task_row(self, parent):
+        row = tk.Frame(parent)
+        frame = tk.Frame(row, bd=1, relief="groove")
+        frame.pack(fill="both", expand=True, padx=10, pady=5)
+        task_var = tk.StringVar()
+        priority_var = tk.StringVar(value=DEFAULT_PRIORITY)
+        entry = tk.Entry(frame, textvariable=task_var, font=("Arial", 12))
         entry.pack(side="left", fill="x", expand=True)
-        entry.insert(0, task_text)
-        priority_var = tk.StringVar(value=priority)
-        option_menu = tk.OptionMenu(frame, priority_var, "عالية", "متوسطة", "منخفضة")
-        option_menu.pack(side="left", padx=5)
-        remove_btn = tk.Button(frame, text="حذف", command=lambda: self.remove_task_entry(frame))
-        remove_btn.pack(side="left", padx=5)
-        frame.bind("<Button-1>", self.on_drag_start)
+        tk.OptionMenu(frame, priority_var, *TASK_PRIORITIES).pack(side="left", padx=5)
+        widgets = {"index": None, "frame": frame, "entry": entry, "task": task_var, "priority": priority_var}
+        tk.Button(frame, text="حذف", command=lambda: self.remove_task_entry(widgets)).pack(side="left", padx=5)
+        # السحب يبدأ من إطار الصف؛ رقم المهمة معروف من الصف نفسه دون البحث في العناصر
+        frame.bind("<Button-1>", lambda event: self.on_drag_start(event, widgets))
         frame.bind("<B1-Motion>", self.on_drag_motion)
         frame.bind("<ButtonRelease-1>", self.on_drag_stop)
-        self.task_entries.append({"frame": frame, "entry": entry, "priority": priority_var})
+        task_var.trace_add("write", lambda *args: self.on_task_row_changed(widgets))
+        priority_var.trace_add("write", lambda *args: self.on_task_row_changed(widgets))
+        entry.bind("<FocusIn>", lambda event: widgets["index"] is not None and self.tasks_view.see(widgets["index"]))
+        self.row_widgets[row] = widgets
+        return row
+
+    def bind_task_row(self, row, index):
+        widgets = self.row_widgets[row]
+        item = self.task_items[index]
+        # تعطيل الكتابة في النموذج أثناء عرض بيانات المهمة الجديدة
+        widgets["index"] = None
+        widgets["task"].set(item["task"])
+        widgets["priority"].set(item["priority"])
+        widgets["frame"].config(relief="sunken" if index == self.drag_data["index"] else "groove")
+        widgets["index"] = index
+
+    def on_task_row_changed(self, widgets):
+        index = widgets["index"]
+        if index is not None:
+            self.task_items[index]["task"] = widgets["task"].get()
+            self.task_items[index]["priority"] = widgets["priority"].get()
+
+    def add_task_entry(self, task_text="", priority=DEFAULT_PRIORITY, task_id=None):
+        self.task_items.append({"id": task_id or new_task_id(), "task": task_text, "priority": priority})
+        self.tasks_view.set_row_count(len(self.task_items))
+        index = len(self.task_items) - 1
+        self.tasks_view.see(index)
+        row = self.tasks_view.row_for(index)
+        if row is not None:
+            self.row_widgets[row]["entry"].focus_set()
+
+    def add_task_items(self, tasks):
+        # إضافة مهام كثيرة دفعة واحدة: تحديث واحد للعرض مهما كان عددها
+        if not tasks:
+            return
+        self.task_items.extend(
+            {"id": new_task_id(), "task": task_obj["task"], "priority": task_obj["priority"]} for task_obj in tasks
+        )
+        self.tasks_view.set_row_count(len(self.task_items))
+        self.tasks_view.see(len(self.task_items) - 1)
+
+    def paste_tasks(self):
+        try:
+            text = self.clipboard_get()
+        except tk.TclError:
+            messagebox.showerror("خطأ", "الحافظة لا تحتوي على نص.", parent=self)
+            return
+        self.add_task_items(parse_task_lines(text))
 
-    def on_drag_start(self, event):
-        widget = event.widget
-        self.drag_data["widget"] = widget
-        self.drag_data["y"] = event.y_root
+    def import_tasks(self):
+        path = filedialog.askopenfilename(
+            parent=self, title="استيراد مهام", filetypes=[("ملفات نصية", "*.txt"), ("كل الملفات", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            with open(path, "r", encoding="utf-8-sig") as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            messagebox.showerror("خطأ", f"تعذر قراءة الملف: {e}", parent=self)
+            return
+        self.add_task_items(parse_task_lines(text))
+
+    def on_drag_start(self, event, widgets):
+        self.drag_data = {"index": widgets["index"], "y": event.y_root}
+        if widgets["index"] is not None:
+            widgets["frame"].config(relief="sunken")
 
     def on_drag_motion(self, event):
-        dy = event.y_root - self.drag_data["y"]
-        widget = self.drag_data["widget"]
-        index = self.tasks_frame.winfo_children().index(widget)
-        new_index = index
-        if dy < -30 and index > 0:
-            new_index = index - 1
-        elif dy > 30 and index < len(self.tasks_frame.winfo_children()) - 1:
-            new_index = index + 1
+        index = self.drag_data["index"]
+        row_height = self.tasks_view.row_height
+        if index is None or not row_height:
+            return
+        # الصف يتحرك بعدد الصفوف التي قطعها المؤشر، ثم يعاد عرض الصفوف الظاهرة فقط
+        steps = int((event.y_root - self.drag_data["y"]) / row_height)
+        new_index = max(0, min(index + steps, len(self.task_items) - 1))
         if new_index != index:
-            widget.pack_forget()
-            widget.pack(in_=self.tasks_frame, before=self.tasks_frame.winfo_children()[new_index], fill="x", padx=10, pady=5)
-            self.drag_data["y"] = event.y_root
-    
+            self.task_items.insert(new_index, self.task_items.pop(index))
+            self.drag_data["index"] = new_index
+            self.drag_data["y"] += (new_index - index) * row_height
+            self.tasks_view.refresh(rebind=True)
+            self.tasks_view.see(new_index)
+
     def on_drag_stop(self, event):
-        self.drag_data = {"widget": None, "y": 0}
+        self.drag_data = {"index": None, "y": 0}
+        self.tasks_view.refresh(rebind=True)
 
-    def remove_task_entry(self, frame):
-        for item in self.task_entries:
-            if item["frame"] == frame:
-                self.task_entries.remove(item)
-                break
-        frame.destroy()
+    def remove_task_entry(self, widgets):
+        index = widgets["index"]
+        if index is None:
+            return
+        del self.task_items[index]
+        self.tasks_view.set_row_count(len(self.task_items))
 
     def save_list(self):
         list_name = self.list_name_entry.get().strip()
@@ -925,10 +1263,10 @@ class CreateListWindow(tk.Toplevel):
             return
 
         tasks = []
-        for item in self.task_entries:
-            task_text = item["entry"].get().strip()
+        for item in self.task_items:
+            task_text = item["task"].strip()
             if task_text:
-                tasks.append({"task": task_text, "priority": item["priority"].get()})
+                tasks.append({"id": item["id"], "task": task_text, "priority": item["priority"]})
         if not tasks:
             messagebox.showerror("خطأ", "يجب إضافة مهام على الأقل.")
             return
@@ -938,6 +1276,8 @@ class CreateListWindow(tk.Toplevel):
                 messagebox.showerror("خطأ", "هذه القائمة موجودة بالفعل.")
                 return
             del self.master.lists_data[self.original_list_name]
+            self.master.search_index.remove_list(self.original_list_name)
+            self.master.comment_index.rename_list(self.original_list_name, list_name)
             if self.original_list_name in self.master.lists_order:
                 index = self.master.lists_order.index(self.original_list_name)
                 self.master.lists_order[index] = list_name
@@ -948,6 +1288,8 @@ class CreateListWindow(tk.Toplevel):
             return
 
         self.master.lists_data[list_name] = tasks
+        self.master.search_index.set_list(list_name, tasks)
+        self.master.comment_index.rename_tasks(list_name, tasks)
         save_lists(self.master.lists_data)
         if list_name not in self.master.lists_order:
             self.master.lists_order.append(list_name)
@@ -965,7 +1307,7 @@ class DailyTrackerApp(tk.Toplevel):
         self.list_name = list_name
         self.tasks = tasks
         self.list_folder = os.path.join(MAIN_FOLDER, list_name)
-        self.excel_file = os.path.join(self.list_folder, "daily_progress.xlsx")
+        self.repository = get_repository(self.list_folder, master.storage_backend)
         self.title(f"تتبع الأداء - {list_name}")
         self.geometry("700x650")
         self.create_widgets()
@@ -989,22 +1331,14 @@ class DailyTrackerApp(tk.Toplevel):
         motivation = random.choice(motivational_messages)
         tk.Label(self, text=motivation, font=("Arial", 12, "italic"), fg="green").pack(pady=5)
         
-        self.task_vars = {}
-        self.comment_vars = {}
-        tasks_frame = tk.Frame(self)
-        tasks_frame.pack(pady=10, fill="both", expand=True)
-        for task_obj in self.tasks:
-            task = task_obj["task"]
-            row = tk.Frame(tasks_frame)
-            row.pack(fill="x", pady=5, padx=10)
-            var = tk.BooleanVar()
-            tk.Checkbutton(row, variable=var).pack(side="left", padx=5)
-            tk.Label(row, text=task, font=("Arial", 12)).pack(side="left", padx=5)
-            tk.Label(row, text=f"({task_obj.get('priority', 'متوسطة')})", font=("Arial", 10), fg="blue").pack(side="left", padx=5)
-            self.task_vars[task] = var
-            comment_var = tk.StringVar()
-            tk.Entry(row, textvariable=comment_var, width=40, font=("Arial", 12)).pack(side="left", padx=5)
-            self.comment_vars[task] = comment_var
+        # تحميل سجل اليوم إن كان محفوظاً مسبقاً حتى يستبدله الحفظ التالي
+        today_record = self.repository.get_record(today_str, self.tasks) or {}
+        # حالة الإنجاز والتعليقات في قوائم عادية بترتيب المهام؛ عناصر Tk تنشأ للصفوف الظاهرة فقط
+        self.done = [today_record.get(task_obj["task"]) == DONE_MARK for task_obj in self.tasks]
+        self.comments = [today_record.get(f"{task_obj['task']}{COMMENT_SUFFIX}", "") for task_obj in self.tasks]
+        self.row_widgets = {}
+        self.tasks_view = VirtualRows(self, self.create_task_row, self.bind_task_row, row_count=len(self.tasks))
+        self.tasks_view.pack(pady=10, padx=10, fill="both", expand=True)
 
         tk.Button(self, text="حفظ البيانات", command=self.save_data).pack(pady=10)
         rep_frame = tk.Frame(self)
@@ -1015,28 +1349,68 @@ class DailyTrackerApp(tk.Toplevel):
         
         tk.Label(self, text="created by: meedoasadel@gmail.com", font=("Arial", 20, "bold"), fg="blue").pack(side="bottom", pady=5)
 
+    def create_task_row(self, parent):
+        row = tk.Frame(parent)
+        done_var = tk.BooleanVar()
+        comment_var = tk.StringVar()
+        tk.Checkbutton(row, variable=done_var).pack(side="left", padx=5, pady=5)
+        task_label = tk.Label(row, font=("Arial", 12))
+        task_label.pack(side="left", padx=5, pady=5)
+        priority_label = tk.Label(row, font=("Arial", 10), fg="blue")
+        priority_label.pack(side="left", padx=5, pady=5)
+        comment_entry = tk.Entry(row, textvariable=comment_var, width=40, font=("Arial", 12))
+        comment_entry.pack(side="left", padx=5, pady=5)
+        widgets = {"index": None, "done": done_var, "comment": comment_var, "task": task_label, "priority": priority_label}
+        self.row_widgets[row] = widgets
+        # أي تعديل في الصف يكتب فوراً في النموذج للمهمة المعروضة فيه حالياً
+        done_var.trace_add("write", lambda *args: self.on_task_row_changed(widgets))
+        comment_var.trace_add("write", lambda *args: self.on_task_row_changed(widgets))
+        # التنقل بـ Tab إلى صف في طرف النافذة يمرر القائمة حتى يظهر كاملاً
+        comment_entry.bind("<FocusIn>", lambda event: widgets["index"] is not None and self.tasks_view.see(widgets["index"]))
+        return row
+
+    def bind_task_row(self, row, index):
+        widgets = self.row_widgets[row]
+        task_obj = self.tasks[index]
+        # تعطيل الكتابة في النموذج أثناء عرض بيانات المهمة الجديدة
+        widgets["index"] = None
+        widgets["task"].config(text=task_obj["task"])
+        widgets["priority"].config(text=f"({task_obj.get('priority', 'متوسطة')})")
+        widgets["done"].set(self.done[index])
+        widgets["comment"].set(self.comments[index])
+        widgets["index"] = index
+
+    def on_task_row_changed(self, widgets):
+        index = widgets["index"]
+        if index is not None:
+            self.done[index] = widgets["done"].get()
+            self.comments[index] = widgets["comment"].get()
+
     def save_data(self):
         today_str = datetime.date.today().strftime("%Y-%m-%d")
-        data = {"التاريخ": today_str, "التعليقات": {}}
-        for task_obj in self.tasks:
-            task = task_obj["task"]
-            data[task] = self.task_vars[task].get()
-            data["التعليقات"][task] = self.comment_vars[task].get()
-        if os.path.exists(self.excel_file):
-            df = pd.read_excel(self.excel_file)
-        else:
-            df = pd.DataFrame()
-        new_row = {"التاريخ": data["التاريخ"]}
-        for task_obj in self.tasks:
+        statuses = {}
+        comments = {}
+        for task_obj, done, comment in zip(self.tasks, self.done, self.comments):
             task = task_obj["task"]
-            status = '✔' if data.get(task, False) else '✖️'
-            new_row[task] = status
-            new_row[f"{task}_تعليق"] = data["التعليقات"].get(task, "")
-        df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-        if not os.path.exists(self.list_folder):
-            os.makedirs(self.list_folder)
-    
-        df.to_excel(self.excel_file, index=False)
+            statuses[task] = done
+            comments[task] = comment
+        # تحديث سجل اليوم في مخزن التقدم (سجل واحد لكل تاريخ)
+        signature_before = self.repository.signature()
+        self.repository.save_day(today_str, self.tasks, statuses, comments)
+        try:
+            self.master.comment_index.update_day(
+                self.list_name, today_str, self.tasks, comments, signature_before, self.repository.signature()
+            )
+        except sqlite3.Error as e:
+            # السجل نفسه حُفظ؛ الفهرس يعلَّم كقديم حتى تعيد المزامنة التالية فهرسة هذه القائمة
+            try:
+                self.master.comment_index.mark_stale(self.list_name)
+            except sqlite3.Error:
+                pass
+            messagebox.showwarning("تنبيه", f"تم حفظ البيانات لكن تعذر تحديث فهرس التعليقات، وسيعاد بناؤه عند البحث:\n{e}")
+        # ضغط سنوات السجل الأقدم من فترة الاحتفاظ في أرشيف (تبقى قابلة للقراءة عند الطلب)
+        # المستودع يفحص السجل أول مرة فقط ثم عند تغيّر السنة، فالحفظ التالي لا يكلف شيئاً
+        self.repository.compact(self.master.history_retention_years)
         messagebox.showinfo("نجاح", "تم حفظ البيانات بنجاح!")
 
     def generate_weekly_report(self):
@@ -1046,90 +1420,114 @@ class DailyTrackerApp(tk.Toplevel):
         self.generate_report(period="monthly")
 
     def generate_report(self, period="weekly"):
-        if not os.path.exists(self.excel_file):
+        if not self.repository.exists():
             messagebox.showerror("خطأ", "لا توجد بيانات.")
             return
-        df = pd.read_excel(self.excel_file)
-        df['التاريخ'] = pd.to_datetime(df['التاريخ'])
-        today = pd.Timestamp.today().normalize()
-        if period == "weekly":
-            start_period = today - pd.Timedelta(days=today.weekday())
-            folder_name = "Weekly_Reports"
-        else:
-            start_period = today.replace(day=1)
-            folder_name = "Monthly_Reports"
-        period_data = df[df['التاريخ'] >= start_period]
-        if period_data.empty:
-            messagebox.showinfo("تقرير", f"لا توجد بيانات للفترة المحددة ({period}).")
-            return
-        summary = {}
-        for task_obj in self.tasks:
-            task = task_obj["task"]
-            count = period_data[task].apply(lambda x: 1 if x == "✔" else 0).sum()
-            comments_series = period_data[f"{task}_تعليق"].dropna().astype(str)
-            comments = "; ".join([c for c in comments_series if c.strip() != ""])
-            summary[task] = {"count": count, "comments": comments}
-        document = Document()
-        document.add_heading(f"تقرير {period} - {self.list_name}", 0)
-        table = document.add_table(rows=1, cols=3)
-        hdr_cells = table.rows[0].cells
-        hdr_cells[0].text = "المهمة"
-        hdr_cells[1].text = "عدد مرات القيام"
-        hdr_cells[2].text = "التعليقات"
-        for task_obj in self.tasks:
-            task = task_obj["task"]
-            row_cells = table.add_row().cells
-            row_cells[0].text = task
-            row_cells[1].text = str(summary[task]["count"])
-            row_cells[2].text = summary[task]["comments"]
-        report_date = today.strftime("%Y-%m-%d")
-        report_folder = os.path.join(self.list_folder, folder_name)
-        if not os.path.exists(report_folder):
-            os.makedirs(report_folder)
-        word_report_file = os.path.join(report_folder, f"{period}_report_{report_date}.docx")
-        document.save(word_report_file)
-        messagebox.showinfo("تقرير", f"تم حفظ تقرير {period} في:\n{word_report_file}")
+        submit_word_report(self.master, self.repository, self.list_name, self.tasks, period)
 
     def generate_pdf_report(self):
-        if not os.path.exists(self.excel_file):
+        if not self.repository.exists():
             messagebox.showerror("خطأ", "لا توجد بيانات.")
             return
-        df = pd.read_excel(self.excel_file)
-        df['التاريخ'] = pd.to_datetime(df['التاريخ'])
-        today = pd.Timestamp.today().normalize()
-        start_date = today - pd.Timedelta(days=7)
-        period_data = df[df['التاريخ'] >= start_date]
-        if period_data.empty:
-            messagebox.showinfo("تقرير", "لا توجد بيانات للفترة المحددة.")
-            return
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.add_font('DejaVu', '', 'DejaVuSans.ttf', uni=True)
-        pdf.set_font('DejaVu', '', 14)
-         
-        title = reshape_arabic_text(f"تقرير PDF للمهام - {self.list_name}")
-        pdf.cell(200, 10, txt=title, ln=True, align="C")
-        pdf.ln(10)
-         
-        for task_obj in self.tasks:
-            task_original = task_obj["task"]
-            count = period_data[task_original].apply(lambda x: 1 if x == "✔" else 0).sum()
-            comments_series = period_data[f"{task_original}_تعليق"].dropna().astype(str)
-            comments = "; ".join([c for c in comments_series if c.strip() != ""])
-    
-            pdf.set_font('DejaVu', '', 12)
-            pdf.cell(0, 10, txt=reshape_arabic_text(f"المهمة: {task_original}"), ln=True)
-            pdf.cell(0, 10, txt=reshape_arabic_text(f"عدد المرات: {count}"), ln=True)
-            pdf.cell(0, 10, txt=reshape_arabic_text(f"التعليقات: {comments}"), ln=True)
-    
-            pdf.ln(10)
- 
-        pdf_folder = os.path.join(self.list_folder, "PDF_Reports")
-        if not os.path.exists(pdf_folder):
-            os.makedirs(pdf_folder)
-        pdf_file = os.path.join(pdf_folder, f"pdf_report_{today.strftime('%Y-%m-%d')}.pdf")
-        pdf.output(pdf_file)
-        messagebox.showinfo("تقرير", f"تم حفظ تقرير PDF في:\n{pdf_file}")
+        submit_pdf_report(self.master, self.repository, self.list_name, self.tasks)
+
+# ---------------------------
+# التشغيل الدفعي للتقارير من سطر الأوامر (بدون واجهة Tk)
+# ---------------------------
+def load_storage_backend():
+    if os.path.exists(CONFIG_FILE):
+        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+            return json.load(f).get("storage_backend", DEFAULT_STORAGE_BACKEND)
+    return DEFAULT_STORAGE_BACKEND
+
+def generate_list_reports(list_name, tasks, report_types, storage_backend, today, chart_formats=("png",)):
+    # تعمل في عملية منفصلة لكل قائمة
+    # تعيد (اسم القائمة، الملفات المكتوبة، الملفات التي لم تتغير، الزمن بالثواني)
+    started = time.perf_counter()
+    repository = get_repository(os.path.join(MAIN_FOLDER, list_name), storage_backend)
+    written = []
+    unchanged = []
+    if repository.exists():
+        results = []
+        for period in report_types:
+            if period == "chart":
+                # رسم التقرير التفاعلي (آخر 7 أيام) بكل الصيغ المطلوبة
+                results.extend(build_chart(repository, list_name, tasks, today=today, fmt=fmt) for fmt in chart_formats)
+            else:
+                results.append(build_report(repository, list_name, tasks, period, today))
+        for result in results:
+            if result is not None:
+                (unchanged if result[1] else written).append(result[0])
+    return list_name, written, unchanged, time.perf_counter() - started
+
+def run_batch_reports(list_names=None, report_types=BATCH_REPORT_TYPES, workers=None, chart_formats=("png",)):
+    import pandas as pd
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    lists_data = load_lists()
+    list_names = list_names or list(lists_data.keys())
+    unknown = [name for name in list_names if name not in lists_data]
+    for name in unknown:
+        print(f"{name}: القائمة غير موجودة في {LISTS_FILE}", file=sys.stderr)
+    list_names = [name for name in list_names if name in lists_data]
+    storage_backend = load_storage_backend()
+    today = pd.Timestamp.today().normalize()
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(generate_list_reports, name, lists_data[name], tuple(report_types), storage_backend, today,
+                        tuple(chart_formats))
+            for name in list_names
+        ]
+        for future in as_completed(futures):
+            list_name, written, unchanged, elapsed = future.result()
+            print(f"{list_name}: {len(written)} reports, {len(unchanged)} unchanged ({elapsed:.2f}s)")
+            for path in written:
+                print(f"  {path}")
+    print(f"{len(list_names)} lists in {time.perf_counter() - started:.2f}s")
+    return 1 if unknown else 0
+
+def run_combined_report(list_names=None, start=None, end=None):
+    import pandas as pd
+    from report_engine import period_start
+    lists_data = load_lists()
+    list_names = [name for name in (list_names or lists_data.keys()) if name in lists_data]
+    end = pd.Timestamp(end).normalize() if end else pd.Timestamp.today().normalize()
+    start = pd.Timestamp(start).normalize() if start else period_start("rolling365", end)
+    started = time.perf_counter()
+    path = build_combined_pdf_report(lists_data, list_names, load_storage_backend(), start, end)
+    print(f"{len(list_names)} lists -> {path} ({time.perf_counter() - started:.2f}s)")
+    return 0
+
+def run_comment_search(query, list_names=None):
+    # البحث في التعليقات دون واجهة: يحدّث الفهرس للقوائم المتغيرة ثم يطبع النتائج
+    lists_data = load_lists()
+    comment_index = CommentIndex(os.path.join(MAIN_FOLDER, COMMENT_INDEX_FILE))
+    started = time.perf_counter()
+    reindexed = comment_index.sync(lists_data, MAIN_FOLDER, load_storage_backend())
+    synced = time.perf_counter()
+    rows = comment_index.search(query, list_names)
+    for list_name, task, date, comment in rows:
+        print(f"{date}  {list_name} / {task}: {comment}")
+    print(f"{len(rows)} results in {(time.perf_counter() - synced) * 1000:.1f} ms "
+          f"(index sync: {len(reindexed)} lists, {(synced - started) * 1000:.0f} ms)")
+    return 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="مدير القوائم")
+    parser.add_argument("--batch-reports", action="store_true",
+                        help="توليد التقارير لكل القوائم دون فتح الواجهة")
+    parser.add_argument("--lists", nargs="+", metavar="NAME", help="أسماء القوائم (الافتراضي: كل القوائم)")
+    parser.add_argument("--types", nargs="+", choices=BATCH_REPORT_TYPES, default=list(BATCH_REPORT_TYPES),
+                        help="أنواع التقارير")
+    parser.add_argument("--workers", type=int, default=None, help="عدد العمليات (الافتراضي: عدد الأنوية)")
+    parser.add_argument("--chart-formats", nargs="+", choices=CHART_FORMATS, default=["png"],
+                        help="صيغ ملفات الرسم البياني في التشغيل الدفعي")
+    parser.add_argument("--combined-pdf", action="store_true",
+                        help="تقرير PDF واحد لكل القوائم للفترة المحددة (الافتراضي: آخر 365 يوماً)")
+    parser.add_argument("--from", dest="start", metavar="YYYY-MM-DD", help="بداية فترة التقرير المجمع")
+    parser.add_argument("--to", dest="end", metavar="YYYY-MM-DD", help="نهاية فترة التقرير المجمع")
+    parser.add_argument("--search-comments", metavar="QUERY", help="البحث في تعليقات السجل لكل القوائم")
+    return parser.parse_args(argv)
 
 # ---------------------------
 # بدء تشغيل التطبيق
@@ -1137,5 +1535,12 @@ class DailyTrackerApp(tk.Toplevel):
 if __name__ == "__main__":
     if not os.path.exists(MAIN_FOLDER):
         os.makedirs(MAIN_FOLDER)
+    args = parse_args()
+    if args.batch_reports:
+        sys.exit(run_batch_reports(args.lists, args.types, args.workers, args.chart_formats))
+    if args.combined_pdf:
+        sys.exit(run_combined_report(args.lists, args.start, args.end))
+    if args.search_comments:
+        sys.exit(run_comment_search(args.search_comments, args.lists))
     app = TaskManagerApp()
     app.mainloop()
@@ -0,0 +1,49 @@
+import functools
+import arabic_reshaper
+from bidi.algorithm import get_display
+
+# عدد النصوص المحفوظة بعد التشكيل (أسماء المهام والعناوين تتكرر في كل تقرير وكل قائمة)
+RESHAPE_CACHE_SIZE = 4096
+# الكلمات تتكرر أكثر بكثير من الأسطر (خاصة في التعليقات)
+WORD_CACHE_SIZE = 16384
+
+
+@functools.lru_cache(maxsize=WORD_CACHE_SIZE)
+def _reshape_word(word):
+    return arabic_reshaper.reshape(word)
+
+
+@functools.lru_cache(maxsize=RESHAPE_CACHE_SIZE)
+def reshape_arabic_text(text):
+    # اتصال الحروف لا يتجاوز المسافة، فتشكَّل كل كلمة وحدها (من الذاكرة غالباً) ثم يرتب السطر كاملاً
+    reshaped_text = " ".join(_reshape_word(word) for word in text.split(" "))
+    bidi_text = get_display(reshaped_text)
+    return bidi_text
+
+
+def reshape_many(texts):
+    # تشكيل عمود كامل من النصوص؛ كل نص مكرر داخل العمود يشكَّل مرة واحدة
+    shaped = {}
+    result = []
+    for text in texts:
+        if text not in shaped:
+            shaped[text] = reshape_arabic_text(text)
+        result.append(shaped[text])
+    return result
+
+
+def reshape_cache_stats():
+    info = reshape_arabic_text.cache_info()
+    calls = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_rate": info.hits / calls if calls else 0.0,
+    }
+
+
+def clear_reshape_cache():
+    reshape_arabic_text.cache_clear()
+    _reshape_word.cache_clear()
@@ -0,0 +1,37 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from arabic_text import reshape_many, reshape_cache_stats, clear_reshape_cache
+from arabic_reshaper import reshape
+from bidi.algorithm import get_display
+
+TASKS = 200
+REPORTS = 50
+
+
+def main():
+    # نفس أسماء المهام تتكرر في كل تقرير (PDF أو رسم بياني) لكل قائمة
+    lines = [f"المهمة: مهمة رقم {i}" for i in range(TASKS)] + [f"عدد المرات: {i % 8}" for i in range(TASKS)]
+    start = time.perf_counter()
+    for _ in range(REPORTS):
+        uncached = [get_display(reshape(line)) for line in lines]
+    uncached_time = time.perf_counter() - start
+
+    clear_reshape_cache()
+    start = time.perf_counter()
+    for _ in range(REPORTS):
+        cached = reshape_many(lines)
+    cached_time = time.perf_counter() - start
+    assert cached == uncached
+
+    stats = reshape_cache_stats()
+    print(f"{REPORTS} reports x {len(lines)} lines")
+    print(f"uncached: {uncached_time * 1000:8.1f} ms")
+    print(f"cached:   {cached_time * 1000:8.1f} ms  (x{uncached_time / cached_time:.0f})")
+    print(f"cache: {stats['hits']} hits, {stats['misses']} misses, hit rate {stats['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
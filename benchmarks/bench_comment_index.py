@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+import random
+import datetime
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from progress_store import open_progress_store
+from comment_index import CommentIndex
+
+LISTS = 5
+TASKS = 20
+YEARS = 3
+COMMENT_RATE = 0.3
+WORDS = "صليت في المسجد ثم قرأت ورداً من القرآن وبعدها راجعت الدروس مع الأصدقاء بالسيارة".split()
+QUERIES = ("مسجد", "المَسجد", "قرات الدروس", "السياره", "غير_موجود")
+
+
+def make_lists(main_folder):
+    random.seed(0)
+    lists_data = {}
+    today = datetime.date.today()
+    for n in range(LISTS):
+        tasks = [{"id": f"{n}-{i}", "task": f"مهمة {i}"} for i in range(TASKS)]
+        lists_data[f"قائمة {n}"] = tasks
+        store = open_progress_store(os.path.join(main_folder, f"قائمة {n}"), "sqlite")
+        for offset in range(365 * YEARS):
+            day = (today - datetime.timedelta(days=offset)).strftime("%Y-%m-%d")
+            comments = {
+                t["task"]: " ".join(random.choices(WORDS, k=random.randint(3, 12)))
+                for t in tasks if random.random() < COMMENT_RATE
+            }
+            store.save_day(day, tasks, {}, comments)
+    return lists_data
+
+
+def main():
+    folder = tempfile.mkdtemp()
+    main_folder = os.path.join(folder, "Lists")
+    lists_data = make_lists(main_folder)
+    index = CommentIndex(os.path.join(folder, "comments_index.sqlite3"))
+    started = time.perf_counter()
+    index.sync(lists_data, main_folder, "sqlite")
+    print(f"{LISTS} lists x {TASKS} tasks x {YEARS} years: full index in {time.perf_counter() - started:.2f} s "
+          f"({os.path.getsize(index.path) / 1e6:.1f} MB)")
+    started = time.perf_counter()
+    index.sync(lists_data, main_folder, "sqlite")
+    print(f"sync with no changes: {(time.perf_counter() - started) * 1000:.1f} ms")
+    # حفظ يوم (كما في خيط Tk) أثناء إعادة فهرسة كل القوائم في الخلفية
+    tasks = lists_data["قائمة 0"]
+    day = datetime.date.today().strftime("%Y-%m-%d")
+    for list_name in lists_data:
+        index.mark_stale(list_name)
+    syncing = threading.Thread(target=index.sync, args=(lists_data, main_folder, "sqlite"))
+    syncing.start()
+    waits = []
+    while syncing.is_alive():
+        started = time.perf_counter()
+        index.update_day("قائمة 0", day, tasks, {tasks[0]["task"]: "صليت في المسجد"})
+        waits.append(time.perf_counter() - started)
+    syncing.join()
+    print(f"save during full reindex: {len(waits)} saves, longest {max(waits) * 1000:.1f} ms")
+    started = time.perf_counter()
+    index.sync(lists_data, main_folder, "sqlite")
+    print(f"sync after reindex: {(time.perf_counter() - started) * 1000:.1f} ms")
+    for query in QUERIES:
+        started = time.perf_counter()
+        rows = index.search(query)
+        print(f"{query!r:16} {len(rows):4d} results  {(time.perf_counter() - started) * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
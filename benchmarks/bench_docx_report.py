@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import random
+import tempfile
+from docx import Document
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from report_writers import write_word_report
+
+ROW_COUNTS = (100, 1000, 5000)
+WORDS = "صليت في المسجد ثم قرأت ورداً من القرآن وبعدها راجعت الدروس مع الأصدقاء & <test>".split()
+
+
+def make_report(rows):
+    random.seed(rows)
+    tasks = [{"task": f"مهمة {i}"} for i in range(rows)]
+    summary = {}
+    for task_obj in tasks:
+        # تعليقات طويلة متعددة الأسطر (كما يجمعها summarize) وبعضها فارغ
+        comments = "\n".join(
+            f"2026-01-{day:02d}: " + " ".join(random.choices(WORDS, k=random.randint(5, 40)))
+            for day in range(1, random.randint(1, 30))
+        )
+        summary[task_obj["task"]] = {"count": random.randint(0, 30), "comments": comments}
+    return tasks, {"days": 30, "tasks": summary}
+
+
+def write_word_report_add_row(path, title, tasks, report):
+    # الطريقة السابقة: صف بصف عبر table.add_row().cells
+    summary = report["tasks"]
+    document = Document()
+    document.add_heading(title, 0)
+    table = document.add_table(rows=1, cols=3)
+    hdr_cells = table.rows[0].cells
+    hdr_cells[0].text = "المهمة"
+    hdr_cells[1].text = "عدد مرات القيام"
+    hdr_cells[2].text = "التعليقات"
+    for task_obj in tasks:
+        task = task_obj["task"]
+        row_cells = table.add_row().cells
+        row_cells[0].text = task
+        row_cells[1].text = str(summary[task]["count"])
+        row_cells[2].text = summary[task]["comments"]
+    document.save(path)
+    return path
+
+
+def body_xml(path):
+    return Document(path).element.body.xml
+
+
+def main():
+    folder = tempfile.mkdtemp()
+    for rows in ROW_COUNTS:
+        tasks, report = make_report(rows)
+        started = time.perf_counter()
+        old_path = write_word_report_add_row(os.path.join(folder, f"old_{rows}.docx"), "تقرير", tasks, report)
+        old_time = time.perf_counter() - started
+        started = time.perf_counter()
+        new_path = write_word_report(os.path.join(folder, f"new_{rows}.docx"), "تقرير", tasks, report)
+        new_time = time.perf_counter() - started
+        # نفس بنية المستند تماماً
+        assert body_xml(old_path) == body_xml(new_path)
+        print(f"{rows:5d} rows: add_row {old_time:7.2f} s  bulk {new_time:6.2f} s  (x{old_time / new_time:.1f})")
+
+
+if __name__ == "__main__":
+    main()
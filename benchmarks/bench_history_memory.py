@@ -0,0 +1,30 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from completion_history import CompletionHistory
+from bench_report_engine import make_history, DAYS, TASKS
+
+
+def main():
+    df, tasks = make_history()
+    frame_bytes = df.memory_usage(deep=True).sum()
+    start = time.perf_counter()
+    history = CompletionHistory.from_frame(df)
+    build_time = time.perf_counter() - start
+    history_bytes = history.memory_usage()
+    print(f"history: {DAYS} days x {TASKS} tasks")
+    print(f"DataFrame (deep):   {frame_bytes / 1e6:8.2f} MB")
+    print(f"CompletionHistory:  {history_bytes / 1e6:8.2f} MB  (x{frame_bytes / history_bytes:.0f} smaller)")
+    print(f"build time:         {build_time * 1000:8.1f} ms")
+
+    # التحقق من أن التحويل العكسي يعيد نفس تخطيط Excel
+    restored = CompletionHistory.from_frame(history.to_frame())
+    assert restored.task_keys == history.task_keys
+    assert (restored.done_bits == history.done_bits).all()
+    assert history.comments([t["task"] for t in tasks]) == restored.comments([t["task"] for t in tasks])
+
+
+if __name__ == "__main__":
+    main()
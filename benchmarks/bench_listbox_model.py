@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from listbox_model import ListboxModel
+
+LISTS = 10000
+
+
+class CountingListbox:
+    # يسجل عمليات Tk التي يطلبها النموذج ويحاكي محتوى Listbox للتحقق من النتيجة (لا يحتاج شاشة)
+    def __init__(self):
+        self.rows = []
+        self.calls = 0
+
+    def delete(self, first, last=None):
+        self.calls += 1
+        last = len(self.rows) - 1 if last == "end" else (first if last is None else last)
+        del self.rows[first:last + 1]
+
+    def insert(self, index, *texts):
+        self.calls += 1
+        self.rows[index:index] = list(texts)
+
+    def itemconfig(self, index, **options):
+        self.calls += 1
+
+
+def full_refresh_calls(items):
+    # الطريقة السابقة: delete(0, END) ثم insert و itemconfig لكل عنصر
+    return 1 + 2 * len(items)
+
+
+def main():
+    items = [(f"قائمة {i}", {}) for i in range(LISTS)]
+    listbox = CountingListbox()
+    model = ListboxModel(listbox)
+    model.update(items)
+    swapped = list(items)
+    swapped[500], swapped[501] = swapped[501], swapped[500]
+    colored = list(swapped)
+    colored[700] = (colored[700][0], {"bg": "#ff0000"})
+    filtered = [item for item in colored if item[0].endswith("7")]
+    for label, new_items in (("move up/down", swapped), ("color change", colored),
+                             ("search filter", filtered), ("clear search", colored)):
+        listbox.calls = 0
+        started = time.perf_counter()
+        model.update(new_items)
+        elapsed = time.perf_counter() - started
+        assert listbox.rows == [text for text, _ in new_items]
+        print(f"{label:14} {listbox.calls:6d} Tk calls (full refresh: {full_refresh_calls(new_items):6d})  "
+              f"diff {elapsed * 1000:5.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
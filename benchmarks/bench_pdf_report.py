@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import random
+import tempfile
+import tracemalloc
+import warnings
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from progress_repository import ProgressRepository
+from report_pdf import write_pdf_report
+
+TASKS = 40
+DAYS = 366
+RANGES = (7, 30, 90, 365)
+COMMENT_RATE = 0.3
+WORDS = "صليت في المسجد ثم قرأت ورداً من القرآن وبعدها راجعت الدروس مع الأصدقاء".split()
+
+
+def make_repository(folder, today):
+    random.seed(0)
+    tasks = [{"id": str(i), "task": f"مهمة رقم {i} لها اسم طويل نوعاً ما"} for i in range(TASKS)]
+    repository = ProgressRepository(folder, "sqlite")
+    for offset in range(DAYS):
+        day = (today - pd.Timedelta(days=offset)).strftime("%Y-%m-%d")
+        statuses = {t["task"]: random.random() < 0.6 for t in tasks}
+        comments = {
+            t["task"]: " ".join(random.choices(WORDS, k=random.randint(3, 25)))
+            for t in tasks if random.random() < COMMENT_RATE
+        }
+        repository.save_day(day, tasks, statuses, comments)
+    return repository, tasks
+
+
+def main():
+    # تحذيرات fpdf عن جدول الحروف في الخط لا تهم القياس
+    warnings.filterwarnings("ignore")
+    folder = tempfile.mkdtemp()
+    today = pd.Timestamp.today().normalize()
+    repository, tasks = make_repository(folder, today)
+    print(f"{TASKS} tasks, comments on {COMMENT_RATE:.0%} of days")
+    for days in RANGES:
+        start = today - pd.Timedelta(days=days - 1)
+        # تحميل السجل خارج القياس حتى يقاس الرسم وحده
+        repository.history(tasks, start)
+        repository.completion_index(tasks, start)
+        tracemalloc.start()
+        started = time.perf_counter()
+        _, rows = repository.report_rows(tasks, start, today)
+        path = write_pdf_report(os.path.join(folder, f"report_{days}.pdf"), "تقرير", [(None, len(tasks), rows)])
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{days:4d} days: {elapsed:6.2f} s  peak {peak / 1e6:5.1f} MB  {os.path.getsize(path) / 1e3:6.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from progress_store import DATE_COLUMN, COMMENT_SUFFIX, DONE_MARK, NOT_DONE_MARK
+from completion_history import CompletionHistory
+from report_engine import summarize
+
+DAYS = 10_000
+TASKS = 200
+
+
+def make_history(days=DAYS, tasks=TASKS, seed=0):
+    # سجل صناعي بنفس تخطيط ملف Excel: عمود حالة وعمود تعليق لكل مهمة
+    rng = np.random.default_rng(seed)
+    columns = {DATE_COLUMN: pd.date_range("2000-01-01", periods=days, freq="D")}
+    for i in range(tasks):
+        done = rng.random(days) < 0.6
+        columns[f"task{i}"] = np.where(done, DONE_MARK, NOT_DONE_MARK)
+        comments = np.full(days, np.nan, dtype=object)
+        has_comment = rng.random(days) < 0.05
+        comments[has_comment] = f"comment {i}"
+        columns[f"task{i}{COMMENT_SUFFIX}"] = comments
+    tasks_list = [{"task": f"task{i}"} for i in range(tasks)]
+    return pd.DataFrame(columns), tasks_list
+
+
+def legacy_summary(period_data, tasks):
+    # الطريقة القديمة: حلقة على المهام مع apply وقائمة تعليقات
+    summary = {}
+    for task_obj in tasks:
+        task = task_obj["task"]
+        count = period_data[task].apply(lambda x: 1 if x == "✔" else 0).sum()
+        comments_series = period_data[f"{task}_تعليق"].dropna().astype(str)
+        comments = "; ".join([c for c in comments_series if c.strip() != ""])
+        summary[task] = {"count": count, "comments": comments}
+    return summary
+
+
+def timed(func, repeat=3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    df, tasks = make_history()
+    history = CompletionHistory.from_frame(df)
+    print(f"history: {DAYS} days x {TASKS} tasks")
+    for label, start in (("full history", None), ("last 30 days", df[DATE_COLUMN].iloc[-30])):
+        period_data = df if start is None else df[df[DATE_COLUMN] >= start]
+        legacy_time, legacy = timed(lambda: legacy_summary(period_data, tasks))
+        engine_time, report = timed(lambda: summarize(history, tasks, start=start))
+        for task_obj in tasks:
+            task = task_obj["task"]
+            assert legacy[task]["count"] == report["tasks"][task]["count"]
+            assert legacy[task]["comments"] == report["tasks"][task]["comments"]
+        print(f"{label:>14}: legacy {legacy_time * 1000:8.1f} ms | "
+              f"summarize {engine_time * 1000:8.1f} ms | x{legacy_time / engine_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
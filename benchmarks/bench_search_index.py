@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import random
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from search_index import ListSearchIndex
+
+LISTS = 10000
+TASKS_PER_LIST = 8
+WORDS = "صلاة الفجر الظهر العصر المغرب العشاء قراءة القرآن ورد رياضة مشي دراسة مراجعة كتاب Read Gym".split()
+TYPED = ("صلاة الفجر", "قائمة 1234", "read", "zzz", "مراجعة 5")
+
+
+def make_lists():
+    random.seed(0)
+    return {
+        f"قائمة {i} {random.choice(WORDS)}": [
+            {"task": f"{' '.join(random.choices(WORDS, k=random.randint(1, 3)))} {i % 97}"}
+            for _ in range(TASKS_PER_LIST)
+        ]
+        for i in range(LISTS)
+    }
+
+
+def naive_search(lists_data, query):
+    # الطريقة السابقة في refresh_lists
+    query = query.lower()
+    return {
+        list_name for list_name, tasks in lists_data.items()
+        if query in list_name.lower() or any(query in task_obj["task"].lower() for task_obj in tasks)
+    }
+
+
+def main():
+    lists_data = make_lists()
+    started = time.perf_counter()
+    index = ListSearchIndex(lists_data)
+    index.search("x")
+    print(f"{LISTS} lists x {TASKS_PER_LIST} tasks, index built in {(time.perf_counter() - started) * 1000:.0f} ms")
+    for typed in TYPED:
+        naive_times = []
+        index_times = []
+        for k in range(1, len(typed) + 1):
+            query = typed[:k]
+            started = time.perf_counter()
+            expected = naive_search(lists_data, query)
+            naive_times.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            result = index.search(query)
+            index_times.append(time.perf_counter() - started)
+            assert result == expected, query
+        print(
+            f"{typed!r:14} {len(result):5d} matches  per keystroke: "
+            f"naive median {statistics.median(naive_times) * 1000:6.2f} ms  "
+            f"index median {statistics.median(index_times) * 1000:5.2f} ms  max {max(index_times) * 1000:5.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
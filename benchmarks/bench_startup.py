@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 5
+# الحد الأقصى المسموح به (بالثواني) من بدء العملية حتى أول خمول لحلقة mainloop
+STARTUP_BUDGET = float(os.environ.get("STARTUP_BUDGET", "1.0"))
+# بدون شاشة (خادم CI) يقاس زمن استيراد A.py فقط
+IMPORT_BUDGET = float(os.environ.get("IMPORT_BUDGET", "0.4"))
+# مكتبات يجب ألا تحمَّل قبل ظهور النافذة الأولى
+HEAVY_MODULES = ("pandas", "numpy", "matplotlib", "docx", "fpdf", "PIL", "arabic_reshaper", "bidi", "openpyxl")
+
+CHILD = """
+import sys, json, time
+sys.path.insert(0, {root!r})
+import A
+result = {{"heavy": [m for m in {heavy!r} if m in sys.modules]}}
+try:
+    app = A.TaskManagerApp()
+except Exception as e:
+    result["display"] = False
+    print(json.dumps(result), flush=True)
+else:
+    def on_idle():
+        result["display"] = True
+        result["heavy"] = [m for m in {heavy!r} if m in sys.modules]
+        print(json.dumps(result), flush=True)
+        app.destroy()
+    app.after_idle(on_idle)
+    app.mainloop()
+"""
+
+
+def run_once(workdir):
+    # القياس يشمل تشغيل المفسر نفسه، والتطبيق يعمل في مجلد فارغ حتى لا تعدَّل بيانات المستخدم
+    code = CHILD.format(root=ROOT, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-c", code], cwd=workdir, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    elapsed = time.perf_counter() - start
+    process.wait()
+    if not line:
+        raise SystemExit(f"startup run failed (exit code {process.returncode})")
+    return elapsed, json.loads(line)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as workdir:
+        runs = [run_once(workdir) for _ in range(RUNS)]
+    elapsed = statistics.median(t for t, _ in runs)
+    result = runs[-1][1]
+    label, budget = ("process start -> first idle", STARTUP_BUDGET) if result["display"] else \
+        ("process start -> import A (no display)", IMPORT_BUDGET)
+    print(f"{label}: median {elapsed * 1000:.0f} ms over {RUNS} runs (budget {budget * 1000:.0f} ms)")
+    failed = False
+    if result["heavy"]:
+        print(f"FAIL: heavy modules loaded at startup: {', '.join(result['heavy'])}")
+        failed = True
+    if elapsed > budget:
+        print("FAIL: startup time is over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
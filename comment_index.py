@@ -0,0 +1,226 @@
+import os
+import re
+import json
+import sqlite3
+import threading
+from contextlib import closing
+from progress_repository import ProgressRepository
+
+# فهرس التعليقات لكل القوائم في ملف واحد داخل مجلد القوائم (بجانب السجل الذي يفهرسه)
+COMMENT_INDEX_FILE = "comments_index.sqlite3"
+# يزاد عند تغيير التطبيع أو المخطط حتى يعاد بناء الفهرس من السجل
+COMMENT_INDEX_VERSION = 1
+DEFAULT_SEARCH_LIMIT = 200
+# إعادة فهرسة قائمة تكتب على دفعات ويحرَّر القفل بينها، فلا ينتظر حفظ اليوم (في خيط Tk)
+# انتهاء فهرسة القائمة كاملة في الخلفية
+INDEX_BATCH_SIZE = 200
+
+# الحركات والتطويل والعلامات القرآنية تحذف قبل الفهرسة والبحث
+_DIACRITICS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+# توحيد أشكال الحروف: الهمزات على الألف، الألف المقصورة، التاء المربوطة، والأرقام الهندية
+_LETTER_FORMS = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي", "ئ": "ي", "ی": "ي",
+    "ؤ": "و",
+    "ة": "ه",
+    "ک": "ك",
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+    **{chr(0x06F0 + digit): str(digit) for digit in range(10)},
+})
+_WORD = re.compile(r"\w+")
+# "ال" التعريف وما يسبقها من حروف: "المسجد" تفهرس أيضاً كـ "مسجد"
+ARTICLE_PREFIXES = ("وال", "بال", "فال", "كال", "لل", "ال")
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS comments ("
+    "id INTEGER PRIMARY KEY, list TEXT NOT NULL, task_id TEXT NOT NULL, task TEXT NOT NULL, "
+    "date TEXT NOT NULL, comment TEXT NOT NULL, UNIQUE (list, task_id, date))",
+    "CREATE INDEX IF NOT EXISTS comments_by_date ON comments (date)",
+    "CREATE TABLE IF NOT EXISTS terms ("
+    "term TEXT NOT NULL, comment_id INTEGER NOT NULL, PRIMARY KEY (term, comment_id)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS terms_by_comment ON terms (comment_id)",
+    # توقيع مخزن كل قائمة عند آخر فهرسة (لاكتشاف التعديلات التي تمت خارج هذا التطبيق)
+    "CREATE TABLE IF NOT EXISTS lists (list TEXT PRIMARY KEY, signature TEXT)",
+)
+
+_lock = threading.Lock()
+
+
+def normalize_text(text):
+    return _DIACRITICS.sub("", str(text).casefold()).translate(_LETTER_FORMS)
+
+
+def _strip_article(word):
+    for prefix in ARTICLE_PREFIXES:
+        if word.startswith(prefix) and len(word) - len(prefix) >= 2:
+            return word[len(prefix):]
+    return word
+
+
+def comment_terms(text):
+    # كلمات التعليق بعد التطبيع، مع الكلمة بدون "ال" إن وجدت
+    terms = set()
+    for word in _WORD.findall(normalize_text(text)):
+        terms.add(word)
+        terms.add(_strip_article(word))
+    return terms
+
+
+def query_terms(query):
+    # كل كلمة في البحث تطابق بداية كلمة في التعليق (بدون "ال" حتى تطابق الشكلين)
+    return [_strip_article(word) for word in _WORD.findall(normalize_text(query))]
+
+
+def _signature_text(signature):
+    return None if signature is None else json.dumps(signature, ensure_ascii=False)
+
+
+# ---------------------------
+# فهرس نصي لكل تعليقات السجل: كلمة -> (القائمة، المهمة، التاريخ)
+# يحدَّث مع كل حفظ يومي، ويعاد بناء القائمة من مخزنها فقط إذا تغيّر توقيعه من خارج التطبيق
+# ---------------------------
+class CommentIndex:
+    def __init__(self, path):
+        self.path = path
+
+    def _connect(self):
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        conn = sqlite3.connect(self.path)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != COMMENT_INDEX_VERSION:
+            # فهرس قديم أو جديد: يبنى من الصفر (المصدر هو سجل القوائم نفسه)
+            with conn:
+                for table in ("comments", "terms", "lists"):
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                for statement in SCHEMA:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {COMMENT_INDEX_VERSION}")
+        return conn
+
+    def _delete_comments(self, conn, where, params):
+        conn.execute(f"DELETE FROM terms WHERE comment_id IN (SELECT id FROM comments WHERE {where})", params)
+        conn.execute(f"DELETE FROM comments WHERE {where}", params)
+
+    def _insert_comments(self, conn, rows):
+        # rows: (القائمة، معرّف المهمة، اسم المهمة، التاريخ، التعليق)
+        # تعليق موجود مسبقاً لنفس (القائمة، المهمة، اليوم) يبقى: كتبه حفظ أحدث أثناء إعادة الفهرسة
+        for row in rows:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO comments (list, task_id, task, date, comment) VALUES (?, ?, ?, ?, ?)", row
+            )
+            if not cursor.rowcount:
+                continue
+            comment_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT OR IGNORE INTO terms VALUES (?, ?)",
+                [(term, comment_id) for term in comment_terms(row[4])],
+            )
+
+    def _set_signature(self, conn, list_name, signature):
+        conn.execute("INSERT OR REPLACE INTO lists VALUES (?, ?)", (list_name, _signature_text(signature)))
+
+    def update_day(self, list_name, date_str, tasks, comments, signature_before=None, signature_after=None):
+        # تحديث تعليقات يوم واحد بعد الحفظ؛ التوقيع يحدَّث فقط إذا كان الفهرس متزامناً قبل الحفظ
+        rows = [
+            (list_name, task_obj.get("id") or task_obj["task"], task_obj["task"], date_str,
+             str(comments.get(task_obj["task"], "") or "").strip())
+            for task_obj in tasks
+        ]
+        with _lock, closing(self._connect()) as conn, conn:
+            for row in rows:
+                self._delete_comments(conn, "list = ? AND task_id = ? AND date = ?", row[:2] + row[3:4])
+            self._insert_comments(conn, [row for row in rows if row[4]])
+            stored = conn.execute("SELECT signature FROM lists WHERE list = ?", (list_name,)).fetchone()
+            if stored is not None and stored[0] == _signature_text(signature_before):
+                self._set_signature(conn, list_name, signature_after)
+
+    def index_list(self, list_name, tasks, repository):
+        # إعادة بناء تعليقات قائمة كاملة من مستودعها (كل السنوات بما فيها الأرشيف)
+        signature, (dates, task_ids, _, comments) = repository.load_entries(tasks)
+        names = {task_obj.get("id") or task_obj["task"]: task_obj["task"] for task_obj in tasks}
+        rows = [
+            (list_name, task_id, names.get(task_id, task_id), date, str(comment).strip())
+            for date, task_id, comment in zip(dates, task_ids, comments)
+            if comment and str(comment).strip()
+        ]
+        # الحذف ثم الإدراج على دفعات؛ حفظ يوم بين دفعتين يبقى، والتوقيع (قبل ذلك الحفظ) يكتب في
+        # النهاية فقط فتعاد فهرسة القائمة في المزامنة التالية إن فاتها شيء
+        with closing(self._connect()) as conn:
+            with _lock, conn:
+                conn.execute("UPDATE lists SET signature = NULL WHERE list = ?", (list_name,))
+                old_ids = [row[0] for row in conn.execute("SELECT id FROM comments WHERE list = ?", (list_name,))]
+            for start in range(0, len(old_ids), INDEX_BATCH_SIZE):
+                batch = old_ids[start:start + INDEX_BATCH_SIZE]
+                with _lock, conn:
+                    self._delete_comments(conn, f"id IN ({', '.join('?' * len(batch))})", batch)
+            for start in range(0, len(rows), INDEX_BATCH_SIZE):
+                with _lock, conn:
+                    self._insert_comments(conn, rows[start:start + INDEX_BATCH_SIZE])
+            with _lock, conn:
+                self._set_signature(conn, list_name, signature)
+        return len(rows)
+
+    def sync(self, lists_data, main_folder, backend=None, progress=None):
+        # يعيد فهرسة القوائم التي تغيّر سجلها منذ آخر فهرسة ويحذف القوائم المحذوفة
+        # progress(done, total) كما في مهام التقارير (ويمكنها رفع استثناء للإلغاء)
+        with closing(self._connect()) as conn:
+            stored = dict(conn.execute("SELECT list, signature FROM lists"))
+        reindexed = []
+        for done, (list_name, tasks) in enumerate(lists_data.items(), 1):
+            # مستودع مؤقت (لا يزاحم مستودعات الواجهة في الذاكرة) يشترك معها في قفل مجلد القائمة
+            repository = ProgressRepository(os.path.join(main_folder, list_name), backend)
+            if not repository.exists():
+                if list_name in stored:
+                    self.remove_list(list_name)
+            elif list_name not in stored or stored[list_name] != _signature_text(repository.signature()):
+                self.index_list(list_name, tasks, repository)
+                reindexed.append(list_name)
+            if progress is not None:
+                progress(done, len(lists_data))
+        for list_name in stored.keys() - lists_data.keys():
+            self.remove_list(list_name)
+        return reindexed
+
+    def mark_stale(self, list_name):
+        # فاتَ الفهرسَ حفظٌ لهذه القائمة: أول مزامنة تعيد فهرستها من المخزن
+        with _lock, closing(self._connect()) as conn, conn:
+            conn.execute("UPDATE lists SET signature = NULL WHERE list = ?", (list_name,))
+
+    def remove_list(self, list_name):
+        with _lock, closing(self._connect()) as conn, conn:
+            self._delete_comments(conn, "list = ?", (list_name,))
+            conn.execute("DELETE FROM lists WHERE list = ?", (list_name,))
+
+    def rename_list(self, old_name, new_name):
+        with _lock, closing(self._connect()) as conn, conn:
+            conn.execute("UPDATE comments SET list = ? WHERE list = ?", (new_name, old_name))
+            conn.execute("UPDATE lists SET list = ? WHERE list = ?", (new_name, old_name))
+
+    def rename_tasks(self, list_name, tasks):
+        # السجل مرتبط بمعرّف المهمة، فتغيير اسمها يحدّث الاسم المعروض فقط
+        with _lock, closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "UPDATE comments SET task = ? WHERE list = ? AND task_id = ? AND task != ?",
+                [(task_obj["task"], list_name, task_obj.get("id") or task_obj["task"], task_obj["task"])
+                 for task_obj in tasks],
+            )
+
+    def search(self, query, list_names=None, limit=DEFAULT_SEARCH_LIMIT):
+        # يعيد [(القائمة، المهمة، التاريخ، التعليق)] الأحدث أولاً؛ كل كلمات البحث يجب أن تظهر
+        terms = query_terms(query)
+        if not terms:
+            return []
+        where = " AND ".join("id IN (SELECT comment_id FROM terms WHERE term >= ? AND term < ?)" for _ in terms)
+        params = [value for term in terms for value in (term, term + "\U0010ffff")]
+        if list_names is not None:
+            list_names = list(list_names)
+            where += f" AND list IN ({', '.join('?' * len(list_names))})"
+            params.extend(list_names)
+        params.append(limit)
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                f"SELECT list, task, date, comment FROM comments WHERE {where} ORDER BY date DESC, list LIMIT ?",
+                params,
+            ).fetchall()
@@ -0,0 +1,80 @@
+import os
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from arabic_text import reshape_arabic_text, reshape_many
+from font_registry import chart_font_name
+
+CHART_SIZE = (6, 4)
+CHART_DPI = 100
+BAR_COLOR = "skyblue"
+CHART_TITLE = "عدد مرات إنجاز المهام"
+
+
+# ---------------------------
+# رسم عدد مرات إنجاز المهام: الشكل والمحاور تنشأ مرة واحدة والأعمدة تحدَّث في مكانها
+# لا يستخدم pyplot ولا Tk، فيعمل في نافذة أو في عملية خلفية بلا شاشة
+# ---------------------------
+class CompletionChart:
+    def __init__(self, figure=None):
+        self.figure = figure if figure is not None else Figure(figsize=CHART_SIZE, dpi=CHART_DPI)
+        self.ax = self.figure.add_subplot()
+        self.font = chart_font_name()
+        self.ax.set_title(reshape_arabic_text(CHART_TITLE), fontfamily=self.font)
+        self.ax.set_ylabel(reshape_arabic_text("العدد"), fontfamily=self.font)
+        self._bars = None
+        self._tasks = None
+        self._counts = None
+
+    def set_report(self, report):
+        summary = report["tasks"]
+        return self.set_counts(summary.keys(), [task_summary["count"] for task_summary in summary.values()])
+
+    def set_counts(self, tasks, counts):
+        # يعيد False إذا كانت البيانات نفسها المرسومة حالياً (لا حاجة لإعادة الرسم)
+        tasks = tuple(tasks)
+        counts = tuple(counts)
+        if tasks == self._tasks and counts == self._counts:
+            return False
+        if tasks != self._tasks:
+            self._set_tasks(tasks, counts)
+        else:
+            for bar, count in zip(self._bars, counts):
+                bar.set_height(count)
+        self.ax.set_ylim(0, max(counts, default=0) * 1.1 or 1)
+        self._counts = counts
+        return True
+
+    def _set_tasks(self, tasks, counts):
+        # تغيّرت المهام نفسها: تستبدل الأعمدة وأسماء المحور فقط
+        if self._bars is not None:
+            self._bars.remove()
+        positions = range(len(tasks))
+        self._bars = self.ax.bar(positions, counts, color=BAR_COLOR)
+        self.ax.set_xticks(positions)
+        self.ax.set_xlim(-0.5, len(tasks) - 0.5)
+        self.ax.set_xticklabels(reshape_many(tasks), rotation=45, fontfamily=self.font)
+        self._tasks = tasks
+        self.figure.tight_layout()
+
+    def save(self, path):
+        # الصيغة من امتداد الملف (png أو svg)
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self.figure.savefig(path, dpi=CHART_DPI)
+        return path
+
+    def close(self):
+        self.figure.clear()
+        self._bars = None
+
+
+def write_chart(path, tasks, counts):
+    # تصدير الرسم إلى ملف بمحرك Agg (لا يحتاج شاشة)
+    chart = CompletionChart()
+    FigureCanvasAgg(chart.figure)
+    chart.set_counts(tasks, counts)
+    try:
+        return chart.save(path)
+    finally:
+        chart.close()
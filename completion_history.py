@@ -0,0 +1,209 @@
+import sys
+import hashlib
+import numpy as np
+import pandas as pd
+from progress_store import DATE_COLUMN, COMMENT_SUFFIX, DONE_MARK, NOT_DONE_MARK, task_key
+
+
+def to_day(value):
+    return np.datetime64(pd.Timestamp(value).normalize().to_datetime64(), "D")
+
+
+# ---------------------------
+# تمثيل مضغوط لسجل الإنجاز في الذاكرة
+# الإنجاز مصفوفة بتات (الأيام × المهام) والتعليقات مخزنة فقط للخلايا غير الفارغة
+# ---------------------------
+class CompletionHistory:
+    def __init__(self, dates, task_keys, done_bits, recorded_bits,
+                 comment_task, comment_row, comment_id, comment_pool):
+        # مفاتيح الأعمدة هي معرّفات المهام الثابتة (أو أسماؤها للمهام القديمة)
+        self.dates = dates
+        self.task_keys = tuple(task_keys)
+        self.task_positions = {key: i for i, key in enumerate(self.task_keys)}
+        # done: المهمة أنجزت، recorded: للمهمة قيمة مسجلة في ذلك اليوم
+        self.done_bits = done_bits
+        self.recorded_bits = recorded_bits
+        # التعليقات مرتبة حسب المهمة ثم اليوم، والنصوص المكررة تخزن مرة واحدة
+        self.comment_task = comment_task
+        self.comment_row = comment_row
+        self.comment_id = comment_id
+        self.comment_pool = comment_pool
+        # مفتاح مركّب (المهمة، اليوم) مرتب يسمح بإيجاد تعليقات كل المهام بعملية بحث واحدة
+        self._comment_keys = comment_task.astype(np.int64) * (len(dates) + 1) + comment_row
+
+    def __len__(self):
+        return len(self.dates)
+
+    @classmethod
+    def _build(cls, dates, task_keys, done, recorded, comment_task, comment_row, texts):
+        # texts بترتيب (المهمة، اليوم)؛ نحتفظ بالتعليقات غير الفارغة فقط مع توحيد النصوص المكررة
+        keep = np.fromiter((text.strip() != "" for text in texts), dtype=bool, count=len(texts))
+        pool_index = {}
+        comment_pool = []
+        comment_id = []
+        for text, kept in zip(texts, keep):
+            if not kept:
+                continue
+            if text not in pool_index:
+                pool_index[text] = len(comment_pool)
+                comment_pool.append(sys.intern(text))
+            comment_id.append(pool_index[text])
+        return cls(
+            dates, task_keys, np.packbits(done, axis=1), np.packbits(recorded, axis=1),
+            np.asarray(comment_task, dtype=np.int32)[keep], np.asarray(comment_row, dtype=np.int32)[keep],
+            np.asarray(comment_id, dtype=np.int32), comment_pool,
+        )
+
+    @classmethod
+    def from_entries(cls, dates, task_keys, done, comments):
+        # التحويل من التخطيط الطويل: صف لكل (التاريخ، معرّف المهمة، الإنجاز، التعليق)
+        days, row = np.unique(np.asarray(dates, dtype="datetime64[D]"), return_inverse=True)
+        keys, col = np.unique(np.asarray(task_keys, dtype=str), return_inverse=True)
+        row = row.reshape(-1)
+        col = col.reshape(-1)
+        # عند تكرار نفس (اليوم، المهمة) يؤخذ آخر صف
+        flat = row.astype(np.int64) * max(len(keys), 1) + col
+        _, last = np.unique(flat[::-1], return_index=True)
+        picked = np.sort(len(flat) - 1 - last)
+        row, col = row[picked], col[picked]
+        done = np.asarray(done, dtype=object)[picked]
+        comments = np.asarray(comments, dtype=object)[picked]
+
+        done_matrix = np.zeros((len(days), len(keys)), dtype=bool)
+        recorded_matrix = np.zeros((len(days), len(keys)), dtype=bool)
+        recorded = ~pd.isna(done)
+        done_matrix[row, col] = recorded & (done == 1)
+        recorded_matrix[row, col] = recorded
+
+        has_comment = ~pd.isna(comments)
+        order = np.lexsort((row[has_comment], col[has_comment]))
+        texts = [str(text) for text in comments[has_comment][order]]
+        return cls._build(days, keys.tolist(), done_matrix, recorded_matrix,
+                          col[has_comment][order], row[has_comment][order], texts)
+
+    @classmethod
+    def from_frame(cls, df, tasks=None):
+        # التحويل من تخطيط ملف Excel: عمود للتاريخ ثم عمود حالة وعمود تعليق لكل مهمة
+        dates = pd.to_datetime(df[DATE_COLUMN]).to_numpy().astype("datetime64[D]")
+        order = np.argsort(dates, kind="stable")
+        dates = dates[order]
+        task_names = []
+        for column in df.columns:
+            if column == DATE_COLUMN:
+                continue
+            task = column[:-len(COMMENT_SUFFIX)] if column.endswith(COMMENT_SUFFIX) else column
+            if task not in task_names:
+                task_names.append(task)
+        ids_by_name = {task_obj["task"]: task_key(task_obj) for task_obj in tasks or []}
+        task_keys = [ids_by_name.get(task, task) for task in task_names]
+
+        status = df.reindex(columns=task_names).to_numpy(dtype=object)[order]
+        comment_columns = [f"{task}{COMMENT_SUFFIX}" for task in task_names]
+        comment_matrix = df.reindex(columns=comment_columns).to_numpy(dtype=object)[order].T
+        comment_task, comment_row = np.nonzero(~pd.isna(comment_matrix))
+        texts = [str(value) for value in comment_matrix[comment_task, comment_row]]
+        return cls._build(dates, task_keys, status == DONE_MARK, ~pd.isna(status),
+                          comment_task, comment_row, texts)
+
+    def to_frame(self, tasks=None):
+        # التحويل العكسي إلى تخطيط ملف Excel (التاريخ نصي كما يحفظه التطبيق)
+        # الأعمدة بأسماء المهام الحالية وبترتيبها، ثم أي مهام محذوفة بمعرّفها
+        names_by_key = {task_key(task_obj): task_obj["task"] for task_obj in tasks or []}
+        ordered = [key for key in names_by_key if key in self.task_positions]
+        ordered += [key for key in self.task_keys if key not in names_by_key]
+        n_tasks = len(self.task_keys)
+        done = np.unpackbits(self.done_bits, axis=1, count=n_tasks).astype(bool)
+        recorded = np.unpackbits(self.recorded_bits, axis=1, count=n_tasks).astype(bool)
+        comments = np.full((n_tasks, len(self.dates)), np.nan, dtype=object)
+        pool = np.asarray(self.comment_pool, dtype=object)
+        comments[self.comment_task, self.comment_row] = pool[self.comment_id] if len(pool) else []
+        columns = {DATE_COLUMN: pd.Series(self.dates).dt.strftime("%Y-%m-%d").to_numpy(dtype=object)}
+        for key in ordered:
+            k = self.task_positions[key]
+            name = names_by_key.get(key, key)
+            status = np.where(done[:, k], DONE_MARK, NOT_DONE_MARK).astype(object)
+            status[~recorded[:, k]] = np.nan
+            columns[name] = status
+            columns[f"{name}{COMMENT_SUFFIX}"] = comments[k]
+        return pd.DataFrame(columns)
+
+    def row_bounds(self, start=None, end=None):
+        i = 0 if start is None else int(np.searchsorted(self.dates, to_day(start), side="left"))
+        j = len(self.dates) if end is None else int(np.searchsorted(self.dates, to_day(end), side="right"))
+        return i, max(i, j)
+
+    def done_matrix(self, task_keys, i=0, j=None):
+        # مصفوفة منطقية (الأيام × المهام المطلوبة)، المهام غير الموجودة في السجل تعتبر غير منجزة
+        j = len(self.dates) if j is None else j
+        if len(self.task_keys) == 0:
+            return np.zeros((j - i, len(task_keys)), dtype=bool)
+        unpacked = np.unpackbits(self.done_bits[i:j], axis=1, count=len(self.task_keys)).astype(bool)
+        positions = np.array([self.task_positions.get(key, -1) for key in task_keys], dtype=np.int64)
+        missing = positions < 0
+        result = unpacked[:, np.where(missing, 0, positions)]
+        result[:, missing] = False
+        return result
+
+    def counts(self, task_keys, start=None, end=None):
+        i, j = self.row_bounds(start, end)
+        return j - i, self.done_matrix(task_keys, i, j).sum(axis=0)
+
+    def comments(self, task_keys, i=0, j=None):
+        # قائمة تعليقات كل مهمة داخل نطاق الأيام [i, j) بترتيب التاريخ
+        j = len(self.dates) if j is None else j
+        positions = np.array([self.task_positions.get(key, -1) for key in task_keys], dtype=np.int64)
+        base = positions * (len(self.dates) + 1)
+        starts = np.searchsorted(self._comment_keys, base + i, side="left").tolist()
+        ends = np.searchsorted(self._comment_keys, base + j, side="left").tolist()
+        pool = self.comment_pool
+        return [
+            [pool[c] for c in self.comment_id[a:b].tolist()] if position >= 0 else []
+            for position, a, b in zip(positions.tolist(), starts, ends)
+        ]
+
+    def iter_comments(self, task_key, i=0, j=None):
+        # تعليقات مهمة واحدة داخل [i, j) كأزواج (اليوم، النص) بالتتابع دون بناء قائمة
+        j = len(self.dates) if j is None else j
+        position = self.task_positions.get(task_key)
+        if position is None:
+            return
+        base = position * (len(self.dates) + 1)
+        a = int(np.searchsorted(self._comment_keys, base + i, side="left"))
+        b = int(np.searchsorted(self._comment_keys, base + j, side="left"))
+        for k in range(a, b):
+            yield self.dates[self.comment_row[k]], self.comment_pool[self.comment_id[k]]
+
+    def day_record(self, date, tasks):
+        # سجل يوم واحد بتخطيط Excel وبأسماء المهام الحالية، أو None إذا لم يحفظ ذلك اليوم
+        i, j = self.row_bounds(date, date)
+        if i == j:
+            return None
+        n_tasks = len(self.task_keys)
+        done = np.unpackbits(self.done_bits[i], count=n_tasks).astype(bool)
+        recorded = np.unpackbits(self.recorded_bits[i], count=n_tasks).astype(bool)
+        keys = [task_key(task_obj) for task_obj in tasks]
+        record = {}
+        for task_obj, key, comments in zip(tasks, keys, self.comments(keys, i, j)):
+            k = self.task_positions.get(key)
+            if k is not None and recorded[k]:
+                record[task_obj["task"]] = DONE_MARK if done[k] else NOT_DONE_MARK
+            if comments:
+                record[f"{task_obj['task']}{COMMENT_SUFFIX}"] = comments[0]
+        return record
+
+    def digest(self, task_keys, start=None, end=None):
+        # بصمة صفوف الفترة [start, end] للمهام المطلوبة فقط (التواريخ، الإنجاز، التعليقات)
+        # تتغير عند أي حفظ داخل الفترة ولا تتأثر بالأيام أو المهام الأخرى
+        i, j = self.row_bounds(start, end)
+        h = hashlib.sha256()
+        h.update(self.dates[i:j].tobytes())
+        h.update(np.packbits(self.done_matrix(task_keys, i, j), axis=1).tobytes())
+        for task_comments in self.comments(task_keys, i, j):
+            h.update("\x1e".join(task_comments).encode("utf-8") + b"\x1f")
+        return h.hexdigest()
+
+    def memory_usage(self):
+        # الحجم التقريبي بالبايت (المصفوفات + النصوص الفريدة للتعليقات)
+        arrays = (self.dates, self.done_bits, self.recorded_bits,
+                  self.comment_task, self.comment_row, self.comment_id)
+        return sum(a.nbytes for a in arrays) + sum(sys.getsizeof(text) for text in self.comment_pool)
@@ -0,0 +1,100 @@
+import os
+import threading
+
+# الخطوط داخل مجلد البرنامج نفسه، فلا يعتمد توليد التقارير على مجلد التشغيل الحالي
+FONTS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+DEFAULT_FONT_FAMILY = "DejaVu"
+FONT_FILES = {
+    "DejaVu": "DejaVuSans.ttf",
+}
+
+# إصدار fpdf المعتمد (1.7.2): معه فقط تحفظ مقاييس الخط في الذاكرة وتسرَّع قائمة المحارف،
+# ومع أي إصدار آخر يضاف الخط بواجهة fpdf العامة كما هو
+PINNED_FPDF_VERSION = "1.7.2"
+# fpdf تضيف هذه المحارف إلى كل خط (والأرقام أيضاً إذا استخدم رقم الصفحة الكلي)
+BASE_SUBSET_SIZE = 32
+PAGE_ALIAS_SUBSET_SIZE = 57
+
+_lock = threading.Lock()
+# {العائلة: (بيانات الخط، ملفات الخط)} كما تنشئها add_font أول مرة في هذه العملية
+_pdf_fonts = {}
+
+
+def font_path(family=DEFAULT_FONT_FAMILY):
+    return os.path.join(FONTS_FOLDER, FONT_FILES[family])
+
+
+class GlyphSubset(list):
+    # قائمة المحارف المستخدمة في المستند (fpdf تضمّن هذه المحارف فقط من ملف الخط)
+    # بدون تكرار ومع بحث سريع، لأن fpdf تفحص كل محرف في الخط بـ "in"
+    def __init__(self, values=()):
+        super().__init__()
+        self._members = set()
+        for value in values:
+            self.append(value)
+
+    def append(self, value):
+        if value not in self._members:
+            self._members.add(value)
+            super().append(value)
+
+    def __contains__(self, value):
+        return value in self._members
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._members = set(self)
+
+
+# ---------------------------
+# سجل الخطوط: ملفات الخطوط في مجلد البرنامج ومشتركة بين ملفات PDF والرسوم البيانية
+# ---------------------------
+def _load_pdf_font(family):
+    # قراءة مقاييس الخط من ملف TTF مرة واحدة في العملية (بدون ملف pkl بجانب الخط، فمجلد
+    # البرنامج قد يكون للقراءة فقط)
+    import fpdf
+    from fpdf import fpdf as fpdf_module
+    cache_mode = fpdf_module.FPDF_CACHE_MODE
+    fpdf.set_global("FPDF_CACHE_MODE", 1)
+    try:
+        probe = fpdf.FPDF()
+        probe.add_font(family, '', font_path(family), uni=True)
+    finally:
+        fpdf.set_global("FPDF_CACHE_MODE", cache_mode)
+    return probe.fonts[family.lower()], probe.font_files
+
+
+def add_pdf_font(pdf, family=DEFAULT_FONT_FAMILY):
+    import fpdf
+    key = family.lower()
+    if key in pdf.fonts:
+        return
+    if fpdf.__version__ != PINNED_FPDF_VERSION:
+        with _lock:
+            pdf.add_font(family, '', font_path(family), uni=True)
+        return
+    # استثناء مقصود مرتبط بـ fpdf 1.7.2: الكتابة في pdf.fonts و pdf.font_files (حقول داخلية)
+    # بنفس الشكل الذي تكتبه add_font في هذا الإصدار، لأن واجهتها العامة لا تقبل مقاييس محمّلة مسبقاً
+    with _lock:
+        if family not in _pdf_fonts:
+            _pdf_fonts[family] = _load_pdf_font(family)
+    font, font_files = _pdf_fonts[family]
+    base = PAGE_ALIAS_SUBSET_SIZE if hasattr(pdf, "str_alias_nb_pages") else BASE_SUBSET_SIZE
+    # جدول العروض (cw) مشترك للقراءة فقط، وقائمة المحارف جديدة لكل مستند: fpdf 1.7.2 تبحث فيها
+    # مع كل حرف يكتب، و GlyphSubset تجعل البحث سريعاً (أبطأ بأربع مرات لتقرير سنة بدونها)
+    pdf.fonts[key] = dict(font, i=len(pdf.fonts) + 1, subset=GlyphSubset(range(base)))
+    for name, entry in font_files.items():
+        pdf.font_files[name] = dict(entry)
+
+
+_chart_font_name = None
+
+
+def chart_font_name(family=DEFAULT_FONT_FAMILY):
+    # تسجيل الخط في matplotlib مرة واحدة وإرجاع اسمه لاستخدامه في rcParams
+    global _chart_font_name
+    if _chart_font_name is None:
+        from matplotlib import font_manager
+        font_manager.fontManager.addfont(font_path(family))
+        _chart_font_name = font_manager.FontProperties(fname=font_path(family)).get_name()
+    return _chart_font_name
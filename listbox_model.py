@@ -0,0 +1,89 @@
+import bisect
+import tkinter as tk
+
+
+def diff_keys(old_keys, new_keys):
+    # المفاتيح فريدة في كل قائمة، فأطول جزء مشترك بنفس الترتيب هو أطول تسلسل متزايد
+    # لمواقع العناصر القديمة داخل القائمة الجديدة (O(n log n))
+    # يعيد (مواقع الحذف في القائمة القديمة، مواقع الإضافة في القائمة الجديدة، أزواج (قديم، جديد) الباقية)
+    new_positions = {key: index for index, key in enumerate(new_keys)}
+    candidates = [(old_index, new_positions[key]) for old_index, key in enumerate(old_keys) if key in new_positions]
+    tails = []
+    tail_items = []
+    parents = []
+    for item_index, (_, new_index) in enumerate(candidates):
+        slot = bisect.bisect_left(tails, new_index)
+        parents.append(tail_items[slot - 1] if slot else -1)
+        if slot == len(tails):
+            tails.append(new_index)
+            tail_items.append(item_index)
+        else:
+            tails[slot] = new_index
+            tail_items[slot] = item_index
+    kept = []
+    item_index = tail_items[-1] if tail_items else -1
+    while item_index != -1:
+        kept.append(candidates[item_index])
+        item_index = parents[item_index]
+    kept.reverse()
+    kept_old = {old_index for old_index, _ in kept}
+    kept_new = {new_index for _, new_index in kept}
+    deletions = [index for index in range(len(old_keys)) if index not in kept_old]
+    insertions = [index for index in range(len(new_keys)) if index not in kept_new]
+    return deletions, insertions, kept
+
+
+def _runs(indexes):
+    # تجميع المواقع المتتالية في مجالات (أول، آخر) حتى تكون عملية Tk واحدة لكل مجال
+    runs = []
+    for index in indexes:
+        if runs and runs[-1][1] == index - 1:
+            runs[-1][1] = index
+        else:
+            runs.append([index, index])
+    return runs
+
+
+# ---------------------------
+# نموذج لما يعرضه Listbox: التحديث يطبق أقل عدد من عمليات الحذف والإضافة والتلوين
+# بدل حذف كل العناصر وإعادة إدراجها
+# ---------------------------
+class ListboxModel:
+    def __init__(self, listbox):
+        self.listbox = listbox
+        self.items = []
+
+    def update(self, items):
+        # items: [(النص، خيارات itemconfig كقاموس)]؛ النصوص فريدة
+        # العنصر بدون خيارات يأخذ ألوان Listbox نفسه فيتبع تغيير الثيم دون تحديثه
+        new_items = list(items)
+        # البداية والنهاية المتطابقتان لا تدخلان المقارنة (التبديل أو تغيير لون عنصر يلمس الوسط فقط)
+        start = 0
+        limit = min(len(self.items), len(new_items))
+        while start < limit and self.items[start] == new_items[start]:
+            start += 1
+        end = 0
+        while end < limit - start and self.items[-1 - end] == new_items[-1 - end]:
+            end += 1
+        old_items = self.items[start:len(self.items) - end]
+        changed = new_items[start:len(new_items) - end]
+        deletions, insertions, kept = diff_keys([text for text, _ in old_items], [text for text, _ in changed])
+        for first, last in reversed(_runs(deletions)):
+            self.listbox.delete(start + first, start + last)
+        for first, last in _runs(insertions):
+            self.listbox.insert(start + first, *(text for text, _ in changed[first:last + 1]))
+            for index in range(first, last + 1):
+                if changed[index][1]:
+                    self.listbox.itemconfig(start + index, **changed[index][1])
+        for old_index, new_index in kept:
+            options = changed[new_index][1]
+            old_options = old_items[old_index][1]
+            if options != old_options:
+                # الخيار المحذوف يعاد إلى قيمة Listbox نفسه (النص الفارغ في Tk)
+                reset = {key: "" for key in old_options if key not in options}
+                self.listbox.itemconfig(start + new_index, **reset, **options)
+        self.items = new_items
+
+    def clear(self):
+        self.listbox.delete(0, tk.END)
+        self.items = []
@@ -0,0 +1,26 @@
+import os
+import json
+from progress_store import assign_task_ids
+
+# إعداد المسارات والملفات الأساسية (مشتركة بين الواجهة وأدوات سطر الأوامر دون تحميل Tk)
+LISTS_FILE = "lists.json"
+MAIN_FOLDER = "Lists"
+
+
+# ---------------------------
+# دوال المساعدة لتحميل وحفظ القوائم
+# ---------------------------
+def load_lists():
+    if os.path.exists(LISTS_FILE):
+        with open(LISTS_FILE, "r", encoding="utf-8") as f:
+            lists_data = json.load(f)
+        # إضافة معرّف ثابت للمهام القديمة حتى لا يضيع سجلها عند تغيير اسمها
+        if assign_task_ids(lists_data):
+            save_lists(lists_data)
+        return lists_data
+    return {}
+
+
+def save_lists(lists_data):
+    with open(LISTS_FILE, "w", encoding="utf-8") as f:
+        json.dump(lists_data, f, ensure_ascii=False, indent=4)
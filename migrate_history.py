@@ -0,0 +1,25 @@
+import os
+import time
+from lists_store import MAIN_FOLDER, load_lists
+from progress_store import SQLiteProgressStore
+
+# ---------------------------
+# أداة ترحيل لمرة واحدة: تحويل Lists/*/daily_progress.xlsx إلى التخطيط الطويل في SQLite
+# الملفات تقرأ صفاً بصف ولا تحمّل كاملة في الذاكرة
+# ---------------------------
+def migrate_all(lists_data, main_folder=MAIN_FOLDER):
+    results = {}
+    for list_name, tasks in lists_data.items():
+        list_folder = os.path.join(main_folder, list_name)
+        store = SQLiteProgressStore(list_folder)
+        if not store.exists():
+            continue
+        start = time.perf_counter()
+        results[list_name] = store.migrate(tasks)
+        print(f"{list_name}: {results[list_name]} entries ({time.perf_counter() - start:.2f}s)")
+    return results
+
+
+if __name__ == "__main__":
+    # load_lists تضيف المعرّفات الثابتة للمهام القديمة وتحفظ lists.json
+    migrate_all(load_lists())
@@ -0,0 +1,209 @@
+import os
+import datetime
+import threading
+from collections import OrderedDict
+from progress_store import open_progress_store, task_key, year_of
+
+# عدد القوائم التي يحتفظ بسجلها المحلَّل في الذاكرة في نفس الوقت
+MAX_CACHED_LISTS = 8
+
+_folder_locks = {}
+_folder_locks_guard = threading.Lock()
+
+
+def folder_lock(list_folder):
+    # قفل واحد لكل مجلد قائمة يشترك فيه كل مستودع يفتحه، حتى المستودعات المؤقتة
+    # (التقرير المجمع وفهرسة التعليقات) وبعد إزالة المستودع من ذاكرة get_repository
+    path = os.path.abspath(list_folder)
+    with _folder_locks_guard:
+        return _folder_locks.setdefault(path, threading.RLock())
+
+
+# ---------------------------
+# مستودع سجل التقدم لقائمة واحدة مع ذاكرة مؤقتة للبيانات المحللة
+# ---------------------------
+class ProgressRepository:
+    def __init__(self, list_folder, backend=None):
+        self.list_folder = list_folder
+        self.store = open_progress_store(list_folder, backend)
+        self._history = None
+        self._signature = None
+        # أول سنة محمَّلة في الذاكرة (None = السجل كامل)؛ المخزن المقسم يقرأ السنوات المطلوبة فقط
+        self._coverage = None
+        self._index = None
+        self._index_signature = None
+        self._index_coverage = None
+        self._names = None
+        # آخر (سنة، فترة احتفاظ) تمت أرشفتها، فلا يفحص مجلد السجل مع كل حفظ
+        self._compacted = None
+        # التقارير تعمل في خيوط خلفية، فالقفل يحمي الذاكرة المؤقتة والكتابة على المخزن
+        self.lock = folder_lock(list_folder)
+
+    def _current_signature(self):
+        return self.store.signature()
+
+    def signature(self):
+        # توقيع المخزن الحالي (يستخدمه فهرس التعليقات لمعرفة هل فاته تعديل على السجل)
+        with self.lock:
+            return self._current_signature()
+
+    def invalidate(self):
+        self._history = None
+        self._signature = None
+        self._coverage = None
+        self._index = None
+        self._index_signature = None
+        self._index_coverage = None
+
+    def _first_year(self, start):
+        if start is None or not self.store.PARTITIONED:
+            return None
+        return year_of(start)
+
+    def _covers(self, coverage, start):
+        first_year = self._first_year(start)
+        return coverage is None or (first_year is not None and first_year >= coverage)
+
+    def exists(self):
+        return self.store.exists()
+
+    def _check_names(self, tasks):
+        # السجل في SQLite مرتبط بمعرّفات المهام فلا يتأثر بتغيير أسمائها،
+        # أما مخزن Excel القديم فمرتبط بالأسماء فيعاد بناؤه عند تغيّرها
+        if not self.store.KEYED_BY_NAME:
+            return
+        names = tuple(task_obj["task"] for task_obj in tasks)
+        if names != self._names:
+            self.invalidate()
+            self._names = names
+
+    def history(self, tasks, start=None):
+        # يعاد تحليل الملف فقط إذا تغيّر توقيعه (وقت التعديل والحجم) منذ آخر قراءة
+        # أو إذا طلبت فترة تبدأ قبل أول سنة محمَّلة
+        # السجل يحفظ في الذاكرة بتمثيل مضغوط (CompletionHistory) بدل جدول pandas
+        with self.lock:
+            self._check_names(tasks)
+            signature = self._current_signature()
+            if self._history is None or signature != self._signature or not self._covers(self._coverage, start):
+                # numpy/pandas تحمَّل عند أول قراءة للسجل فقط (تسجيل اليوم لا يحتاجها)
+                from completion_history import CompletionHistory
+                first_year = self._first_year(start)
+                self._history = CompletionHistory.from_entries(
+                    *self.store.load_entries(tasks, start=None if first_year is None else f"{first_year}-01-01")
+                )
+                self._coverage = first_year
+                self._signature = signature if signature is not None else self._current_signature()
+            return self._history
+
+    def get_record(self, date_str, tasks):
+        with self.lock:
+            return self.store.get_record(date_str, tasks)
+
+    def load_entries(self, tasks):
+        # كل صفوف السجل كما في المخزن مع توقيعه في نفس اللحظة (لفهرسة التعليقات)
+        # القراءة تحت القفل حتى لا تتزامن مع حفظ أو أرشفة أو استيراد Excel لنفس القائمة
+        with self.lock:
+            return self._current_signature(), self.store.load_entries(tasks)
+
+    def completion_index(self, tasks, start=None):
+        # يبنى الفهرس مرة واحدة ثم يحدَّث تدريجياً مع كل حفظ من هذا التطبيق
+        with self.lock:
+            self._check_names(tasks)
+            signature = self._current_signature()
+            if (self._index is None or signature != self._index_signature
+                    or not self._index.matches(tasks) or not self._covers(self._index_coverage, start)):
+                from report_engine import CompletionIndex
+                self._index = CompletionIndex.from_history(self.history(tasks, start), tasks)
+                self._index_coverage = self._coverage
+                self._index_signature = self._signature
+            return self._index
+
+    def summarize(self, tasks, start=None, end=None):
+        # ملخص التقرير لفترة واحدة (يحمّل سنوات الفترة فقط ويستخدم الفهرس التراكمي)
+        from report_engine import summarize
+        with self.lock:
+            history = self.history(tasks, start)
+            return summarize(history, tasks, start=start, end=end, index=self.completion_index(tasks, start))
+
+    def completion_counts(self, tasks, start=None, end=None):
+        # عدد مرات الإنجاز فقط دون التعليقات (للرسوم البيانية)
+        from report_engine import completion_counts
+        with self.lock:
+            history = self.history(tasks, start)
+            return completion_counts(history, tasks, start=start, end=end, index=self.completion_index(tasks, start))
+
+    def report_rows(self, tasks, start=None, end=None):
+        # صفوف التقرير مع تعليقات تقرأ تدريجياً (لتقارير PDF الطويلة)
+        from report_engine import report_rows
+        with self.lock:
+            history = self.history(tasks, start)
+            return report_rows(history, tasks, start=start, end=end, index=self.completion_index(tasks, start))
+
+    def digest(self, tasks, start=None, end=None):
+        # بصمة صفوف السجل داخل الفترة (تستخدم مفتاحاً لذاكرة التقارير المولَّدة)
+        with self.lock:
+            return self.history(tasks, start).digest([task_key(task_obj) for task_obj in tasks], start, end)
+
+    def save_day(self, date_str, tasks, statuses, comments):
+        with self.lock:
+            index_is_current = (
+                self._index is not None
+                and self._index.matches(tasks)
+                and self._current_signature() == self._index_signature
+                and self._covers(self._index_coverage, date_str)
+            )
+            self.store.save_day(date_str, tasks, statuses, comments)
+            # السجل المحلَّل يعاد تحميله عند الطلب، أما الفهرس فيحدَّث لليوم المحفوظ فقط
+            self._history = None
+            self._signature = None
+            if index_is_current:
+                self._index.update_day(date_str, [bool(statuses.get(task_obj["task"], False)) for task_obj in tasks])
+                self._index_signature = self._current_signature()
+            else:
+                self._index = None
+                self._index_signature = None
+
+    def compact(self, retention_years, today=None):
+        # أرشفة السنوات القديمة لا تغيّر محتوى السجل، فيكفي تحديث التوقيع المحفوظ
+        # تتم مرة واحدة لكل مستودع في السنة (أو عند تغيير فترة الاحتفاظ)
+        today = today or datetime.date.today()
+        with self.lock:
+            if self._compacted == (today.year, retention_years):
+                return []
+            archived = self.store.compact(retention_years, today)
+            self._compacted = (today.year, retention_years)
+            if archived:
+                signature = self._current_signature()
+                if self._history is not None:
+                    self._signature = signature
+                if self._index is not None:
+                    self._index_signature = signature
+            return archived
+
+    def export_excel(self, tasks, path=None):
+        with self.lock:
+            return self.store.export_frame(self.history(tasks).to_frame(tasks), path)
+
+
+_repositories = OrderedDict()
+
+
+def get_repository(list_folder, backend=None):
+    # مستودع واحد لكل قائمة، مع إزالة الأقدم استخداماً عند تجاوز الحد (LRU)
+    key = (os.path.abspath(list_folder), backend)
+    repository = _repositories.get(key)
+    if repository is None:
+        repository = ProgressRepository(list_folder, backend)
+        _repositories[key] = repository
+        while len(_repositories) > MAX_CACHED_LISTS:
+            _repositories.popitem(last=False)
+    else:
+        _repositories.move_to_end(key)
+    return repository
+
+
+def discard_repository(list_folder):
+    # تستدعى عند حذف القائمة أو تغيير اسمها
+    path = os.path.abspath(list_folder)
+    for key in [key for key in _repositories if key[0] == path]:
+        del _repositories[key]
@@ -0,0 +1,510 @@
+import os
+import gzip
+import json
+import uuid
+import shutil
+import pickle
+import hashlib
+import sqlite3
+import datetime
+from abc import ABC, abstractmethod
+from contextlib import closing
+
+# ---------------------------
+# ثوابت تخطيط بيانات التقدم (نفس أعمدة ملف Excel القديم)
+# ---------------------------
+DATE_COLUMN = "التاريخ"
+COMMENT_SUFFIX = "_تعليق"
+DONE_MARK = "✔"
+NOT_DONE_MARK = "✖️"
+
+EXCEL_FILE_NAME = "daily_progress.xlsx"
+# ملفات التصدير باسم مختلف عن ملف Excel القديم حتى لا تستورد كسجل إذا حذف مجلد السجل
+EXPORT_FILE_NAME = "progress_export_{date}.xlsx"
+# السجل مقسم إلى ملف لكل سنة داخل مجلد القائمة، والسنوات القديمة تضغط في أرشيف
+PARTITIONS_FOLDER = "history"
+# مجلد مؤقت لاستيراد ملف Excel، ينقل إلى مجلد السجل بعد اكتمال الاستيراد فقط
+IMPORT_SUFFIX = ".importing"
+PARTITION_SUFFIX = ".sqlite3"
+ARCHIVE_SUFFIX = ".jsonl.gz"
+DEFAULT_RETENTION_YEARS = 2
+IMPORT_BATCH_SIZE = 5000
+SIDECAR_SUFFIX = ".cache.pkl"
+SIDECAR_SCHEMA_VERSION = 1
+DEFAULT_STORAGE_BACKEND = "sqlite"
+
+
+# ---------------------------
+# معرّفات ثابتة للمهام: السجل مرتبط بالمعرّف وليس باسم المهمة
+# ---------------------------
+def new_task_id():
+    return uuid.uuid4().hex
+
+
+def task_key(task_obj):
+    # المهام القديمة بدون معرّف تبقى مرتبطة باسمها
+    return task_obj.get("id") or task_obj["task"]
+
+
+def assign_task_ids(lists_data):
+    # إضافة معرّف لكل مهمة ليس لها معرّف، ويعيد True إذا تغيّرت البيانات
+    changed = False
+    for tasks in lists_data.values():
+        for task_obj in tasks:
+            if not task_obj.get("id"):
+                task_obj["id"] = new_task_id()
+                changed = True
+    return changed
+
+
+def _clean_value(value):
+    # تحويل القيم الفارغة (NaN) القادمة من Excel إلى نص فارغ
+    if value is None:
+        return ""
+    if isinstance(value, float) and value != value:
+        return ""
+    return value
+
+
+def _date_to_str(value):
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+
+def year_of(value):
+    # السنة من Timestamp أو date أو نص "YYYY-MM-DD" دون الحاجة إلى pandas
+    if hasattr(value, "year"):
+        return value.year
+    return int(str(value)[:4])
+
+
+def _stat_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ---------------------------
+# ذاكرة مؤقتة ثنائية بجانب ملف Excel حتى لا يعاد تحليل XML عند كل تشغيل
+# ---------------------------
+def read_excel_cached(excel_file):
+    # الملف المساعد يحفظ الأعمدة كقوائم مع رقم إصدار المخطط وتوقيع الملف الأصلي
+    import pandas as pd
+    sidecar_file = excel_file + SIDECAR_SUFFIX
+    stat = os.stat(excel_file)
+    cached = None
+    if os.path.exists(sidecar_file):
+        try:
+            with open(sidecar_file, "rb") as f:
+                cached = pickle.load(f)
+            if cached.get("version") != SIDECAR_SCHEMA_VERSION:
+                cached = None
+        except Exception:
+            cached = None
+
+    digest = None
+    if cached is not None:
+        if cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            return pd.DataFrame(cached["columns"])
+        # تغيّر وقت التعديل فقط (نسخ أو لمس الملف): المقارنة بالبصمة قبل إعادة التحليل
+        digest = _file_digest(excel_file)
+        if cached["sha256"] == digest:
+            cached["mtime_ns"] = stat.st_mtime_ns
+            cached["size"] = stat.st_size
+            _write_sidecar(sidecar_file, cached)
+            return pd.DataFrame(cached["columns"])
+
+    df = pd.read_excel(excel_file)
+    _write_sidecar(sidecar_file, {
+        "version": SIDECAR_SCHEMA_VERSION,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": digest or _file_digest(excel_file),
+        "columns": {column: df[column].tolist() for column in df.columns},
+    })
+    return df
+
+
+def _write_sidecar(sidecar_file, payload):
+    # الكتابة في ملف مؤقت ثم الاستبدال حتى لا يبقى ملف مساعد تالف
+    tmp_file = sidecar_file + ".tmp"
+    try:
+        with open(tmp_file, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, sidecar_file)
+    except OSError:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+def record_entries(date_str, record, ids_by_name):
+    # تحويل صف بتخطيط Excel العريض إلى صفوف (التاريخ، معرّف المهمة، الإنجاز، التعليق)
+    names = []
+    for column in record:
+        if column == DATE_COLUMN:
+            continue
+        name = column[:-len(COMMENT_SUFFIX)] if column.endswith(COMMENT_SUFFIX) else column
+        if name not in names:
+            names.append(name)
+    for name in names:
+        status = _clean_value(record.get(name))
+        comment = str(_clean_value(record.get(f"{name}{COMMENT_SUFFIX}")))
+        if status == "" and comment.strip() == "":
+            continue
+        done = None if status == "" else int(status == DONE_MARK)
+        yield (date_str, ids_by_name.get(name, name), done, comment)
+
+
+def iter_excel_records(excel_file):
+    # قراءة ملف Excel صفاً بصف (وضع القراءة فقط) دون تحميله كاملاً في الذاكرة
+    from openpyxl import load_workbook
+    workbook = load_workbook(excel_file, read_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header or DATE_COLUMN not in header:
+            return
+        for values in rows:
+            record = dict(zip(header, values))
+            date_value = record.pop(DATE_COLUMN)
+            if date_value is None:
+                continue
+            yield _date_to_str(date_value), record
+    finally:
+        workbook.close()
+
+
+def _entries_to_record(entries, tasks):
+    # تحويل صفوف يوم واحد إلى قاموس بتخطيط Excel (بأسماء المهام الحالية)
+    names_by_id = {task_key(task_obj): task_obj["task"] for task_obj in tasks}
+    record = {}
+    for key, done, comment in entries:
+        name = names_by_id.get(key, key)
+        if done is not None:
+            record[name] = DONE_MARK if done else NOT_DONE_MARK
+        record[f"{name}{COMMENT_SUFFIX}"] = comment or ""
+    return record
+
+
+# ---------------------------
+# الواجهة العامة لمخزن التقدم
+# ---------------------------
+class ProgressStore(ABC):
+    # هل يعتمد تحويل السجل على أسماء المهام الحالية (التخطيط العريض القديم)
+    KEYED_BY_NAME = False
+    # هل يمكن قراءة جزء من السجل فقط حسب الفترة المطلوبة
+    PARTITIONED = False
+
+    def __init__(self, list_folder):
+        self.list_folder = list_folder
+        self.excel_file = os.path.join(list_folder, EXCEL_FILE_NAME)
+
+    @abstractmethod
+    def signature(self):
+        # توقيع يتغير مع أي تعديل على البيانات (يستخدم للتحقق من صلاحية الذاكرة المؤقتة)
+        pass
+
+    @abstractmethod
+    def exists(self):
+        pass
+
+    @abstractmethod
+    def save_day(self, date_str, tasks, statuses, comments):
+        # سجل واحد لكل (يوم، مهمة): إعادة الحفظ تستبدل قيم اليوم نفسه
+        pass
+
+    @abstractmethod
+    def get_record(self, date_str, tasks):
+        pass
+
+    @abstractmethod
+    def load_entries(self, tasks, start=None, end=None):
+        # يعيد أعمدة التخطيط الطويل: (التواريخ، معرّفات المهام، الإنجاز، التعليقات)
+        pass
+
+    def compact(self, retention_years, today=None):
+        return []
+
+    def export_path(self, today=None):
+        today = today or datetime.date.today()
+        return os.path.join(self.list_folder, EXPORT_FILE_NAME.format(date=today.strftime("%Y-%m-%d")))
+
+    def export_frame(self, df, path=None):
+        # Excel أصبح هدفاً للتصدير فقط وليس مسار الكتابة (ولا يكتب فوق daily_progress.xlsx)
+        path = path or self.export_path()
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        df.to_excel(path, index=False)
+        return path
+
+
+ENTRIES_TABLE = (
+    "CREATE TABLE IF NOT EXISTS entries ("
+    "date TEXT NOT NULL, task_id TEXT NOT NULL, done INTEGER, comment TEXT, "
+    "PRIMARY KEY (date, task_id)) WITHOUT ROWID"
+)
+UPSERT_ENTRY = (
+    "INSERT INTO entries (date, task_id, done, comment) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (date, task_id) DO UPDATE SET done = excluded.done, comment = excluded.comment"
+)
+
+
+# ---------------------------
+# المخزن الافتراضي: SQLite بتخطيط طويل (التاريخ، معرّف المهمة، الإنجاز، التعليق)
+# مقسم إلى ملف لكل سنة: history/2025.sqlite3، والسنوات الأقدم من فترة الاحتفاظ
+# تضغط في history/2019.jsonl.gz ويمكن قراءتها عند الطلب
+# ---------------------------
+class SQLiteProgressStore(ProgressStore):
+    PARTITIONED = True
+
+    def __init__(self, list_folder):
+        super().__init__(list_folder)
+        self.partitions_folder = os.path.join(list_folder, PARTITIONS_FOLDER)
+
+    def signature(self):
+        if not os.path.isdir(self.partitions_folder):
+            return None
+        return tuple(sorted(
+            (entry.name, *(_stat_signature(entry.path) or ()))
+            for entry in os.scandir(self.partitions_folder)
+        ))
+
+    def exists(self):
+        return bool(self.partitions()) or os.path.exists(self.excel_file)
+
+    def partitions(self):
+        # {السنة: (النوع، المسار)}؛ النوع "live" لملف SQLite أو "archive" للأرشيف المضغوط
+        result = {}
+        if not os.path.isdir(self.partitions_folder):
+            return result
+        for name in os.listdir(self.partitions_folder):
+            path = os.path.join(self.partitions_folder, name)
+            if name.endswith(PARTITION_SUFFIX) and name[:-len(PARTITION_SUFFIX)].isdigit():
+                result[int(name[:-len(PARTITION_SUFFIX)])] = ("live", path)
+            elif name.endswith(ARCHIVE_SUFFIX) and name[:-len(ARCHIVE_SUFFIX)].isdigit():
+                result.setdefault(int(name[:-len(ARCHIVE_SUFFIX)]), ("archive", path))
+        return result
+
+    def _partition_file(self, year, folder=None):
+        return os.path.join(folder or self.partitions_folder, f"{year}{PARTITION_SUFFIX}")
+
+    def _archive_file(self, year):
+        return os.path.join(self.partitions_folder, f"{year}{ARCHIVE_SUFFIX}")
+
+    def _partition_connect(self, year, folder=None):
+        folder = folder or self.partitions_folder
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        conn = sqlite3.connect(self._partition_file(year, folder))
+        conn.execute(ENTRIES_TABLE)
+        return conn
+
+    def _prepare(self, tasks):
+        # استيراد ملف Excel القديم إلى الأجزاء السنوية مرة واحدة (الملف نفسه لا يحذف)
+        # الكتابة في مجلد مؤقت ينقل إلى مكانه بعد آخر دفعة، فإذا انقطع الاستيراد يعاد من البداية
+        if os.path.exists(self.excel_file) and not os.path.isdir(self.partitions_folder):
+            ids_by_name = {task_obj["task"]: task_key(task_obj) for task_obj in tasks}
+            import_folder = self.partitions_folder + IMPORT_SUFFIX
+            if os.path.isdir(import_folder):
+                shutil.rmtree(import_folder)
+            os.makedirs(import_folder)
+            self._write_entries(import_folder, (
+                entry for date_str, record in iter_excel_records(self.excel_file)
+                for entry in record_entries(date_str, record, ids_by_name)
+            ))
+            os.replace(import_folder, self.partitions_folder)
+
+    def _write_entries(self, folder, entries):
+        # كتابة متدفقة على دفعات لكل سنة دون تحميل كل الصفوف في الذاكرة
+        buffers = {}
+        for entry in entries:
+            year = int(entry[0][:4])
+            buffer = buffers.setdefault(year, [])
+            buffer.append(entry)
+            if len(buffer) >= IMPORT_BATCH_SIZE:
+                self._flush(folder, year, buffer)
+                buffer.clear()
+        for year, buffer in buffers.items():
+            if buffer:
+                self._flush(folder, year, buffer)
+
+    def _flush(self, folder, year, rows):
+        with closing(self._partition_connect(year, folder)) as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", rows)
+
+    def _read_archive(self, path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                yield tuple(json.loads(line))
+
+    def _read_partition(self, kind, path, date_str=None):
+        if kind == "archive":
+            rows = self._read_archive(path)
+            return [row for row in rows if row[0] == date_str] if date_str else list(rows)
+        with closing(sqlite3.connect(path)) as conn:
+            if date_str:
+                return conn.execute(
+                    "SELECT date, task_id, done, comment FROM entries WHERE date = ?", (date_str,)
+                ).fetchall()
+            return conn.execute("SELECT date, task_id, done, comment FROM entries").fetchall()
+
+    def _restore_archive(self, year):
+        # الحفظ في سنة مؤرشفة يعيدها جزءاً حياً أولاً
+        archive_file = self._archive_file(year)
+        if not os.path.exists(archive_file):
+            return
+        with closing(self._partition_connect(year)) as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", self._read_archive(archive_file))
+        os.remove(archive_file)
+
+    def compact(self, retention_years, today=None):
+        # ضغط الأجزاء الأقدم من فترة الاحتفاظ (بالسنوات) في أرشيف gzip وحذف ملف SQLite الخاص بها
+        if not retention_years or retention_years < 1:
+            return []
+        today = today or datetime.date.today()
+        cutoff = today.year - retention_years + 1
+        archived = []
+        for year, (kind, path) in sorted(self.partitions().items()):
+            if kind != "live" or year >= cutoff:
+                continue
+            archive_file = self._archive_file(year)
+            tmp_file = archive_file + ".tmp"
+            with closing(sqlite3.connect(path)) as conn:
+                rows = conn.execute("SELECT date, task_id, done, comment FROM entries ORDER BY date, task_id")
+                with gzip.open(tmp_file, "wt", encoding="utf-8") as f:
+                    for row in rows:
+                        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            os.replace(tmp_file, archive_file)
+            os.remove(path)
+            archived.append(year)
+        return archived
+
+    def _count_partition(self, kind, path):
+        # العد دون تحويل الصفوف: سطر لكل صف في الأرشيف، و COUNT(*) في SQLite
+        if kind == "archive":
+            with gzip.open(path, "rb") as f:
+                return sum(1 for _ in f)
+        with closing(sqlite3.connect(path)) as conn:
+            return conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def migrate(self, tasks):
+        # ترحيل السجل إلى التخطيط الحالي، ويعيد عدد الصفوف المخزنة
+        self._prepare(tasks)
+        return sum(self._count_partition(kind, path) for kind, path in self.partitions().values())
+
+    def save_day(self, date_str, tasks, statuses, comments):
+        self._prepare(tasks)
+        year = int(date_str[:4])
+        self._restore_archive(year)
+        rows = [
+            (date_str, task_key(task_obj), int(bool(statuses.get(task_obj["task"], False))),
+             comments.get(task_obj["task"], ""))
+            for task_obj in tasks
+        ]
+        with closing(self._partition_connect(year)) as conn, conn:
+            conn.executemany(UPSERT_ENTRY, rows)
+
+    def get_record(self, date_str, tasks):
+        if not self.exists():
+            return None
+        self._prepare(tasks)
+        partition = self.partitions().get(int(date_str[:4]))
+        if partition is None:
+            return None
+        entries = [row[1:] for row in self._read_partition(*partition, date_str=date_str)]
+        return _entries_to_record(entries, tasks) if entries else None
+
+    def load_entries(self, tasks, start=None, end=None):
+        # قراءة الأجزاء السنوية التي تتقاطع مع الفترة المطلوبة فقط
+        self._prepare(tasks)
+        first_year = None if start is None else year_of(start)
+        last_year = None if end is None else year_of(end)
+        columns = ([], [], [], [])
+        for year, (kind, path) in sorted(self.partitions().items()):
+            if (first_year is not None and year < first_year) or (last_year is not None and year > last_year):
+                continue
+            for column, values in zip(columns, zip(*self._read_partition(kind, path))):
+                column.extend(values)
+        return columns
+
+
+# ---------------------------
+# المخزن القديم: ملف Excel عريض يعاد كتابته بالكامل عند كل حفظ
+# ---------------------------
+class ExcelProgressStore(ProgressStore):
+    KEYED_BY_NAME = True
+
+    def signature(self):
+        return _stat_signature(self.excel_file)
+
+    def exists(self):
+        return os.path.exists(self.excel_file)
+
+    def save_day(self, date_str, tasks, statuses, comments):
+        import pandas as pd
+        if not os.path.exists(self.list_folder):
+            os.makedirs(self.list_folder)
+        if os.path.exists(self.excel_file):
+            df = read_excel_cached(self.excel_file)
+            df = df[df[DATE_COLUMN].map(_date_to_str) != date_str]
+        else:
+            df = pd.DataFrame()
+        new_row = {DATE_COLUMN: date_str}
+        for task_obj in tasks:
+            task = task_obj["task"]
+            new_row[task] = DONE_MARK if statuses.get(task, False) else NOT_DONE_MARK
+            new_row[f"{task}{COMMENT_SUFFIX}"] = comments.get(task, "")
+        df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
+        df.to_excel(self.excel_file, index=False)
+
+    def get_record(self, date_str, tasks):
+        if not self.exists():
+            return None
+        df = read_excel_cached(self.excel_file)
+        df = df[df[DATE_COLUMN].map(_date_to_str) == date_str]
+        if df.empty:
+            return None
+        row = df.iloc[-1].drop(DATE_COLUMN).to_dict()
+        return {key: _clean_value(value) for key, value in row.items()}
+
+    def load_entries(self, tasks, start=None, end=None):
+        # الملف غير مقسم فيقرأ كاملاً مهما كانت الفترة
+        ids_by_name = {task_obj["task"]: task_key(task_obj) for task_obj in tasks}
+        df = read_excel_cached(self.excel_file)
+        columns = ([], [], [], [])
+        for row in df.to_dict("records"):
+            date_str = _date_to_str(row.pop(DATE_COLUMN))
+            for entry in record_entries(date_str, row, ids_by_name):
+                for column, value in zip(columns, entry):
+                    column.append(value)
+        return columns
+
+    def export_frame(self, df, path=None):
+        if path is None or os.path.abspath(path) == os.path.abspath(self.excel_file):
+            return self.excel_file
+        return super().export_frame(df, path)
+
+
+STORAGE_BACKENDS = {
+    "sqlite": SQLiteProgressStore,
+    "excel": ExcelProgressStore,
+}
+
+
+def open_progress_store(list_folder, backend=None):
+    backend = backend or DEFAULT_STORAGE_BACKEND
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend}")
+    return STORAGE_BACKENDS[backend](list_folder)
@@ -0,0 +1,70 @@
+import os
+import json
+import hashlib
+import threading
+
+# ملف فهرس التقارير المولَّدة داخل مجلد كل قائمة
+REPORT_CACHE_FILE = ".report_cache.json"
+# يزاد عند تغيير شكل التقارير حتى يعاد توليد كل الملفات القديمة
+REPORT_CACHE_VERSION = 3
+
+_lock = threading.Lock()
+
+
+def report_digest(period, start, end, title, tasks, history_digest):
+    # المفتاح: نوع التقرير + الفترة + العنوان + تعريف المهام (بالترتيب) + بصمة صفوف السجل
+    payload = {
+        "version": REPORT_CACHE_VERSION,
+        "period": period,
+        "start": None if start is None else str(start),
+        "end": None if end is None else str(end),
+        "title": title,
+        "tasks": [[task_obj.get("id"), task_obj["task"], task_obj.get("priority")] for task_obj in tasks],
+        "history": history_digest,
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+# ---------------------------
+# ذاكرة التقارير: لكل ملف تقرير بصمة المدخلات التي ولّدته
+# ---------------------------
+class ReportCache:
+    def __init__(self, list_folder):
+        self.list_folder = list_folder
+        self.cache_file = os.path.join(list_folder, REPORT_CACHE_FILE)
+
+    def _key(self, path):
+        return os.path.relpath(path, self.list_folder).replace(os.sep, "/")
+
+    def _load(self):
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def lookup(self, path, digest):
+        # يعيد True إذا كان الملف موجوداً ولم يعدَّل منذ توليده بنفس المدخلات
+        entry = self._load().get(self._key(path))
+        return (
+            entry is not None
+            and entry.get("digest") == digest
+            and entry.get("file") == _file_signature(path)
+        )
+
+    def store(self, path, digest):
+        with _lock:
+            entries = self._load()
+            entries[self._key(path)] = {"digest": digest, "file": _file_signature(path)}
+            tmp_file = f"{self.cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False, indent=4)
+            os.replace(tmp_file, self.cache_file)
@@ -0,0 +1,61 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from completion_chart import CompletionChart
+
+# نوافذ الرسم المفتوحة لكل (قائمة، فترة) حتى يعاد استخدامها بدل إنشاء نافذة ورسم جديدين
+_chart_windows = {}
+
+
+# ---------------------------
+# نافذة التقرير التفاعلي
+# ---------------------------
+class CompletionChartWindow(tk.Toplevel):
+    def __init__(self, master, key=None):
+        super().__init__(master)
+        self.title("التقرير التفاعلي")
+        self.key = key
+        self.chart = CompletionChart()
+        self.canvas = FigureCanvasTkAgg(self.chart.figure, master=self)
+        tk.Button(self, text="حفظ كصورة", command=self.export_chart).pack(side="bottom", pady=5)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        # الإغلاق المباشر أو إغلاق النافذة الأم كلاهما يمر عبر <Destroy>
+        self.bind("<Destroy>", self._on_destroy)
+
+    def show_report(self, report):
+        if self.chart.set_report(report):
+            self.canvas.draw_idle()
+        self.deiconify()
+        self.lift()
+
+    def export_chart(self):
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension=".png",
+            filetypes=[("PNG", "*.png"), ("SVG", "*.svg")],
+        )
+        if not path:
+            return
+        try:
+            self.chart.save(path)
+            messagebox.showinfo("تصدير", f"تم حفظ الرسم في:\n{path}", parent=self)
+        except Exception as e:
+            messagebox.showerror("خطأ", f"حدث خطأ أثناء حفظ الرسم:\n{e}", parent=self)
+
+    def _on_destroy(self, event):
+        if event.widget is not self:
+            return
+        if _chart_windows.get(self.key) is self:
+            del _chart_windows[self.key]
+        self.chart.close()
+
+
+def show_completion_chart(master, report, key=None):
+    # key = (القائمة، الفترة): نفس المفتاح يحدّث النافذة المفتوحة بدل فتح نافذة جديدة
+    window = _chart_windows.get(key) if key is not None else None
+    if window is None or not window.winfo_exists():
+        window = CompletionChartWindow(master, key)
+        if key is not None:
+            _chart_windows[key] = window
+    window.show_report(report)
+    return window
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+from progress_store import task_key
+from completion_history import to_day
+
+COMMENTS_SEPARATOR = "; "
+# الفترات المتحركة بالأيام (تنتهي باليوم الحالي)
+ROLLING_PERIODS = {"rolling30": 30, "rolling90": 90, "rolling365": 365}
+
+
+# ---------------------------
+# تحديد بداية فترة التقرير
+# ---------------------------
+def period_start(period, today=None):
+    today = today if today is not None else pd.Timestamp.today().normalize()
+    if period == "weekly":
+        return today - pd.Timedelta(days=today.weekday())
+    if period == "monthly":
+        return today.replace(day=1)
+    if period == "ytd":
+        return today.replace(month=1, day=1)
+    if period in ROLLING_PERIODS:
+        return today - pd.Timedelta(days=ROLLING_PERIODS[period] - 1)
+    # تقرير PDF والتقرير التفاعلي يغطيان آخر 7 أيام
+    return today - pd.Timedelta(days=7)
+
+
+# ---------------------------
+# فهرس المجاميع التراكمية: عدد مرات الإنجاز لأي فترة بعمليتي بحث فقط
+# ---------------------------
+class CompletionIndex:
+    def __init__(self, task_keys, dates, done):
+        # الصف i من المصفوفة التراكمية = مجموع الإنجازات في الأيام [0, i)
+        self.task_keys = tuple(task_keys)
+        self.size = len(dates)
+        capacity = max(16, self.size * 2)
+        self._dates = np.empty(capacity, dtype="datetime64[D]")
+        self._dates[:self.size] = dates
+        self._cumulative = np.zeros((capacity + 1, len(self.task_keys)), dtype=np.int32)
+        np.cumsum(done, axis=0, out=self._cumulative[1:self.size + 1])
+
+    @classmethod
+    def from_history(cls, history, tasks):
+        task_keys = [task_key(task_obj) for task_obj in tasks]
+        return cls(task_keys, history.dates, history.done_matrix(task_keys))
+
+    def matches(self, tasks):
+        return self.task_keys == tuple(task_key(task_obj) for task_obj in tasks)
+
+    def counts(self, start=None, end=None):
+        dates = self._dates[:self.size]
+        i = 0 if start is None else int(np.searchsorted(dates, to_day(start), side="left"))
+        j = self.size if end is None else int(np.searchsorted(dates, to_day(end), side="right"))
+        j = max(i, j)
+        return j - i, self._cumulative[j] - self._cumulative[i]
+
+    def _grow(self):
+        capacity = len(self._dates) * 2
+        dates = np.empty(capacity, dtype="datetime64[D]")
+        dates[:self.size] = self._dates[:self.size]
+        cumulative = np.zeros((capacity + 1, len(self.task_keys)), dtype=np.int32)
+        cumulative[:self.size + 1] = self._cumulative[:self.size + 1]
+        self._dates, self._cumulative = dates, cumulative
+
+    def update_day(self, date, done):
+        # تحديث يوم واحد: O(1) لليوم الأخير (الحالة المعتادة عند الحفظ)
+        # و O(الأيام اللاحقة) فقط عند تعديل يوم سابق
+        day = to_day(date)
+        done = np.asarray(done, dtype=np.int32)
+        n = self.size
+        pos = int(np.searchsorted(self._dates[:n], day, side="left"))
+        if pos < n and self._dates[pos] == day:
+            delta = done - (self._cumulative[pos + 1] - self._cumulative[pos])
+            self._cumulative[pos + 1:n + 1] += delta
+            return
+        if n + 1 >= len(self._dates):
+            self._grow()
+        self._dates[pos + 1:n + 1] = self._dates[pos:n].copy()
+        self._dates[pos] = day
+        self._cumulative[pos + 2:n + 2] = self._cumulative[pos + 1:n + 1] + done
+        self._cumulative[pos + 1] = self._cumulative[pos] + done
+        self.size = n + 1
+
+
+# ---------------------------
+# تجميع ملخص التقرير لكل المهام في تمريرة واحدة
+# ---------------------------
+def completion_counts(history, tasks, start=None, end=None, index=None):
+    # يعيد (عدد الأيام، قائمة عدد مرات إنجاز كل مهمة بترتيب tasks)
+    # history من نوع CompletionHistory (مرتب حسب التاريخ بسجل واحد لكل يوم)
+    if index is not None and index.matches(tasks):
+        days, counts = index.counts(start, end)
+    else:
+        i, j = history.row_bounds(start, end)
+        days = j - i
+        counts = history.done_matrix([task_key(task_obj) for task_obj in tasks], i, j).sum(axis=0)
+    return days, counts.tolist()
+
+
+def summarize(history, tasks, start=None, end=None, index=None):
+    # يعيد {"days": عدد الأيام, "tasks": {المهمة: {"count", "rate", "comments"}}}
+    task_keys = [task_key(task_obj) for task_obj in tasks]
+    i, j = history.row_bounds(start, end)
+    days, counts = completion_counts(history, tasks, start, end, index)
+    comments = history.comments(task_keys, i, j)
+
+    summary = {}
+    for task_obj, count, task_comments in zip(tasks, counts, comments):
+        summary[task_obj["task"]] = {
+            "count": count,
+            "rate": count / days if days else 0.0,
+            "comments": COMMENTS_SEPARATOR.join(task_comments),
+        }
+    return {"days": days, "tasks": summary}
+
+
+def report_rows(history, tasks, start=None, end=None, index=None):
+    # مثل summarize لكن التعليقات تقرأ عند الطلب (مولد لكل مهمة) بدل دمجها في نص واحد
+    # يعيد (عدد الأيام، مولد صفوف (المهمة، العدد، النسبة، مولد (اليوم، التعليق)))
+    task_keys = [task_key(task_obj) for task_obj in tasks]
+    i, j = history.row_bounds(start, end)
+    # العدد يحسب الآن لأن الفهرس قد يحدَّث بعد ذلك، أما السجل نفسه فلا يتغير
+    days, counts = completion_counts(history, tasks, start, end, index)
+
+    def rows():
+        for task_obj, key, count in zip(tasks, task_keys, counts):
+            yield task_obj["task"], count, count / days if days else 0.0, history.iter_comments(key, i, j)
+    return days, rows()
@@ -0,0 +1,141 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# عدد التقارير التي يمكن توليدها في نفس الوقت (من قوائم مختلفة أو من نفس القائمة)
+MAX_REPORT_WORKERS = 4
+# الفاصل الزمني لقراءة نتائج الخيوط الخلفية من داخل حلقة Tk
+POLL_INTERVAL_MS = 100
+
+
+class ReportCancelled(Exception):
+    pass
+
+
+# ---------------------------
+# مهمة تقرير واحدة تعمل في الخلفية
+# ---------------------------
+class ReportJob:
+    def __init__(self, job_id, title, events, on_done=None, on_error=None):
+        self.job_id = job_id
+        self.title = title
+        self.progress = (0, 0)
+        self.future = None
+        self.on_done = on_done
+        self.on_error = on_error
+        self._events = events
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        # المهمة المنتظرة تلغى فوراً، والجارية تتوقف عند أول فحص للإلغاء أو تحديث للتقدم
+        self._cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            self._events.put(("cancelled", self.job_id, None))
+
+    def check_cancelled(self):
+        # فحص الإلغاء بين مراحل العمل دون إرسال حدث تقدم
+        if self.cancelled:
+            raise ReportCancelled()
+
+    def report_progress(self, done, total):
+        # تستدعى من الخيط الخلفي فقط؛ لا يتم لمس عناصر Tk هنا
+        self.check_cancelled()
+        self._events.put(("progress", self.job_id, (done, total)))
+
+
+# ---------------------------
+# مدير مهام التقارير: مجموعة خيوط + طابور نتائج يقرأ عبر after()
+# ---------------------------
+class ReportJobManager:
+    def __init__(self, root, max_workers=MAX_REPORT_WORKERS):
+        self.root = root
+        self.jobs = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report")
+        self._events = queue.Queue()
+        self._listeners = []
+        self._next_id = 0
+        self._polling = False
+
+    def submit(self, title, func, on_done=None, on_error=None):
+        # func(job) تعمل في خيط خلفي وتستخدم job.report_progress و job.check_cancelled،
+        # و on_done / on_error تستدعيان في خيط Tk
+        self._next_id += 1
+        job = ReportJob(self._next_id, title, self._events, on_done, on_error)
+        self.jobs[job.job_id] = job
+        job.future = self._executor.submit(self._run, job, func)
+        self._notify()
+        self._schedule_poll()
+        return job
+
+    def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is not None:
+            job.cancel()
+
+    def cancel_all(self):
+        for job in list(self.jobs.values()):
+            job.cancel()
+
+    def shutdown(self):
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self):
+        for callback in list(self._listeners):
+            callback()
+
+    def _run(self, job, func):
+        if job.cancelled:
+            self._events.put(("cancelled", job.job_id, None))
+            return
+        try:
+            result = func(job)
+        except ReportCancelled:
+            self._events.put(("cancelled", job.job_id, None))
+        except Exception as e:
+            self._events.put(("error", job.job_id, e))
+        else:
+            # الإلغاء بعد آخر فحص يمنع أيضاً استدعاء on_done
+            self._events.put(("cancelled" if job.cancelled else "done", job.job_id, result))
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        changed = False
+        while True:
+            try:
+                kind, job_id, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            job = self.jobs.get(job_id)
+            if job is None:
+                continue
+            changed = True
+            if kind == "progress":
+                job.progress = payload
+                continue
+            del self.jobs[job_id]
+            if kind == "done" and job.on_done is not None and not job.cancelled:
+                job.on_done(payload)
+            elif kind == "error" and job.on_error is not None:
+                job.on_error(payload)
+        if changed:
+            self._notify()
+        if self.jobs:
+            self.root.after(POLL_INTERVAL_MS, self._poll)
+        else:
+            self._polling = False
@@ -0,0 +1,188 @@
+import os
+import functools
+from fpdf import FPDF
+from arabic_text import reshape_arabic_text
+from font_registry import add_pdf_font
+
+FONT_FAMILY = "DejaVu"
+PAGE_MARGIN = 10
+LINE_HEIGHT = 6
+TITLE_SIZE = 14
+HEADING_SIZE = 12
+TABLE_SIZE = 9
+HEADER_FILL = (220, 230, 241)
+# عرض الرسم البياني في الصفحة الأولى بالملم (الارتفاع بنسبة الصورة 6x4)
+CHART_WIDTH = 150
+CHART_RATIO = 4 / 6
+# أعمدة الجدول من اليمين إلى اليسار: (العنوان، العرض بالملم)
+TABLE_COLUMNS = (("المهمة", 45), ("عدد المرات", 20), ("النسبة", 17), ("التعليقات", 108))
+# عدد الكلمات المحفوظ عرضها؛ الذاكرة لا تزيد مع طول الفترة
+WIDTH_CACHE_SIZE = 8192
+
+
+# ---------------------------
+# محرك تقارير PDF: جدول من اليمين إلى اليسار مع التفاف النص وتقسيم الصفحات
+# الصفوف والتعليقات تقرأ من مولدات فلا يبنى نص التعليقات الكامل في الذاكرة
+# ---------------------------
+class PdfTableReport:
+    def __init__(self, title):
+        self.pdf = FPDF(format="A4")
+        self.pdf.set_margins(PAGE_MARGIN, PAGE_MARGIN, PAGE_MARGIN)
+        # تقسيم الصفحات يتم يدوياً حتى يعاد رأس الجدول في كل صفحة جديدة
+        self.pdf.set_auto_page_break(False)
+        add_pdf_font(self.pdf, FONT_FAMILY)
+        self.right = self.pdf.w - PAGE_MARGIN
+        self.bottom = self.pdf.h - PAGE_MARGIN
+        self.pdf.add_page()
+        self.pdf.set_font(FONT_FAMILY, '', TITLE_SIZE)
+        self.pdf.cell(0, 10, txt=reshape_arabic_text(title), ln=True, align="C")
+        self.pdf.ln(4)
+        # الكلمات العربية تتصل حروفها داخل الكلمة فقط، فعرض السطر = مجموع عرض كلماته بعد التشكيل
+        self._text_width = functools.lru_cache(maxsize=WIDTH_CACHE_SIZE)(self._measure)
+
+    def _measure(self, text):
+        return self.pdf.get_string_width(reshape_arabic_text(text))
+
+    def _split_point(self, word, start, width):
+        # نهاية أطول جزء من الكلمة يبدأ عند start ويتسع للعمود: مجموع عرض الحروف في مرور واحد،
+        # ثم تصحيح بنسبة عرض الجزء بعد التشكيل (الحروف المتصلة أضيق من المنفصلة) وخطوات قليلة حول الحد
+        # كل قياس بطول سطر واحد تقريباً، فلا يزيد وقت السطر مع طول الكلمة
+        total = 0.0
+        end = start
+        for index in range(start, len(word)):
+            total += self._text_width(word[index])
+            if total > width:
+                break
+            end += 1
+        end = max(end, start + 1)
+        measured = self._measure(word[start:end])
+        if measured > 0 and end < len(word):
+            end = max(start + 1, min(len(word), start + int((end - start) * width / measured)))
+        while end > start + 1 and self._measure(word[start:end]) > width:
+            end -= 1
+        while end < len(word) and self._measure(word[start:end + 1]) <= width:
+            end += 1
+        return end
+
+    def wrap(self, text, width):
+        # يقسم النص المنطقي إلى أسطر تتسع للعمود؛ كل سطر يشكَّل وحده عند الرسم
+        width -= 2
+        space = self._text_width(" ")
+        line = []
+        line_width = 0.0
+        for word in str(text).split():
+            word_width = self._text_width(word)
+            if word_width > width and len(word) > 1:
+                # كلمة أطول من العمود: تقسم على الحروف، والجزء الأخير يكمل السطر التالي
+                if line:
+                    yield " ".join(line)
+                    line, line_width = [], 0.0
+                start = 0
+                end = self._split_point(word, start, width)
+                while end < len(word):
+                    yield word[start:end]
+                    start = end
+                    end = self._split_point(word, start, width)
+                word = word[start:]
+                word_width = self._text_width(word)
+            if line and line_width + space + word_width > width:
+                yield " ".join(line)
+                line, line_width = [], 0.0
+            line_width += (space if line else 0.0) + word_width
+            line.append(word)
+        if line:
+            yield " ".join(line)
+
+    def _header(self):
+        self.pdf.set_font(FONT_FAMILY, '', TABLE_SIZE)
+        self.pdf.set_fill_color(*HEADER_FILL)
+        x = self.right
+        y = self.pdf.get_y()
+        for label, width in TABLE_COLUMNS:
+            x -= width
+            self.pdf.set_xy(x, y)
+            self.pdf.cell(width, LINE_HEIGHT, txt=reshape_arabic_text(label), border=1, align="C", fill=True)
+        self.pdf.set_xy(PAGE_MARGIN, y + LINE_HEIGHT)
+
+    def _new_page(self):
+        self.pdf.add_page()
+        self._header()
+
+    def image(self, path):
+        height = CHART_WIDTH * CHART_RATIO
+        if self.pdf.get_y() + height > self.bottom:
+            self.pdf.add_page()
+        y = self.pdf.get_y()
+        self.pdf.image(path, x=(self.pdf.w - CHART_WIDTH) / 2, y=y, w=CHART_WIDTH, h=height)
+        self.pdf.set_xy(PAGE_MARGIN, y + height + 4)
+
+    def heading(self, text):
+        if self.pdf.get_y() + 3 * LINE_HEIGHT > self.bottom:
+            self.pdf.add_page()
+        self.pdf.set_font(FONT_FAMILY, '', HEADING_SIZE)
+        self.pdf.cell(0, 8, txt=reshape_arabic_text(text), ln=True, align="R")
+
+    def row(self, cells):
+        # cells: مولد أسطر لكل عمود بترتيب TABLE_COLUMNS؛ الصف قد يمتد على أكثر من صفحة
+        self.pdf.set_font(FONT_FAMILY, '', TABLE_SIZE)
+        lines = [iter(cell) for cell in cells]
+        current = [next(it, None) for it in lines]
+        first = True
+        while first or any(text is not None for text in current):
+            if self.pdf.get_y() + LINE_HEIGHT > self.bottom:
+                self.pdf.line(self.right - sum(w for _, w in TABLE_COLUMNS), self.pdf.get_y(), self.right, self.pdf.get_y())
+                self._new_page()
+                self.pdf.set_font(FONT_FAMILY, '', TABLE_SIZE)
+            x = self.right
+            y = self.pdf.get_y()
+            for (_, width), text in zip(TABLE_COLUMNS, current):
+                x -= width
+                self.pdf.set_xy(x, y)
+                self.pdf.cell(width, LINE_HEIGHT, txt=reshape_arabic_text(text) if text else "",
+                              border="LRT" if first else "LR", align="R")
+            self.pdf.set_xy(PAGE_MARGIN, y + LINE_HEIGHT)
+            current = [next(it, None) for it in lines]
+            first = False
+        y = self.pdf.get_y()
+        self.pdf.line(self.right - sum(w for _, w in TABLE_COLUMNS), y, self.right, y)
+
+    def _comment_lines(self, comments, width):
+        for day, text in comments:
+            yield from self.wrap(f"{str(day)}: {text}", width)
+
+    def table(self, rows, progress=None, total=None):
+        # rows: (المهمة، العدد، النسبة، مولد (اليوم، التعليق)) كما يعيدها report_rows
+        if self.pdf.get_y() + 2 * LINE_HEIGHT > self.bottom:
+            self.pdf.add_page()
+        self._header()
+        widths = [width for _, width in TABLE_COLUMNS]
+        for done, (task, count, rate, comments) in enumerate(rows, 1):
+            self.row((
+                self.wrap(task, widths[0]),
+                [str(count)],
+                [f"{rate:.0%}"],
+                self._comment_lines(comments, widths[3]),
+            ))
+            if progress is not None:
+                progress(done, total or done)
+        self.pdf.ln(4)
+
+    def save(self, path):
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self.pdf.output(path)
+        return path
+
+
+def write_pdf_report(path, title, sections, progress=None, chart=None):
+    # sections: مولد (عنوان فرعي، عدد المهام، الصفوف)؛ قسم لكل قائمة في التقرير المجمع
+    # chart: مسار صورة PNG للرسم البياني تحت العنوان
+    report = PdfTableReport(title)
+    if chart is not None:
+        report.image(chart)
+    for heading, total, rows in sections:
+        if heading:
+            report.heading(heading)
+        report.table(rows, progress, total)
+    return report.save(path)
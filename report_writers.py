@@ -0,0 +1,116 @@
+import os
+import re
+from xml.sax.saxutils import escape
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+
+# مجلدات التقارير داخل مجلد كل قائمة
+REPORT_FOLDERS = {"weekly": "Weekly_Reports", "monthly": "Monthly_Reports", "custom": "Custom_Reports"}
+PDF_FOLDER = "PDF_Reports"
+CHARTS_FOLDER = "Charts"
+# عرض الرسم البياني داخل تقرير Word
+DOCX_CHART_WIDTH_INCHES = 6
+# عدد صفوف الجدول التي تبنى كنص XML ثم تحلل دفعة واحدة
+DOCX_ROWS_CHUNK = 500
+_RUN_BREAKS = re.compile(r"(\t|\r|\n)")
+
+
+def _ensure_folder(path):
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+
+
+def _report_progress(progress, done, total):
+    # progress(done, total) تستدعى بعد كل مهمة، ويمكنها رفع استثناء لإلغاء الكتابة
+    if progress is not None:
+        progress(done, total)
+
+
+# ---------------------------
+# مسارات ملفات التقارير
+# ---------------------------
+def word_report_path(list_folder, period, today, start=None, end=None):
+    report_date = today.strftime("%Y-%m-%d")
+    if period == "custom":
+        report_date = f"{start.strftime('%Y-%m-%d')}_{(end or today).strftime('%Y-%m-%d')}"
+    folder_name = REPORT_FOLDERS.get(period, REPORT_FOLDERS["custom"])
+    return os.path.join(list_folder, folder_name, f"{period}_report_{report_date}.docx")
+
+
+def pdf_report_path(list_folder, today, start=None, end=None):
+    report_date = today.strftime("%Y-%m-%d")
+    if start is not None:
+        report_date = f"{start.strftime('%Y-%m-%d')}_{(end or today).strftime('%Y-%m-%d')}"
+    return os.path.join(list_folder, PDF_FOLDER, f"pdf_report_{report_date}.pdf")
+
+
+def chart_path(list_folder, period, today, start=None, end=None, fmt="png"):
+    report_date = today.strftime("%Y-%m-%d")
+    if start is not None:
+        report_date = f"{start.strftime('%Y-%m-%d')}_{(end or today).strftime('%Y-%m-%d')}"
+    return os.path.join(list_folder, CHARTS_FOLDER, f"{period}_chart_{report_date}.{fmt}")
+
+
+# ---------------------------
+# صفوف جدول Word كنص XML
+# table.add_row().cells يمر على كل الجدول في كل استدعاء فيصبح البطء تربيعياً مع عدد الصفوف،
+# لذلك تبنى الصفوف نصاً بنفس العناصر التي تنتجها python-docx وتضاف للجدول دفعة واحدة
+# ---------------------------
+def _run_xml(text):
+    # مثل Run.text في python-docx: \t -> <w:tab/> و \n أو \r -> <w:br/>
+    parts = []
+    for piece in _RUN_BREAKS.split(text):
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece in ("\r", "\n"):
+            parts.append("<w:br/>")
+        elif piece:
+            space = ' xml:space="preserve"' if piece.strip() != piece else ""
+            parts.append(f"<w:t{space}>{escape(piece)}</w:t>")
+    return f"<w:r>{''.join(parts)}</w:r>" if parts else "<w:r/>"
+
+
+def _row_xml(cells, widths):
+    return "<w:tr>" + "".join(
+        f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr><w:p>{_run_xml(text)}</w:p></w:tc>'
+        for text, width in zip(cells, widths)
+    ) + "</w:tr>"
+
+
+def _append_rows(table, rows):
+    fragment = parse_xml(f"<w:tbl {nsdecls('w')}>{''.join(rows)}</w:tbl>")
+    table._tbl.extend(list(fragment))
+
+
+# ---------------------------
+# كتابة التقارير (لا تعتمد على Tk فيمكن تشغيلها في خيط أو عملية خلفية)
+# ---------------------------
+def write_word_report(path, title, tasks, report, progress=None, chart=None):
+    # chart: مسار صورة PNG للرسم البياني تضاف قبل الجدول
+    summary = report["tasks"]
+    document = Document()
+    document.add_heading(title, 0)
+    if chart is not None:
+        from docx.shared import Inches
+        document.add_picture(chart, width=Inches(DOCX_CHART_WIDTH_INCHES))
+    table = document.add_table(rows=1, cols=3)
+    hdr_cells = table.rows[0].cells
+    hdr_cells[0].text = "المهمة"
+    hdr_cells[1].text = "عدد مرات القيام"
+    hdr_cells[2].text = "التعليقات"
+    widths = [grid_col.get(qn("w:w")) for grid_col in table._tbl.tblGrid.gridCol_lst]
+    rows = []
+    for done, task_obj in enumerate(tasks, 1):
+        task = task_obj["task"]
+        rows.append(_row_xml((task, str(summary[task]["count"]), summary[task]["comments"]), widths))
+        if len(rows) == DOCX_ROWS_CHUNK:
+            _append_rows(table, rows)
+            rows = []
+        _report_progress(progress, done, len(tasks))
+    if rows:
+        _append_rows(table, rows)
+    _ensure_folder(path)
+    document.save(path)
+    return path
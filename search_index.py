@@ -0,0 +1,103 @@
+import bisect
+
+# فاصل الأسطر داخل المخزن المجمّع (لا يمكن كتابته في خانة البحث، فلا يمتد تطابق عبر قائمتين)
+LINE_SEPARATOR = "\n"
+# فاصل النصوص داخل سطر القائمة الواحدة (حتى لا يتطابق البحث مع نهاية مهمة وبداية التالية)
+TEXT_SEPARATOR = "\t"
+# الفاصلان داخل اسم قائمة أو مهمة يفهرسان كمسافة
+_SEPARATORS = str.maketrans({LINE_SEPARATOR: " ", TEXT_SEPARATOR: " "})
+# عند إضافة حرف للبحث السابق تفحص نتائجه فقط بدل المخزن كاملاً إذا كانت أقل من هذا العدد
+NARROW_LIMIT = 2000
+# بعد هذا العدد من التطابقات يفحص كل سطر متبقٍ مباشرة (أسرع من القفز بين التطابقات المتقاربة)
+DENSE_MATCHES = 256
+
+
+# ---------------------------
+# فهرس البحث في أسماء القوائم ومهامها
+# لكل قائمة سطر واحد بأحرف صغيرة (الاسم ثم المهام)، والأسطر مجمّعة في مخزن واحد
+# يبحث فيه بـ str.find، ثم يقفز البحث إلى السطر التالي بعد أول تطابق في كل قائمة
+# ---------------------------
+class ListSearchIndex:
+    def __init__(self, lists_data=None):
+        self._lines = {}
+        self._buffer = None
+        self._names = []
+        self._line_list = []
+        self._offsets = []
+        self._last_query = None
+        self._last_names = None
+        for list_name, tasks in (lists_data or {}).items():
+            self.set_list(list_name, tasks)
+
+    def set_list(self, list_name, tasks):
+        # إنشاء قائمة أو تعديل مهامها
+        texts = [list_name]
+        texts.extend(task_obj["task"] for task_obj in tasks)
+        self._lines[list_name] = TEXT_SEPARATOR.join(text.translate(_SEPARATORS) for text in texts).lower()
+        self._invalidate()
+
+    def remove_list(self, list_name):
+        if self._lines.pop(list_name, None) is not None:
+            self._invalidate()
+
+    def rename_list(self, old_name, new_name, tasks):
+        self.remove_list(old_name)
+        self.set_list(new_name, tasks)
+
+    def _invalidate(self):
+        self._buffer = None
+        self._last_query = None
+        self._last_names = None
+
+    def _build(self):
+        self._names = list(self._lines)
+        self._line_list = list(self._lines.values())
+        self._offsets = []
+        position = 0
+        for line in self._lines.values():
+            self._offsets.append(position)
+            position += len(line) + len(LINE_SEPARATOR)
+        self._buffer = LINE_SEPARATOR.join(self._lines.values())
+
+    def _matching_names(self, query):
+        if (
+            self._last_query is not None
+            and query.startswith(self._last_query)
+            and len(self._last_names) < NARROW_LIMIT
+        ):
+            # البحث يضيق مع كل حرف: النتيجة جزء من نتيجة البحث السابق
+            return [name for name in self._last_names if query in self._lines[name]]
+        if self._buffer is None:
+            self._build()
+        # الحلقة تمر مرة واحدة على الأكثر لكل قائمة مطابقة (دوال محلية لأنها أسخن جزء في البحث)
+        names = []
+        append = names.append
+        find = self._buffer.find
+        bisect_right = bisect.bisect_right
+        all_names = self._names
+        offsets = self._offsets
+        last = len(offsets) - 1
+        position = find(query)
+        while position != -1:
+            index = bisect_right(offsets, position) - 1
+            append(all_names[index])
+            if index == last:
+                break
+            if len(names) == DENSE_MATCHES:
+                lines = self._line_list
+                names.extend([all_names[k] for k in range(index + 1, last + 1) if query in lines[k]])
+                break
+            position = find(query, offsets[index + 1])
+        return names
+
+    def search(self, query):
+        # يعيد مجموعة أسماء القوائم المطابقة، أو None إذا كان البحث فارغاً (كل القوائم)
+        query = query.lower()
+        if not query:
+            return None
+        if LINE_SEPARATOR in query or TEXT_SEPARATOR in query:
+            return set()
+        names = self._matching_names(query)
+        self._last_query = query
+        self._last_names = names
+        return set(names)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# الاختبارات تستورد وحدات البرنامج من المجلد الأعلى كما تفعل ملفات benchmarks
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
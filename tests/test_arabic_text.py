@@ -0,0 +1,35 @@
+import arabic_reshaper
+from bidi.algorithm import get_display
+from arabic_text import reshape_arabic_text, reshape_many, reshape_cache_stats, clear_reshape_cache
+
+LINES = [
+    "صليت في المسجد ثم قرأت ورداً من القرآن",
+    "  مسافات  مكررة  ",
+    "تقرير weekly - قائمة 12",
+    "لا إله إلا الله",
+    "",
+]
+
+
+def test_word_by_word_matches_whole_line_reshaping():
+    # اتصال الحروف لا يتجاوز المسافة، فتشكيل كل كلمة وحدها يعطي نفس النتيجة
+    for line in LINES:
+        assert reshape_arabic_text(line) == get_display(arabic_reshaper.reshape(line))
+
+
+def test_repeated_text_is_served_from_cache():
+    clear_reshape_cache()
+    first = reshape_arabic_text("قراءة القرآن")
+    assert reshape_arabic_text("قراءة القرآن") is first
+    stats = reshape_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+    clear_reshape_cache()
+    assert reshape_cache_stats()["size"] == 0
+
+
+def test_reshape_many_keeps_order_and_shapes_duplicates_once():
+    clear_reshape_cache()
+    texts = ["الفجر", "الظهر", "الفجر", "", "الفجر"]
+    assert reshape_many(texts) == [reshape_arabic_text(text) for text in texts]
+    assert reshape_cache_stats()["size"] == 3
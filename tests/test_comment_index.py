@@ -0,0 +1,99 @@
+import threading
+import comment_index
+from comment_index import CommentIndex, normalize_text, comment_terms, query_terms
+
+TASKS = [{"id": "a", "task": "الفجر"}, {"id": "b", "task": "الورد"}]
+
+
+def test_normalize_text_unifies_arabic_forms():
+    assert normalize_text("أَحْمَدُ") == normalize_text("احمد")
+    assert normalize_text("مدرسة") == normalize_text("مدرسه")
+    assert normalize_text("مستشفى") == normalize_text("مستشفي")
+    assert normalize_text("صـــلاة") == normalize_text("صلاه")
+    assert normalize_text("٢٠٢٤") == "2024"
+
+
+def test_terms_strip_definite_article():
+    assert {"المسجد", "مسجد"} <= comment_terms("في المَسجد")
+    assert query_terms("بالمسجد") == ["مسجد"]
+    # الكلمات القصيرة لا يحذف منها "ال"
+    assert query_terms("الل") == ["الل"]
+
+
+def test_search_prefix_all_terms_and_updates(tmp_path):
+    index = CommentIndex(str(tmp_path / "comments.sqlite3"))
+    index.update_day("قائمة", "2024-01-01", TASKS, {"الفجر": "صليت في المسجد", "الورد": "سورة الكهف"})
+    index.update_day("قائمة", "2024-01-02", TASKS, {"الفجر": "في البيت"})
+    assert [row[2] for row in index.search("مسج")] == ["2024-01-01"]
+    assert index.search("المسجد البيت") == []
+    assert [row[1] for row in index.search("الكهف")] == ["الورد"]
+    # إعادة حفظ اليوم تستبدل تعليقاته، والتعليق الفارغ يحذف
+    index.update_day("قائمة", "2024-01-01", TASKS, {"الفجر": "في البيت"})
+    assert [row[2] for row in index.search("بيت")] == ["2024-01-02", "2024-01-01"]
+    assert index.search("الكهف") == []
+
+
+def test_rename_and_remove_list(tmp_path):
+    index = CommentIndex(str(tmp_path / "comments.sqlite3"))
+    index.update_day("قديم", "2024-01-01", TASKS, {"الفجر": "صليت"})
+    index.rename_list("قديم", "جديد")
+    index.rename_tasks("جديد", [{"id": "a", "task": "صلاة الفجر"}])
+    assert index.search("صليت") == [("جديد", "صلاة الفجر", "2024-01-01", "صليت")]
+    assert index.search("صليت", list_names=["قديم"]) == []
+    index.remove_list("جديد")
+    assert index.search("صليت") == []
+
+
+class FakeRepository:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def load_entries(self, tasks):
+        return ("v1",), tuple(map(list, zip(*self.rows)))
+
+
+class HookLock:
+    # قفل يشغّل الاستدعاءات المسجلة بعد تحريره (لمحاكاة حفظ من خيط آخر بين دفعتين)
+    def __init__(self):
+        self.inner = threading.Lock()
+        self.after_release = []
+
+    def __enter__(self):
+        self.inner.acquire()
+
+    def __exit__(self, *exc):
+        self.inner.release()
+        while self.after_release:
+            self.after_release.pop()()
+
+
+def test_reindex_releases_lock_between_batches_and_keeps_newer_saves(tmp_path, monkeypatch):
+    index = CommentIndex(str(tmp_path / "comments.sqlite3"))
+    lock = HookLock()
+    monkeypatch.setattr(comment_index, "_lock", lock)
+    monkeypatch.setattr(comment_index, "INDEX_BATCH_SIZE", 1)
+    repository = FakeRepository([
+        ("2024-01-01", "a", 1, "صليت في المسجد"),
+        ("2024-01-02", "a", 1, "صليت في البيت"),
+        ("2024-01-03", "b", 1, "سورة الكهف"),
+    ])
+    insert_comments = index._insert_comments
+    indexed_before_save = []
+
+    def save_day():
+        indexed_before_save.extend(index.search("الكهف"))
+        index.update_day("قائمة", "2024-01-02", TASKS, {"الفجر": "صليت في العمل"})
+
+    def insert_then_save(conn, rows):
+        insert_comments(conn, rows)
+        if rows[0][3] == "2024-01-01":
+            # حفظ يوم 2024-01-02 بعد الدفعة الأولى وقبل أن تصل إليه إعادة الفهرسة
+            lock.after_release.append(save_day)
+
+    monkeypatch.setattr(index, "_insert_comments", insert_then_save)
+    assert index.index_list("قائمة", TASKS, repository) == 3
+    assert indexed_before_save == []
+    assert [row[2] for row in index.search("صليت")] == ["2024-01-02", "2024-01-01"]
+    assert [row[3] for row in index.search("العمل")] == ["صليت في العمل"]
+    assert index.search("البيت") == []
+    assert [row[1] for row in index.search("الكهف")] == ["الورد"]
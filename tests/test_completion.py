@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from completion_history import CompletionHistory
+from report_engine import CompletionIndex, summarize
+
+TASKS = [{"id": "a", "task": "الفجر"}, {"id": "b", "task": "الورد"}]
+
+
+def test_from_entries_last_row_wins_for_duplicate_day_and_task():
+    history = CompletionHistory.from_entries(
+        ["2024-01-02", "2024-01-01", "2024-01-01", "2024-01-01"],
+        ["a", "a", "b", "a"],
+        [1, 1, None, 0],
+        ["", "أول", "تعليق فقط", "ثانٍ"],
+    )
+    assert list(history.dates.astype(str)) == ["2024-01-01", "2024-01-02"]
+    assert history.done_matrix(["a", "b"]).tolist() == [[False, False], [True, False]]
+    assert history.comments(["a", "b"]) == [["ثانٍ"], ["تعليق فقط"]]
+    record = history.day_record("2024-01-01", TASKS)
+    # الإنجاز الفارغ (None) لا يسجل حالة للمهمة، لكن تعليقها يبقى
+    assert record == {"الفجر": "✖️", "الفجر_تعليق": "ثانٍ", "الورد_تعليق": "تعليق فقط"}
+
+
+def test_missing_task_counts_as_not_done():
+    history = CompletionHistory.from_entries(["2024-01-01"], ["a"], [1], [""])
+    assert history.counts(["a", "b"])[1].tolist() == [1, 0]
+
+
+def test_completion_index_update_day_matches_rebuild():
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2024-01-01", periods=30).strftime("%Y-%m-%d").tolist()
+    kept = days[::2]
+    entries = [(day, key, int(rng.random() < 0.5), "") for day in kept for key in ("a", "b")]
+    index = CompletionIndex.from_history(CompletionHistory.from_entries(*zip(*entries)), TASKS)
+    # أيام جديدة في النهاية وفي الوسط وقبل البداية، وتعديل يوم موجود
+    for day in ["2024-02-05", "2024-01-02", "2023-12-31", "2024-01-03", *days[1::2]]:
+        done = [int(rng.random() < 0.5), int(rng.random() < 0.5)]
+        entries = [entry for entry in entries if entry[0] != day]
+        entries += [(day, "a", done[0], ""), (day, "b", done[1], "")]
+        index.update_day(day, done)
+        history = CompletionHistory.from_entries(*zip(*entries))
+        for start, end in [(None, None), ("2024-01-05", "2024-01-20"), ("2024-01-31", None)]:
+            days_count, counts = index.counts(start, end)
+            expected_days, expected = history.counts(["a", "b"], start, end)
+            assert days_count == expected_days
+            assert counts.tolist() == expected.tolist()
+
+
+def test_summarize_uses_index_and_history_consistently():
+    history = CompletionHistory.from_entries(
+        ["2024-01-01", "2024-01-01", "2024-01-02"], ["a", "b", "a"], [1, 0, 1], ["x", "", "y"]
+    )
+    index = CompletionIndex.from_history(history, TASKS)
+    with_index = summarize(history, TASKS, index=index)
+    assert with_index == summarize(history, TASKS)
+    assert with_index["days"] == 2
+    assert with_index["tasks"]["الفجر"] == {"count": 2, "rate": 1.0, "comments": "x; y"}
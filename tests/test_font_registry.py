@@ -0,0 +1,74 @@
+import os
+import re
+import shutil
+import warnings
+from fpdf import FPDF
+from fpdf.ttfonts import TTFontFile
+import font_registry
+from arabic_text import reshape_arabic_text
+from font_registry import add_pdf_font, GlyphSubset
+
+ARABIC_LINE = "صليت في المسجد ثم قرأت ورداً من القرآن"
+
+
+def render_line(path, text):
+    pdf = FPDF(format="A4")
+    add_pdf_font(pdf)
+    pdf.add_page()
+    pdf.set_font("DejaVu", '', 12)
+    pdf.cell(0, 10, txt=reshape_arabic_text(text), ln=True, align="R")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        pdf.output(str(path))
+    return path.read_bytes()
+
+
+def test_arabic_line_renders_valid_pdf(tmp_path):
+    data = render_line(tmp_path / "line.pdf", ARABIC_LINE)
+    assert data.startswith(b"%PDF-")
+    assert data.rstrip().endswith(b"%%EOF")
+    # كل موقع في جدول xref يشير إلى بداية كائن بنفس الرقم
+    xref_offset = int(re.search(rb"startxref\s+(\d+)", data).group(1))
+    assert data[xref_offset:xref_offset + 4] == b"xref"
+    first, count = map(int, re.match(rb"xref\s+(\d+) (\d+)", data[xref_offset:]).groups())
+    entries = re.findall(rb"(\d{10}) \d{5} n", data[xref_offset:])
+    assert len(entries) == count - 1
+    for number, offset in enumerate(entries, first + 1):
+        assert data[int(offset):].startswith(f"{number} 0 obj".encode())
+    # الخط مضمّن كخط TrueType (جزء المحارف المستخدمة فقط)
+    assert b"/FontFile2" in data
+    assert b"DejaVuSans" in data
+
+
+def test_font_added_once_per_document(tmp_path):
+    pdf = FPDF()
+    add_pdf_font(pdf)
+    add_pdf_font(pdf)
+    assert list(pdf.fonts) == ["dejavu"]
+
+
+def test_metrics_loaded_once_per_process_without_writing_pkl(tmp_path, monkeypatch):
+    fonts_folder = tmp_path / "fonts"
+    fonts_folder.mkdir()
+    shutil.copy(font_registry.font_path(), fonts_folder)
+    monkeypatch.setattr(font_registry, "FONTS_FOLDER", str(fonts_folder))
+    monkeypatch.setattr(font_registry, "_pdf_fonts", {})
+    loads = []
+    get_metrics = TTFontFile.getMetrics
+    monkeypatch.setattr(TTFontFile, "getMetrics", lambda self, path: (loads.append(path), get_metrics(self, path))[1])
+    first = render_line(tmp_path / "first.pdf", ARABIC_LINE)
+    second = render_line(tmp_path / "second.pdf", "سورة الكهف")
+    assert len(loads) == 1
+    assert os.listdir(fonts_folder) == [os.path.basename(font_registry.font_path())]
+    # كل مستند يضمّن محارفه فقط (قائمة المحارف لا تشترك بين المستندات)
+    assert first != second and b"/FontFile2" in second
+
+
+def test_glyph_subset_keeps_list_order_without_duplicates():
+    subset = GlyphSubset([1, 2, 2, 3])
+    subset.append(2)
+    subset.append(0x0627)
+    assert list(subset) == [1, 2, 3, 0x0627]
+    assert 0x0627 in subset and 4 not in subset
+    del subset[0]
+    assert 1 not in subset and list(subset) == [2, 3, 0x0627]
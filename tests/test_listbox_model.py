@@ -0,0 +1,68 @@
+import random
+import pytest
+from listbox_model import ListboxModel, diff_keys
+
+
+class FakeListbox:
+    # يحاكي محتوى Listbox وخيارات كل عنصر دون شاشة
+    def __init__(self):
+        self.rows = []
+
+    def delete(self, first, last=None):
+        last = len(self.rows) - 1 if last == "end" else (first if last is None else last)
+        del self.rows[first:last + 1]
+
+    def insert(self, index, *texts):
+        self.rows[index:index] = [[text, {}] for text in texts]
+
+    def itemconfig(self, index, **options):
+        for key, value in options.items():
+            if value == "":
+                self.rows[index][1].pop(key, None)
+            else:
+                self.rows[index][1][key] = value
+
+
+def apply_diff(old, new):
+    deletions, insertions, kept = diff_keys(old, new)
+    result = [key for index, key in enumerate(old) if index not in set(deletions)]
+    for index in insertions:
+        result.insert(index, new[index])
+    return result, deletions, insertions, kept
+
+
+@pytest.mark.parametrize("old, new", [
+    ([], []),
+    ([], ["a", "b"]),
+    (["a", "b"], []),
+    (["a", "b", "c"], ["a", "b", "c"]),
+    (["a", "b", "c"], ["c", "b", "a"]),
+    (["a", "b", "c", "d"], ["b", "a", "c", "d"]),
+    (["a", "b", "c"], ["x", "a", "y", "c", "z"]),
+])
+def test_diff_keys_rebuilds_new_order(old, new):
+    result, deletions, insertions, kept = apply_diff(old, new)
+    assert result == new
+    assert len(kept) + len(deletions) == len(old)
+    assert len(kept) + len(insertions) == len(new)
+    # المحفوظ أطول جزء مشترك بنفس الترتيب
+    assert [new_index for _, new_index in kept] == sorted(new_index for _, new_index in kept)
+
+
+def test_diff_keys_keeps_longest_common_order():
+    deletions, insertions, kept = diff_keys(list("abcdef"), list("afbcde"))
+    assert len(kept) == 5 and deletions == [5] and insertions == [1]
+
+
+def test_model_matches_items_after_random_updates():
+    rng = random.Random(0)
+    listbox = FakeListbox()
+    model = ListboxModel(listbox)
+    names = [f"قائمة {i}" for i in range(40)]
+    for _ in range(200):
+        picked = rng.sample(names, rng.randint(0, len(names)))
+        items = [(name, {"bg": "red"} if rng.random() < 0.3 else {}) for name in picked]
+        model.update(items)
+        assert [(text, options) for text, options in listbox.rows] == items
+    model.clear()
+    assert listbox.rows == [] and model.items == []
@@ -0,0 +1,133 @@
+import os
+import datetime
+import pandas as pd
+import pytest
+import progress_store
+from progress_store import (
+    DATE_COLUMN, COMMENT_SUFFIX, DONE_MARK, NOT_DONE_MARK, EXCEL_FILE_NAME, ProgressStore,
+    SQLiteProgressStore, ExcelProgressStore,
+)
+from progress_repository import ProgressRepository
+
+TASKS = [{"id": "id-fajr", "task": "الفجر"}, {"id": "id-quran", "task": "قراءة القرآن"}]
+
+
+def write_legacy_excel(list_folder):
+    # ملف Excel بالتخطيط العريض كما كانت تكتبه الإصدارات السابقة
+    os.makedirs(list_folder)
+    pd.DataFrame([
+        {DATE_COLUMN: "2023-12-31", "الفجر": DONE_MARK, "الفجر_تعليق": "في المسجد",
+         "قراءة القرآن": NOT_DONE_MARK, "قراءة القرآن_تعليق": None},
+        {DATE_COLUMN: "2024-01-01", "الفجر": NOT_DONE_MARK, "الفجر_تعليق": None,
+         "قراءة القرآن": DONE_MARK, "قراءة القرآن_تعليق": "جزء عم"},
+        # مهمة حذفت من القائمة لاحقاً: تبقى في السجل باسمها
+        {DATE_COLUMN: "2024-01-02", "الفجر": None, "الفجر_تعليق": None,
+         "قراءة القرآن": None, "قراءة القرآن_تعليق": None, "مهمة قديمة": DONE_MARK},
+    ]).to_excel(os.path.join(list_folder, EXCEL_FILE_NAME), index=False)
+
+
+def sorted_entries(store, tasks=TASKS):
+    return sorted(zip(*store.load_entries(tasks)))
+
+
+def test_excel_history_is_imported_into_yearly_partitions(tmp_path):
+    folder = str(tmp_path / "list")
+    write_legacy_excel(folder)
+    store = SQLiteProgressStore(folder)
+    assert sorted_entries(store) == [
+        ("2023-12-31", "id-fajr", 1, "في المسجد"),
+        ("2023-12-31", "id-quran", 0, ""),
+        ("2024-01-01", "id-fajr", 0, ""),
+        ("2024-01-01", "id-quran", 1, "جزء عم"),
+        ("2024-01-02", "مهمة قديمة", 1, ""),
+    ]
+    assert sorted(store.partitions()) == [2023, 2024]
+    # ملف Excel الأصلي يبقى كما هو، والاستيراد لا يتكرر
+    assert os.path.exists(os.path.join(folder, EXCEL_FILE_NAME))
+    assert store.migrate(TASKS) == 5
+
+
+def test_interrupted_import_is_retried(tmp_path, monkeypatch):
+    folder = str(tmp_path / "list")
+    write_legacy_excel(folder)
+    read_records = progress_store.iter_excel_records
+
+    def interrupted(excel_file):
+        # انقطاع بعد كتابة أول يومين على دفعات
+        for index, item in enumerate(read_records(excel_file)):
+            if index == 2:
+                raise KeyboardInterrupt
+            yield item
+
+    monkeypatch.setattr(progress_store, "IMPORT_BATCH_SIZE", 1)
+    monkeypatch.setattr(progress_store, "iter_excel_records", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        SQLiteProgressStore(folder).load_entries(TASKS)
+    assert not os.path.exists(os.path.join(folder, progress_store.PARTITIONS_FOLDER))
+
+    monkeypatch.setattr(progress_store, "iter_excel_records", read_records)
+    store = SQLiteProgressStore(folder)
+    assert len(sorted_entries(store)) == 5
+    assert not os.path.exists(store.partitions_folder + progress_store.IMPORT_SUFFIX)
+
+
+def test_import_matches_excel_backend(tmp_path):
+    folder = str(tmp_path / "list")
+    write_legacy_excel(folder)
+    assert sorted_entries(SQLiteProgressStore(folder)) == sorted_entries(ExcelProgressStore(folder))
+
+
+def test_save_day_replaces_same_day(tmp_path):
+    store = SQLiteProgressStore(str(tmp_path / "list"))
+    store.save_day("2024-03-01", TASKS, {"الفجر": True}, {"الفجر": "أول"})
+    store.save_day("2024-03-01", TASKS, {"الفجر": False, "قراءة القرآن": True}, {"قراءة القرآن": "ثاني"})
+    assert sorted_entries(store) == [
+        ("2024-03-01", "id-fajr", 0, ""),
+        ("2024-03-01", "id-quran", 1, "ثاني"),
+    ]
+    assert store.get_record("2024-03-01", TASKS) == {
+        "الفجر": NOT_DONE_MARK, f"الفجر{COMMENT_SUFFIX}": "",
+        "قراءة القرآن": DONE_MARK, f"قراءة القرآن{COMMENT_SUFFIX}": "ثاني",
+    }
+
+
+def test_compact_archives_old_years_and_save_restores_them(tmp_path):
+    store = SQLiteProgressStore(str(tmp_path / "list"))
+    for day in ("2019-05-01", "2019-05-02", "2024-05-01"):
+        store.save_day(day, TASKS, {"الفجر": True}, {"الفجر": day})
+    before = sorted_entries(store)
+    assert store.compact(2, today=datetime.date(2024, 6, 1)) == [2019]
+    assert store.partitions()[2019][0] == "archive"
+    assert sorted_entries(store) == before
+    assert store.migrate(TASKS) == 6
+    store.save_day("2019-05-03", TASKS, {}, {})
+    assert store.partitions()[2019][0] == "live"
+    assert len(sorted_entries(store)) == 8
+
+
+def test_repository_compacts_once_per_year(tmp_path):
+    repository = ProgressRepository(str(tmp_path / "list"))
+    repository.save_day("2019-05-01", TASKS, {}, {})
+    assert repository.compact(2, today=datetime.date(2024, 6, 1)) == [2019]
+    repository.save_day("2020-05-01", TASKS, {}, {})
+    assert repository.compact(2, today=datetime.date(2024, 6, 2)) == []
+    assert repository.compact(2, today=datetime.date(2025, 1, 1)) == [2020]
+
+
+def test_export_does_not_overwrite_legacy_excel(tmp_path):
+    folder = str(tmp_path / "list")
+    repository = ProgressRepository(folder)
+    repository.save_day("2024-03-01", TASKS, {"الفجر": True}, {})
+    path = repository.export_excel(TASKS)
+    assert os.path.basename(path) != EXCEL_FILE_NAME
+    assert not os.path.exists(os.path.join(folder, EXCEL_FILE_NAME))
+    assert pd.read_excel(path)["الفجر"].tolist() == [DONE_MARK]
+
+
+def test_incomplete_backend_fails_on_construction(tmp_path):
+    class PartialStore(ProgressStore):
+        def exists(self):
+            return False
+
+    with pytest.raises(TypeError):
+        PartialStore(str(tmp_path))
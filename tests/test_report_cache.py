@@ -0,0 +1,69 @@
+import os
+import pandas as pd
+import pytest
+from report_cache import ReportCache, report_digest
+from progress_repository import ProgressRepository
+
+TASKS = [{"id": "a", "task": "الفجر", "priority": "عالية"}, {"id": "b", "task": "الورد"}]
+START = pd.Timestamp("2024-03-01")
+END = pd.Timestamp("2024-03-07")
+
+
+def test_digest_depends_on_every_input():
+    base = report_digest("weekly", START, END, "تقرير", TASKS, "h1")
+    assert report_digest("weekly", START, END, "تقرير", TASKS, "h1") == base
+    changed = [
+        report_digest("monthly", START, END, "تقرير", TASKS, "h1"),
+        report_digest("weekly", START - pd.Timedelta(days=1), END, "تقرير", TASKS, "h1"),
+        report_digest("weekly", START, None, "تقرير", TASKS, "h1"),
+        report_digest("weekly", START, END, "تقرير آخر", TASKS, "h1"),
+        report_digest("weekly", START, END, "تقرير", TASKS[::-1], "h1"),
+        report_digest("weekly", START, END, "تقرير", [dict(TASKS[0], task="العشاء"), TASKS[1]], "h1"),
+        report_digest("weekly", START, END, "تقرير", TASKS, "h2"),
+    ]
+    assert base not in changed
+
+
+def test_lookup_requires_same_digest_and_unmodified_file(tmp_path):
+    cache = ReportCache(str(tmp_path))
+    path = tmp_path / "Reports" / "weekly.docx"
+    path.parent.mkdir()
+    path.write_bytes(b"report")
+    assert not cache.lookup(str(path), "d1")
+    cache.store(str(path), "d1")
+    assert cache.lookup(str(path), "d1")
+    assert not cache.lookup(str(path), "d2")
+    path.write_bytes(b"edited by hand")
+    assert not cache.lookup(str(path), "d1")
+    path.unlink()
+    assert not cache.lookup(str(path), "d1")
+
+
+def test_corrupt_cache_file_is_a_miss(tmp_path):
+    (tmp_path / ".report_cache.json").write_text("{not json", encoding="utf-8")
+    assert not ReportCache(str(tmp_path)).lookup(str(tmp_path / "x.pdf"), "d1")
+
+
+def test_history_digest_changes_only_for_saves_inside_period(tmp_path):
+    repository = ProgressRepository(str(tmp_path / "list"))
+    for day in pd.date_range("2024-02-25", "2024-03-07"):
+        repository.save_day(day.strftime("%Y-%m-%d"), TASKS, {"الفجر": True}, {})
+    digest = repository.digest(TASKS, START, END)
+    repository.save_day("2024-02-26", TASKS, {"الورد": True}, {"الورد": "قبل الفترة"})
+    assert repository.digest(TASKS, START, END) == digest
+    repository.save_day("2024-03-05", TASKS, {"الفجر": True}, {"الفجر": "تعليق جديد"})
+    assert repository.digest(TASKS, START, END) != digest
+
+
+def test_build_report_reuses_unchanged_report(tmp_path):
+    pytest.importorskip("docx")
+    pytest.importorskip("matplotlib")
+    from A import build_report
+    repository = ProgressRepository(str(tmp_path / "list"))
+    for day in pd.date_range(START, END):
+        repository.save_day(day.strftime("%Y-%m-%d"), TASKS, {"الفجر": True}, {})
+    path, cached = build_report(repository, "قائمة", TASKS, "custom", today=END, start=START, end=END)
+    assert not cached and os.path.exists(path)
+    assert build_report(repository, "قائمة", TASKS, "custom", today=END, start=START, end=END) == (path, True)
+    repository.save_day("2024-03-03", TASKS, {"الورد": True}, {})
+    assert build_report(repository, "قائمة", TASKS, "custom", today=END, start=START, end=END) == (path, False)
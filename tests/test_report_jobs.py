@@ -0,0 +1,120 @@
+import threading
+import pytest
+from report_jobs import ReportJobManager, ReportCancelled
+
+
+class FakeRoot:
+    # بديل لـ Tk: after() يحفظ الاستدعاء ليشغله الاختبار يدوياً
+    def __init__(self):
+        self.pending = []
+
+    def after(self, delay, callback):
+        self.pending.append(callback)
+
+    def run_pending(self):
+        pending, self.pending = self.pending, []
+        for callback in pending:
+            callback()
+
+
+def wait_for(job):
+    job.future.result(timeout=5)
+
+
+@pytest.fixture
+def manager():
+    manager = ReportJobManager(FakeRoot(), max_workers=1)
+    yield manager
+    manager.shutdown()
+
+
+def test_done_result_reaches_tk_thread_through_poll(manager):
+    results = []
+    job = manager.submit("report", lambda job: (job.report_progress(1, 2), "path")[1], results.append)
+    wait_for(job)
+    assert results == []
+    manager.root.run_pending()
+    assert results == ["path"]
+    assert manager.jobs == {}
+    # لا يعاد جدولة القراءة بعد انتهاء كل المهام
+    assert manager.root.pending == []
+
+
+def test_progress_is_kept_until_job_finishes(manager):
+    started, release = threading.Event(), threading.Event()
+
+    def func(job):
+        job.report_progress(3, 10)
+        started.set()
+        release.wait(5)
+
+    job = manager.submit("report", func)
+    started.wait(5)
+    manager.root.run_pending()
+    assert job.progress == (3, 10)
+    assert job.job_id in manager.jobs
+    release.set()
+    wait_for(job)
+    manager.root.run_pending()
+    assert manager.jobs == {}
+
+
+def test_cancel_stops_running_job_at_checkpoint(manager):
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def func(job):
+        started.set()
+        release.wait(5)
+        job.check_cancelled()
+        calls.append("after checkpoint")
+
+    job = manager.submit("report", func, calls.append)
+    started.wait(5)
+    manager.cancel(job.job_id)
+    release.set()
+    wait_for(job)
+    manager.root.run_pending()
+    assert calls == []
+    assert manager.jobs == {}
+
+
+def test_cancel_after_last_checkpoint_skips_on_done(manager):
+    started, release = threading.Event(), threading.Event()
+    done = []
+
+    def func(job):
+        started.set()
+        release.wait(5)
+        return "path"
+
+    job = manager.submit("report", func, done.append)
+    started.wait(5)
+    job.cancel()
+    release.set()
+    wait_for(job)
+    manager.root.run_pending()
+    assert done == []
+    assert manager.jobs == {}
+
+
+def test_check_cancelled_does_not_report_progress(manager):
+    job = manager.submit("report", lambda job: job.check_cancelled())
+    wait_for(job)
+    manager.root.run_pending()
+    assert job.progress == (0, 0)
+    job.cancel()
+    with pytest.raises(ReportCancelled):
+        job.check_cancelled()
+
+
+def test_errors_go_to_on_error(manager):
+    errors = []
+
+    def func(job):
+        raise ValueError("bad")
+
+    job = manager.submit("report", func, on_error=errors.append)
+    wait_for(job)
+    manager.root.run_pending()
+    assert [str(error) for error in errors] == ["bad"]
@@ -0,0 +1,35 @@
+import warnings
+import pytest
+from report_pdf import PdfTableReport, TABLE_SIZE, FONT_FAMILY
+
+
+@pytest.fixture
+def report():
+    warnings.filterwarnings("ignore")
+    report = PdfTableReport("تقرير")
+    report.pdf.set_font(FONT_FAMILY, '', TABLE_SIZE)
+    return report
+
+
+def test_wrap_keeps_words_and_fits_column(report):
+    text = "صليت في المسجد ثم قرأت ورداً من القرآن وبعدها راجعت الدروس مع الأصدقاء " * 5
+    lines = list(report.wrap(text, 45))
+    assert len(lines) > 1
+    assert " ".join(lines).split() == text.split()
+    assert all(report._measure(line) <= 43 for line in lines)
+
+
+def test_wrap_splits_long_word_into_full_lines(report):
+    word = "ب" * 3000
+    lines = list(report.wrap(f"{word} تم", 40))
+    assert "".join(lines).replace(" ", "") == word + "تم"
+    widths = [report._measure(line) for line in lines]
+    assert max(widths) <= 38
+    # كل جزء (عدا الأخير) يملأ السطر تقريباً بعد التشكيل
+    assert min(widths[:-1]) > 38 - report._measure("ب") * 2
+
+
+def test_width_cache_is_bounded(report):
+    list(report.wrap(" ".join(f"كلمة{i}" for i in range(20000)), 100))
+    info = report._text_width.cache_info()
+    assert info.currsize <= info.maxsize
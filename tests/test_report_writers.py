@@ -0,0 +1,68 @@
+from docx import Document
+import report_writers
+from report_writers import write_word_report
+
+# نصوص تغطي الحالات التي يحولها Run.text في python-docx: فواصل، أسطر، مسافات في الأطراف، ورموز XML
+TEXTS = [
+    "صليت في المسجد",
+    "سطر أول\nسطر ثانٍ\r\nثالث",
+    "عمود\tثانٍ",
+    "  مسافة في البداية والنهاية  ",
+    "A & B <tag> \"quoted\"",
+    "",
+]
+
+
+def write_with_add_row(path, title, tasks, report):
+    # طريقة python-docx المعتادة (صف بصف) كمرجع للمستند الناتج
+    summary = report["tasks"]
+    document = Document()
+    document.add_heading(title, 0)
+    table = document.add_table(rows=1, cols=3)
+    hdr_cells = table.rows[0].cells
+    hdr_cells[0].text = "المهمة"
+    hdr_cells[1].text = "عدد مرات القيام"
+    hdr_cells[2].text = "التعليقات"
+    for task_obj in tasks:
+        task = task_obj["task"]
+        row_cells = table.add_row().cells
+        row_cells[0].text = task
+        row_cells[1].text = str(summary[task]["count"])
+        row_cells[2].text = summary[task]["comments"]
+    document.save(path)
+
+
+def make_report():
+    tasks = [{"task": f"مهمة {i} {text}".strip()} for i, text in enumerate(TEXTS)]
+    summary = {
+        task_obj["task"]: {"count": i, "comments": TEXTS[-1 - i]}
+        for i, task_obj in enumerate(tasks)
+    }
+    return tasks, {"days": 7, "tasks": summary}
+
+
+def test_bulk_rows_match_python_docx_rows(tmp_path, monkeypatch):
+    # دفعات صغيرة حتى تمر الكتابة على أكثر من دفعة وعلى دفعة أخيرة ناقصة
+    monkeypatch.setattr(report_writers, "DOCX_ROWS_CHUNK", 4)
+    tasks, report = make_report()
+    expected = tmp_path / "add_row.docx"
+    actual = tmp_path / "reports" / "bulk.docx"
+    write_with_add_row(str(expected), "تقرير", tasks, report)
+    progress = []
+    assert write_word_report(str(actual), "تقرير", tasks, report, lambda done, total: progress.append((done, total))) == str(actual)
+    assert Document(str(actual)).element.body.xml == Document(str(expected)).element.body.xml
+    assert progress == [(done, len(tasks)) for done in range(1, len(tasks) + 1)]
+
+
+def test_cells_read_back_through_python_docx(tmp_path):
+    tasks, report = make_report()
+    path = str(tmp_path / "report.docx")
+    write_word_report(path, "تقرير", tasks, report)
+    table = Document(path).tables[0]
+    assert len(table.rows) == len(tasks) + 1
+    row = table.rows[4].cells
+    assert row[0].text == tasks[3]["task"]
+    assert row[1].text == "3"
+    assert row[2].text == "عمود\tثانٍ"
+    # \r\n يكتب فاصلي أسطر كما يفعل Run.text في python-docx
+    assert table.rows[2].cells[0].text.endswith("ثانٍ\n\nثالث")
@@ -0,0 +1,78 @@
+import search_index
+from search_index import ListSearchIndex
+
+LISTS = {
+    "صلاة": [{"task": "الفجر"}, {"task": "الظهر"}],
+    "Reading": [{"task": "كتاب"}, {"task": "Quran"}],
+    "رياضة": [{"task": "مشي"}, {"task": "جري"}],
+}
+
+
+def scan(lists_data, query):
+    # البحث المباشر في الأسماء والمهام كما كان قبل الفهرس
+    query = query.lower()
+    return {
+        name for name, tasks in lists_data.items()
+        if query in name.lower() or any(query in task_obj["task"].lower() for task_obj in tasks)
+    }
+
+
+def test_empty_query_means_all_lists():
+    assert ListSearchIndex(LISTS).search("") is None
+
+
+def test_matches_names_and_tasks_case_insensitive():
+    index = ListSearchIndex(LISTS)
+    assert index.search("READ") == {"Reading"}
+    assert index.search("quran") == {"Reading"}
+    assert index.search("ال") == {"صلاة"}
+    assert index.search("zzz") == set()
+
+
+def test_match_does_not_span_list_name_and_task():
+    index = ListSearchIndex({"ab": [{"task": "cd"}], "ef": [{"task": "gh"}]})
+    assert index.search("bc") == set()
+    assert index.search("de") == set()
+    assert index.search("hab") == set()
+
+
+def test_extended_query_narrows_previous_results():
+    index = ListSearchIndex(LISTS)
+    for query in ("r", "re", "rea", "read"):
+        assert index.search(query) == scan(LISTS, query)
+    # حذف حرف (بحث أقصر) يعيد البحث في كل القوائم
+    assert index.search("r") == scan(LISTS, "r")
+
+
+def test_dense_matches_scan_remaining_lines(monkeypatch):
+    monkeypatch.setattr(search_index, "DENSE_MATCHES", 2)
+    lists_data = {f"قائمة {i}": [{"task": "مشي" if i % 3 else "جري"}] for i in range(20)}
+    index = ListSearchIndex(lists_data)
+    for query in ("قائمة", "مشي", "جري", "قائمة 1"):
+        assert index.search(query) == scan(lists_data, query)
+
+
+def test_add_rename_and_delete_invalidate_results():
+    index = ListSearchIndex(LISTS)
+    assert index.search("مش") == {"رياضة"}
+    index.set_list("مشاوير", [])
+    assert index.search("مشي") == {"رياضة"}
+    assert index.search("مش") == {"رياضة", "مشاوير"}
+    index.rename_list("رياضة", "تمارين", LISTS["رياضة"])
+    assert index.search("مش") == {"تمارين", "مشاوير"}
+    index.set_list("تمارين", [{"task": "سباحة"}])
+    assert index.search("مشي") == set()
+    index.remove_list("مشاوير")
+    assert index.search("مش") == set()
+    assert index.search("سباح") == {"تمارين"}
+
+
+def test_names_containing_separators():
+    index = ListSearchIndex({"أ\tب": [{"task": "ج\nد"}], "هـ": [{"task": "و"}]})
+    # الفاصل داخل الاسم يفهرس كمسافة، ولا يمكن البحث بالفاصل نفسه
+    assert index.search("أ ب") == {"أ\tب"}
+    assert index.search("ج د") == {"أ\tب"}
+    assert index.search("د") == {"أ\tب"}
+    assert index.search("و") == {"هـ"}
+    assert index.search("\t") == set()
+    assert index.search("ج\nد") == set()
@@ -0,0 +1,73 @@
+import pytest
+import ui_theme
+from ui_theme import Theme, clamp_font_size, MIN_FONT_SIZE, MAX_FONT_SIZE, TITLE_FONT_DELTA
+
+
+class FakeFont:
+    # بديل لـ tkfont.Font (إنشاء خط حقيقي يحتاج شاشة)
+    def __init__(self, root, name, family, size, weight="normal"):
+        self.name = name
+        self.options = {"family": family, "size": size, "weight": weight}
+
+    def configure(self, **options):
+        self.options.update(options)
+
+
+class FakeWidget:
+    def __init__(self):
+        self.options = {}
+        self.configure_calls = 0
+
+    def configure(self, **options):
+        self.options.update(options)
+        self.configure_calls += 1
+
+
+@pytest.fixture
+def theme(monkeypatch):
+    monkeypatch.setattr(ui_theme.tkfont, "Font", FakeFont)
+    return Theme(FakeWidget(), font_size=14)
+
+
+def sizes(theme):
+    return theme.font.options["size"], theme.bold_font.options["size"], theme.title_font.options["size"]
+
+
+def test_clamp_font_size():
+    assert clamp_font_size(3) == MIN_FONT_SIZE
+    assert clamp_font_size("18") == 18
+    assert clamp_font_size(500) == MAX_FONT_SIZE
+
+
+def test_named_fonts_scale_together(theme):
+    assert [font.name for font in (theme.font, theme.bold_font, theme.title_font)] == [
+        "AppFont", "AppBoldFont", "AppTitleFont"]
+    assert sizes(theme) == (14, 14, 14 + TITLE_FONT_DELTA)
+    assert theme.set_font_size(20) == 20
+    assert sizes(theme) == (20, 20, 20 + TITLE_FONT_DELTA)
+    assert theme.bold_font.options["weight"] == "bold"
+
+
+def test_font_size_is_clamped(theme):
+    assert theme.set_font_size(1) == MIN_FONT_SIZE
+    assert sizes(theme) == (MIN_FONT_SIZE, MIN_FONT_SIZE, MIN_FONT_SIZE + TITLE_FONT_DELTA)
+    assert theme.set_font_size(999) == MAX_FONT_SIZE
+    assert sizes(theme)[0] == MAX_FONT_SIZE
+    assert sizes(Theme(FakeWidget(), font_size=2)) == (MIN_FONT_SIZE, MIN_FONT_SIZE, MIN_FONT_SIZE + TITLE_FONT_DELTA)
+
+
+def test_colors_apply_to_registered_widgets_only(theme):
+    surface = theme.add_surface(FakeWidget())
+    field = theme.add_field(FakeWidget())
+    listbox = theme.add_field(FakeWidget(), selection=True)
+    other = FakeWidget()
+    theme.set_colors("black", "white")
+    assert theme.surfaces[0].options == {"bg": "black"}
+    assert surface.options == {"bg": "black"}
+    assert field.options == {"bg": "black", "fg": "white"}
+    assert listbox.options == {"bg": "black", "fg": "white", "selectbackground": "black", "selectforeground": "white"}
+    assert other.options == {}
+    # نفس الألوان مرة أخرى لا تلمس أي عنصر
+    calls = surface.configure_calls
+    theme.set_colors("black", "white")
+    assert surface.configure_calls == calls
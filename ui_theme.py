@@ -0,0 +1,64 @@
+from tkinter import font as tkfont
+
+FONT_FAMILY = "Arial"
+DEFAULT_FONT_SIZE = 12
+MIN_FONT_SIZE = 10
+MAX_FONT_SIZE = 50
+# فرق حجم خط العناوين عن الخط الأساسي
+TITLE_FONT_DELTA = 4
+
+
+def clamp_font_size(size):
+    return max(MIN_FONT_SIZE, min(int(size), MAX_FONT_SIZE))
+
+
+# ---------------------------
+# ثيم النافذة الرئيسية: خطوط مسماة مشتركة وألوان تطبق على عناصر مسجلة مسبقاً
+# تغيير حجم الخط يعدّل الخطوط المسماة فيعيد Tk رسم كل عنصر يستخدمها دون إعادة إنشائه،
+# وتغيير الألوان يمر على العناصر المسجلة فقط (عددها ثابت مهما زادت القوائم والنوافذ)
+# ---------------------------
+class Theme:
+    def __init__(self, root, font_size=DEFAULT_FONT_SIZE, bg="white", fg="black"):
+        font_size = clamp_font_size(font_size)
+        self.font = tkfont.Font(root, name="AppFont", family=FONT_FAMILY, size=font_size)
+        self.bold_font = tkfont.Font(root, name="AppBoldFont", family=FONT_FAMILY, size=font_size, weight="bold")
+        self.title_font = tkfont.Font(root, name="AppTitleFont", family=FONT_FAMILY, size=font_size + TITLE_FONT_DELTA)
+        self.bg = bg
+        self.fg = fg
+        # الأسطح تأخذ لون الخلفية فقط، وحقول الإدخال تأخذ الخلفية ولون النص
+        root.configure(bg=bg)
+        self.surfaces = [root]
+        self.fields = []
+
+    def set_font_size(self, size):
+        size = clamp_font_size(size)
+        self.font.configure(size=size)
+        self.bold_font.configure(size=size)
+        self.title_font.configure(size=size + TITLE_FONT_DELTA)
+        return size
+
+    def add_surface(self, widget):
+        widget.configure(bg=self.bg)
+        self.surfaces.append(widget)
+        return widget
+
+    def add_field(self, widget, selection=False):
+        # selection: لون التحديد يطابق الخلفية (Listbox القوائم يخفي التحديد)
+        self.fields.append((widget, selection))
+        self._color_field(widget, selection)
+        return widget
+
+    def _color_field(self, widget, selection):
+        widget.configure(bg=self.bg, fg=self.fg)
+        if selection:
+            widget.configure(selectbackground=self.bg, selectforeground=self.fg)
+
+    def set_colors(self, bg, fg):
+        if (bg, fg) == (self.bg, self.fg):
+            return
+        self.bg = bg
+        self.fg = fg
+        for widget in self.surfaces:
+            widget.configure(bg=bg)
+        for widget, selection in self.fields:
+            self._color_field(widget, selection)
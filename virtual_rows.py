@@ -0,0 +1,147 @@
+import tkinter as tk
+
+# صفوف إضافية تنشأ فوق عدد الصفوف الظاهرة حتى لا يظهر فراغ أثناء التمرير
+EXTRA_ROWS = 2
+# عدد الصفوف لكل خطوة من عجلة الفأرة أو أسهم شريط التمرير
+SCROLL_STEP_ROWS = 3
+
+
+# ---------------------------
+# قائمة صفوف افتراضية: تنشأ عناصر Tk للصفوف الظاهرة فقط ويعاد استخدامها أثناء التمرير
+# البيانات نفسها تبقى في نموذج عادي لدى المستدعي:
+#   create_row(parent) تنشئ عناصر صف فارغ وتعيده
+#   bind_row(row, index) تعرض بيانات الصف رقم index في العناصر المعاد استخدامها
+# ---------------------------
+class VirtualRows(tk.Frame):
+    def __init__(self, master, create_row, bind_row, row_count=0, row_height=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.row_count = row_count
+        self.row_height = row_height
+        self.offset = 0
+        self.rows = []
+        self.bound = []
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.body = tk.Frame(self)
+        self.body.pack(side="left", fill="both", expand=True)
+        self.body.bind("<Configure>", lambda event: self.refresh())
+        self._bind_wheel(self.body)
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_mousewheel)
+        widget.bind("<Button-4>", lambda event: self.scroll_rows(-SCROLL_STEP_ROWS))
+        widget.bind("<Button-5>", lambda event: self.scroll_rows(SCROLL_STEP_ROWS))
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+    def _on_mousewheel(self, event):
+        self.scroll_rows(-SCROLL_STEP_ROWS if event.delta > 0 else SCROLL_STEP_ROWS)
+
+    def _new_row(self):
+        row = self.create_row(self.body)
+        self._bind_wheel(row)
+        if self.row_height is None:
+            # ارتفاع الصف يقاس من أول صف (يتبع حجم الخط)
+            row.update_idletasks()
+            self.row_height = max(row.winfo_reqheight(), 1)
+        self.rows.append(row)
+        self.bound.append(None)
+        return row
+
+    def _content_height(self):
+        return self.row_count * (self.row_height or 1)
+
+    def _max_offset(self):
+        return max(self._content_height() - self.body.winfo_height(), 0)
+
+    def set_row_count(self, row_count):
+        self.row_count = row_count
+        self.offset = min(self.offset, self._max_offset())
+        self.refresh(rebind=True)
+
+    def scroll_rows(self, rows):
+        self.scroll_to_offset(self.offset + rows * (self.row_height or 1))
+
+    def scroll_to_offset(self, offset):
+        offset = max(0, min(int(offset), self._max_offset()))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def see(self, index):
+        # تمرير أقل مسافة تجعل الصف index ظاهراً بالكامل
+        if self.row_height is None:
+            return
+        top = index * self.row_height
+        bottom = top + self.row_height
+        if top < self.offset:
+            self.scroll_to_offset(top)
+        elif bottom > self.offset + self.body.winfo_height():
+            self.scroll_to_offset(bottom - self.body.winfo_height())
+
+    def yview(self, *args):
+        # أوامر شريط التمرير: moveto fraction أو scroll n units/pages
+        if args[0] == "moveto":
+            self.scroll_to_offset(float(args[1]) * self._content_height())
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2] == "pages":
+                self.scroll_to_offset(self.offset + amount * self.body.winfo_height())
+            else:
+                self.scroll_rows(amount * SCROLL_STEP_ROWS)
+
+    def refresh(self, rebind=False):
+        # rebind: إعادة عرض بيانات الصفوف الظاهرة (بعد تغيير النموذج)
+        height = self.body.winfo_height()
+        if self.row_count and not self.rows:
+            self._new_row()
+        if self.row_height is None:
+            return
+        visible = min(height // self.row_height + EXTRA_ROWS, self.row_count)
+        while len(self.rows) < visible:
+            self._new_row()
+        first = self.offset // self.row_height
+        focused = self._focused_row()
+        for slot, row in enumerate(self.rows):
+            index = first + slot
+            if index < self.row_count and slot < visible:
+                if rebind or self.bound[slot] != index:
+                    if row is focused and self.bound[slot] != index:
+                        # الكتابة لا تنتقل إلى صف آخر عند إعادة استخدام عناصر الصف المحدد
+                        self.focus_set()
+                    self.bind_row(row, index)
+                    self.bound[slot] = index
+                row.place(x=0, y=index * self.row_height - self.offset, relwidth=1, height=self.row_height)
+            elif self.bound[slot] is not None:
+                row.place_forget()
+                self.bound[slot] = None
+        content = self._content_height()
+        if content <= height or not content:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.offset / content, (self.offset + height) / content)
+
+    def _focused_row(self):
+        try:
+            focus = self.focus_get()
+        except KeyError:
+            return None
+        for row in self.rows:
+            if focus is not None and str(focus).startswith(f"{row}."):
+                return row
+        return None
+
+    def row_index(self, row):
+        # رقم الصف المعروض حالياً في هذه العناصر (أو None إذا كانت مخفية)
+        return self.bound[self.rows.index(row)]
+
+    def row_for(self, index):
+        # عناصر الصف التي تعرض الصف رقم index حالياً (أو None إذا لم يكن ظاهراً)
+        if self.row_height is None:
+            return None
+        slot = index - self.offset // self.row_height
+        if 0 <= slot < len(self.rows) and self.bound[slot] == index:
+            return self.rows[slot]
+        return None